@@ -0,0 +1,208 @@
+"""
+@file batch_convert.py
+@brief File containing the streaming batch conversion of CSV ledgers.
+
+A ledger is a CSV file with rows of amount, base currency and target currency, any further
+columns are passed through. The file is read in chunks of CHUNK_ROWS rows, every chunk is
+converted with one vectorized operation on the RateTable and written out before the next one
+is read, so the memory use does not depend on the size of the file. The output has the input
+columns followed by the converted amount, which is left empty for rows that cannot be
+converted. Amounts are converted exactly in minor units (see money.py) and written with the
+decimal places of the target currency.
+
+Run from the src directory: python -m currency.batch_convert ledger.csv converted.csv
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import itertools
+import sys
+from collections import namedtuple
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP
+
+import numpy as np
+
+from .currency_api import load_snapshot, rate_cache
+from .money import convert_minor_array, format_minor, parse_minor_array
+
+# Rows converted at once
+CHUNK_ROWS = 50000
+# Rounding modes of the command line
+ROUNDINGS = {"half-even": ROUND_HALF_EVEN, "half-up": ROUND_HALF_UP}
+# Name of the column added to a file with a header
+CONVERTED_COLUMN = "converted"
+
+BatchSummary = namedtuple("BatchSummary", ["rows", "converted", "failed"])
+
+# Errors of a conversion that are reported instead of raised: unreadable files (OSError),
+# invalid CSV (csv.Error), undecodable text or invalid rates (ValueError, which includes
+# UnicodeDecodeError) and amounts out of the range of the arithmetic (ArithmeticError)
+BATCH_ERRORS = (OSError, csv.Error, ValueError, ArithmeticError)
+
+
+def is_header(row):
+    """
+    @brief Returns whether the first row of a file is a header
+    @param row First row of the file
+    """
+    try:
+        float(row[0])
+    except (IndexError, ValueError):
+        return True
+    return False
+
+
+def convert_chunk(rows, table, decimals=None, rounding=ROUND_HALF_EVEN):
+    """
+    @brief Converts a chunk of ledger rows
+    @param rows List of rows, each a list of at least amount, base currency and target currency
+    @param table RateTable used for the conversion
+    @param decimals Decimal places of the converted amounts, the minor unit of the target currency if None
+    @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+    @return Tuple of the output rows and the number of rows that could not be converted
+    """
+    # Short rows are padded, so they end up as unknown currencies instead of raising
+    padded = [row + [""] * (3 - len(row)) if len(row) < 3 else row for row in rows]
+    bases = table.positions([row[1] for row in padded])
+    targets = table.positions([row[2] for row in padded])
+    known = (bases >= 0) & (targets >= 0)
+
+    base_exponents = table.exponents[bases]
+    if decimals is None:
+        target_exponents = table.exponents[targets]
+    else:
+        target_exponents = np.full(len(rows), decimals, dtype=np.int64)
+    minor, parsed = parse_minor_array([row[0] for row in padded], base_exponents, rounding)
+    converted, valid = convert_minor_array(minor, np.where(known, table.vector[bases], np.nan),
+                                           np.where(known, table.vector[targets], np.nan),
+                                           target_exponents - base_exponents, rounding)
+
+    failed = ~(known & parsed & valid)
+    output = [row + ["" if fail else format_minor(value, places)]
+              for row, value, places, fail in zip(rows, converted.tolist(), target_exponents.tolist(), failed.tolist())]
+    return output, int(np.count_nonzero(failed))
+
+
+def convert_stream(source, destination, table, chunk_rows=CHUNK_ROWS, decimals=None,
+                   rounding=ROUND_HALF_EVEN, progress=None, should_stop=None):
+    """
+    @brief Converts a ledger read from one text stream into another, one chunk at a time
+    @param source Text stream of the input CSV
+    @param destination Text stream the output CSV is written to
+    @param table RateTable used for the conversion
+    @param chunk_rows Rows converted at once
+    @param decimals Decimal places of the converted amounts, the minor unit of the target currency if None
+    @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+    @param progress Function called with the BatchSummary so far after every chunk
+    @param should_stop Function returning True when the conversion should stop early
+    @return BatchSummary of the rows that were written
+    """
+    reader = csv.reader(source)
+    writer = csv.writer(destination, lineterminator="\n")
+
+    first = next(reader, None)
+    if first is None:
+        return BatchSummary(0, 0, 0)
+    if is_header(first):
+        writer.writerow(first + [CONVERTED_COLUMN])
+        rows = reader
+    else:
+        rows = itertools.chain([first], reader)
+
+    total = failed = 0
+    while should_stop is None or not should_stop():
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            break
+        output, chunk_failed = convert_chunk(chunk, table, decimals, rounding)
+        writer.writerows(output)
+        total += len(chunk)
+        failed += chunk_failed
+        if progress is not None:
+            progress(BatchSummary(total, total - failed, failed))
+
+    return BatchSummary(total, total - failed, failed)
+
+
+def open_ledger(path, mode):
+    """
+    @brief Opens a ledger file for reading or writing
+    @param path Path of the file, - for standard input or output
+    @param mode "r" or "w"
+    @return Context manager of the text stream, the standard streams are not closed on exit
+    """
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    encoding = "utf-8-sig" if mode == "r" else "utf-8"
+    return open(path, mode, newline="", encoding=encoding)
+
+
+def convert_file(source_path, destination_path, table, **options):
+    """
+    @brief Converts a ledger file into a new file
+    @param source_path Path of the input CSV
+    @param destination_path Path of the output CSV
+    @param table RateTable used for the conversion
+    @param options Keyword arguments of convert_stream
+    @return BatchSummary of the rows that were written
+
+    @exception OSError: If a file cannot be read or written.
+    @exception csv.Error: If the input is not a valid CSV file.
+    @exception ValueError: If the input is not UTF-8 text.
+    """
+    with open_ledger(source_path, "r") as source, open_ledger(destination_path, "w") as destination:
+        return convert_stream(source, destination, table, **options)
+
+
+def main(argv=None):
+    """
+    @brief Converts a ledger from the command line
+    @param argv Command line arguments, sys.argv if None
+    @return Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m currency.batch_convert",
+        description="Convert a CSV ledger of amount, from, to rows into another currency.")
+    parser.add_argument("source", help="input CSV file, - for standard input")
+    parser.add_argument("destination", help="output CSV file, - for standard output")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows converted at once")
+    parser.add_argument("--decimals", type=int, default=None,
+                        help="decimal places of the converted amounts, the minor unit of each currency by default")
+    parser.add_argument("--rounding", choices=sorted(ROUNDINGS), default="half-even",
+                        help="rounding of the converted amounts")
+    args = parser.parse_args(argv)
+
+    # The rates are downloaded first, a snapshot could be days old
+    rates = rate_cache.get_rates()
+    if rates is None:
+        snapshot = load_snapshot(rate_cache.snapshot_dir) if rate_cache.snapshot_dir is not None else None
+        if snapshot is None:
+            print("Error: exchange rates are not available", file=sys.stderr)
+            return 1
+        rates = snapshot["rates"]
+        timestamp = snapshot.get("timestamp")
+        saved = (datetime.datetime.fromtimestamp(timestamp).strftime("%d.%m.%Y %H:%M")
+                 if isinstance(timestamp, (int, float)) else "an unknown time")
+        print(f"Warning: exchange rates could not be downloaded, using stale rates saved at {saved}",
+              file=sys.stderr)
+
+    options = {"chunk_rows": max(1, args.chunk_rows), "decimals": args.decimals, "rounding": ROUNDINGS[args.rounding]}
+    try:
+        table = rate_cache.table(rates)
+        with open_ledger(args.source, "r") as source, open_ledger(args.destination, "w") as destination:
+            summary = convert_stream(source, destination, table, **options)
+    except BATCH_ERRORS as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Converted {summary.converted} of {summary.rows} rows, {summary.failed} failed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
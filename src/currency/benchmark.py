@@ -0,0 +1,200 @@
+"""
+@file benchmark.py
+@brief File containing the latency and throughput benchmark of the currency conversion.
+
+The benchmark starts a FakeRateServer on localhost and converts amounts through the full
+stack: Transport, HttpRateProvider, RateCache, RateTable and the batch conversion. Each
+scenario reports the latency percentiles and the throughput, so regressions show up without
+the real internet.
+
+Scenarios:
+    fetch       every conversion downloads and parses the rates document
+    revalidate  every conversion revalidates the rates with a conditional request (304)
+    cached      conversions are served from the in-memory rates
+    batch       CSV ledger rows converted by batch_convert, measured per chunk
+
+Run from the src directory: python -m currency.benchmark --delay 0.01 --failure-rate 0.05
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+
+from .batch_convert import convert_stream
+from .currency_api import RateCache
+from .currency_providers import HttpRateProvider
+from .currency_transport import Transport
+from .fake_rate_server import FIXTURE_PATH, FakeRateServer
+
+# Conversions measured per scenario
+REQUESTS = 200
+# Rows of the batch scenario
+BATCH_ROWS = 200000
+# Currencies used by the conversions
+PAIRS = [("EUR", "USD"), ("USD", "CZK"), ("GBP", "JPY"), ("CHF", "PLN")]
+
+
+def summarize(name, latencies, errors, elapsed, items=None):
+    """
+    @brief Computes the statistics of one scenario
+    @param name Name of the scenario
+    @param latencies List of measured latencies in seconds
+    @param errors Number of failed operations
+    @param elapsed Wall clock time of the scenario in seconds
+    @param items Number of processed items, the number of operations if None
+    @return Dictionary with the count, errors, latency percentiles in milliseconds and throughput
+    """
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(fraction):
+        return ordered[min(count - 1, int(fraction * count))] * 1000 if count else 0.0
+
+    return {
+        "scenario": name,
+        "count": count,
+        "errors": errors,
+        "mean_ms": sum(ordered) / count * 1000 if count else 0.0,
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000 if count else 0.0,
+        "throughput": (items if items is not None else count) / elapsed if elapsed else 0.0,
+    }
+
+
+def measure_conversions(cache, requests, forget):
+    """
+    @brief Measures single conversions through the rate cache
+    @param cache RateCache used for the conversions
+    @param requests Number of conversions
+    @param forget Whether the cached rates are forgotten before every conversion
+    @return Tuple of the latencies, the number of errors and the elapsed time
+    """
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        base, target = PAIRS[i % len(PAIRS)]
+        if forget:
+            cache.clear()
+        begin = time.perf_counter()
+        table = cache.table()
+        try:
+            if table is None:
+                raise KeyError(base)
+            table.convert(100.0, base, target)
+        except (KeyError, ZeroDivisionError):
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - begin)
+    return latencies, errors, time.perf_counter() - start
+
+
+def measure_batch(cache, rows, chunk_rows):
+    """
+    @brief Measures the streaming conversion of an in-memory ledger
+    @param cache RateCache providing the rate table
+    @param rows Number of ledger rows
+    @param chunk_rows Rows converted at once
+    @return Tuple of the per-chunk latencies, the number of failed rows and the elapsed time
+    """
+    lines = [f"{i % 1000 + 0.5},{base},{target}\n"
+             for i, (base, target) in zip(range(rows), PAIRS * (rows // len(PAIRS) + 1))]
+    source = io.StringIO("".join(lines))
+    destination = io.StringIO()
+    table = cache.table()
+    if table is None:
+        return [], rows, 0.0
+
+    latencies = []
+    last = [time.perf_counter()]
+
+    def progress(summary):
+        now = time.perf_counter()
+        latencies.append(now - last[0])
+        last[0] = now
+
+    start = last[0]
+    summary = convert_stream(source, destination, table, chunk_rows=chunk_rows, progress=progress)
+    return latencies, summary.failed, time.perf_counter() - start
+
+
+def run(requests=REQUESTS, rows=BATCH_ROWS, chunk_rows=10000, delay=0.0, jitter=0.0, failure_rate=0.0,
+        fixture_path=FIXTURE_PATH, seed=0):
+    """
+    @brief Runs all scenarios against a local FakeRateServer
+    @param requests Conversions measured per scenario
+    @param rows Rows of the batch scenario
+    @param chunk_rows Rows converted at once in the batch scenario
+    @param delay Seconds every server response is delayed
+    @param jitter Additional random server delay of up to this many seconds
+    @param failure_rate Fraction of server requests answered with 503
+    @param fixture_path Path of the served rates document
+    @param seed Seed of the server delays and failures
+    @return List of scenario statistics, see summarize
+    """
+    server = FakeRateServer(0, fixture_path, delay, jitter, failure_rate, seed).start()
+    transport = Transport(backoff=0.01)
+    try:
+        source = HttpRateProvider(server.rates_url(), server.url, transport)
+        results = []
+
+        cache = RateCache(source, ttl=0, snapshot_dir=None)
+        results.append(summarize("fetch", *measure_conversions(cache, requests, forget=True)))
+        results.append(summarize("revalidate", *measure_conversions(cache, requests, forget=False)))
+
+        cache = RateCache(source, ttl=3600, snapshot_dir=None)
+        cache.get_rates()
+        results.append(summarize("cached", *measure_conversions(cache, requests, forget=False)))
+
+        latencies, failed, elapsed = measure_batch(cache, rows, chunk_rows)
+        results.append(summarize("batch", latencies, failed, elapsed, items=rows))
+        return results
+    finally:
+        transport.close()
+        server.stop()
+
+
+def main(argv=None):
+    """
+    @brief Runs the benchmark from the command line and prints the results
+    @param argv Command line arguments, sys.argv if None
+    @return Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m currency.benchmark",
+                                     description="Measure conversion latency and throughput against a local fake rate server.")
+    parser.add_argument("--requests", type=int, default=REQUESTS, help="conversions per scenario")
+    parser.add_argument("--rows", type=int, default=BATCH_ROWS, help="rows of the batch scenario")
+    parser.add_argument("--chunk-rows", type=int, default=10000, help="rows converted at once in the batch scenario")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds every server response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random server delay in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of server requests answered with 503")
+    parser.add_argument("--fixture", default=FIXTURE_PATH, help="served rates document")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(max(1, args.requests), max(1, args.rows), max(1, args.chunk_rows), args.delay, args.jitter,
+                  args.failure_rate, args.fixture)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'scenario':<12}{'count':>7}{'errors':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}{'per s':>12}")
+    for result in results:
+        print(f"{result['scenario']:<12}{result['count']:>7}{result['errors']:>8}{result['mean_ms']:>10.3f}"
+              f"{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+              f"{result['max_ms']:>10.3f}{result['throughput']:>12.0f}")
+    print("batch latencies are per chunk, its throughput is in rows per second")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
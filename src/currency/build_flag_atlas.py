@@ -0,0 +1,106 @@
+"""
+@file build_flag_atlas.py
+@brief File containing the build step packing all currency flags into one sprite atlas.
+
+The flags of every currency in get_currency_name() are downloaded (or read from the on-disk
+flag cache), scaled to fit one atlas cell and drawn into a grid. The atlas image and its JSON
+index are written to Pictures/, where FlagAtlas loads them, so the application shows all
+flags offline from one file read and one decode.
+
+Run from the src directory: python -m currency.build_flag_atlas
+or, to pack local flag images instead of downloading them: --flag-dir <directory>
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+from .currency_api import get_cached_flag_image, get_currency_name
+from .flag_cache import ATLAS_IMAGE_PATH, ATLAS_INDEX_PATH, ATLAS_CELL, decode_flag, flag_country
+
+
+def read_flag(country_code, flag_dir=None):
+    """
+    @brief Returns the PNG data of a flag
+    @param country_code: Country code of the flag
+    @param flag_dir: Directory of flag images named <country code>.png, None to download the flags
+    @return PNG data, or None if the flag is missing
+    """
+    if flag_dir is None:
+        return get_cached_flag_image(country_code)
+    try:
+        with open(os.path.join(flag_dir, f"{country_code}.png"), "rb") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def build_atlas(country_codes, cell=ATLAS_CELL, flag_dir=None):
+    """
+    @brief Packs the flags of the given country codes into one image
+    @param country_codes: List of country codes
+    @param cell: Tuple of the width and height of one atlas cell
+    @param flag_dir: Directory of flag images named <country code>.png, None to download the flags
+    @return Tuple of the atlas QImage and the index mapping country codes to [x, y, width, height]
+    """
+    width, height = cell
+    flags = []
+    for country_code in country_codes:
+        image = decode_flag(read_flag(country_code, flag_dir), width, height)
+        if image.isNull():
+            print(f"Skipping flag for {country_code}")
+        else:
+            flags.append((country_code, image))
+
+    columns = max(1, math.ceil(math.sqrt(len(flags))))
+    rows = max(1, math.ceil(len(flags) / columns))
+    atlas = QImage(columns * width, rows * height, QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.transparent)
+
+    index = {}
+    painter = QPainter(atlas)
+    for position, (country_code, image) in enumerate(flags):
+        x = position % columns * width
+        y = position // columns * height
+        painter.drawImage(QPoint(x, y), image)
+        index[country_code] = [x, y, image.width(), image.height()]
+    painter.end()
+
+    return atlas, index
+
+
+def main(argv=None):
+    """
+    @brief Builds the atlas of all currency flags and writes it to Pictures/
+    @param argv: Command line arguments, sys.argv if None
+    @return Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m currency.build_flag_atlas",
+                                     description="Pack the flags of all currencies into the bundled sprite atlas.")
+    parser.add_argument("--flag-dir", default=None,
+                        help="directory of flag images named <country code>.png, the flags are downloaded by default")
+    args = parser.parse_args(argv)
+
+    app = QGuiApplication(sys.argv[:1])
+    country_codes = list(dict.fromkeys(flag_country(code) for code, _ in get_currency_name() if code != "EUR"))
+    atlas, index = build_atlas(country_codes, flag_dir=args.flag_dir)
+
+    if not atlas.save(ATLAS_IMAGE_PATH, "PNG"):
+        print(f"Error writing {ATLAS_IMAGE_PATH}")
+        return 1
+    with open(ATLAS_INDEX_PATH, "w", encoding="utf-8") as file:
+        json.dump({"cell": list(ATLAS_CELL), "flags": index}, file, separators=(",", ":"), sort_keys=True)
+
+    print(f"Packed {len(index)} of {len(country_codes)} flags into {ATLAS_IMAGE_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,198 +6,605 @@
 @date 01.10. 2024
 """
 
-import requests
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from types import MappingProxyType
+from .currency_providers import HistoryRateProvider, HttpRateProvider, ProviderError
+from .currency_transport import Transport
 
 API_URL = "https://api.exchangerate-api.com/v4/latest/euro"
 FLAG_API_URL = "https://flagsapi.com"
 
+# Pooled HTTP transport shared by all requests of the currency API
+transport = Transport()
+# Provider of the rates and flags, replaced with set_provider
+provider = HttpRateProvider(API_URL, FLAG_API_URL, transport)
+
+# Seconds the downloaded rates are served from memory before they are revalidated
+RATE_CACHE_TTL = 3600
+
+# Directory of the snapshots of the last good rates document, used for an offline warm start
+SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".calcu-lajda", "rates")
+SNAPSHOT_PREFIX = "rates-"
+# Snapshots older than this many seconds are deleted, the newest one is always kept
+SNAPSHOT_MAX_AGE = 7 * 24 * 3600
+
+# Directory of the downloaded flag images
+FLAG_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".calcu-lajda", "flags")
+
+
+def write_atomically(path, data):
+    """
+    @brief Function writes bytes to a file so that readers never see a partial file
+    @param path Path of the file
+    @param data Bytes to write
+
+    @exception OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Written to a temporary file first, so a crash never leaves a partial file
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def snapshot_files(directory=SNAPSHOT_DIR):
+    """
+    @brief Function returns the snapshot files of a directory, newest first
+    @param directory Snapshot directory
+    @return List of snapshot file paths
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    # The names contain a zero padded timestamp, so sorting them sorts by age
+    names = sorted((name for name in names if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".json")),
+                   reverse=True)
+    return [os.path.join(directory, name) for name in names]
+
+
+def save_snapshot(rates, provider, directory=SNAPSHOT_DIR):
+    """
+    @brief Function atomically writes rates to a new snapshot and rotates the old ones
+    @param rates Dictionary of rates by currency code
+    @param provider URL the rates were downloaded from
+    @param directory Snapshot directory
+    @return Path of the snapshot, or None if it could not be written
+    """
+    timestamp = time.time()
+    path = os.path.join(directory, f"{SNAPSHOT_PREFIX}{int(timestamp * 1000):015d}.json")
+    data = {"timestamp": timestamp, "provider": provider, "rates": rates}
+
+    try:
+        write_atomically(path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+    except OSError as e:
+        print(f"Error saving rate snapshot: {e}")
+        return None
+
+    rotate_snapshots(directory)
+    return path
+
+
+def rotate_snapshots(directory=SNAPSHOT_DIR, max_age=SNAPSHOT_MAX_AGE):
+    """
+    @brief Function deletes snapshots older than max_age, always keeping the newest one
+    @param directory Snapshot directory
+    @param max_age Maximum age of the kept snapshots in seconds
+    """
+    now = time.time()
+    for path in snapshot_files(directory)[1:]:
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def load_snapshot(directory=SNAPSHOT_DIR):
+    """
+    @brief Function loads the newest readable snapshot
+    @param directory Snapshot directory
+    @return Dictionary with timestamp, provider and rates, or None if there is no snapshot
+    """
+    for path in snapshot_files(directory):
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            if isinstance(data.get("rates"), dict):
+                return data
+        except (OSError, ValueError, AttributeError):
+            continue
+    return None
+
+
+def record_history(rates, date=None):
+    """
+    @brief Function appends downloaded rates to the local rate history
+    @param rates Dictionary of rates by currency code
+    @param date ISO date the rates were published on, today if None or invalid
+    """
+    # The NumPy history is only imported once rates are recorded
+    from .rate_history import day_ordinal, rate_history
+
+    try:
+        day = day_ordinal(date)
+    except (TypeError, ValueError, AttributeError):
+        day = datetime.date.today().toordinal()
+    rate_history.add_snapshot(day, rates)
+
+
+class RateCache:
+    """
+    @brief Class keeping the rates document of a provider in memory for a limited time
+    """
+
+    def __init__(self, source=None, ttl=RATE_CACHE_TTL, snapshot_dir=SNAPSHOT_DIR):
+        """
+        @brief Initializes an empty rate cache
+        @param source RateProvider of the rates, the module provider if None
+        @param ttl Seconds the rates are served before they are revalidated
+        @param snapshot_dir Directory of the rate snapshots and the rate history, None to disable them
+        """
+        self.source = source if source is not None else provider
+        self.ttl = ttl
+        self.snapshot_dir = snapshot_dir
+        self.rates = None
+        self.fetched_at = 0.0
+        # True while the rates come from a snapshot and were not confirmed by the server yet
+        self.stale = False
+        # Wall clock time and provider of the rates
+        self.timestamp = None
+        self.provider = None
+        # Validators of the cached document for conditional requests
+        self.etag = None
+        self.last_modified = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # RateTable of the current rates, rebuilt when the rates change
+        self._table = None
+
+    def is_fresh(self):
+        """
+        @brief Returns whether the cached rates are younger than the TTL
+        @return True if the rates can be served without revalidation
+        """
+        return self.rates is not None and time.monotonic() - self.fetched_at < self.ttl
+
+    def get_rates(self):
+        """
+        @brief Returns the rates, downloading or revalidating them when they expired
+        @return Dictionary of rates by currency code, or None if they could not be fetched
+        """
+        with self.lock:
+            if self.is_fresh():
+                self.hits += 1
+                return self.rates
+            self.misses += 1
+
+        self.fetch()
+        return self.rates
+
+    def cached_rates(self):
+        """
+        @brief Returns the rates in memory without fetching them, even if they expired
+        @return Dictionary of rates by currency code, or None if no rates were loaded
+        """
+        return self.rates
+
+    def fetch(self):
+        """
+        @brief Fetches the rates document, or only revalidates it if the provider supports it
+        If the fetch fails, the previous rates stay in the cache and are served until the next try.
+        The lock is not held during the fetch, so cached rates are served meanwhile.
+        @return True if the rates were fetched or confirmed by the provider
+        """
+        etag = last_modified = None
+        with self.lock:
+            if self.rates is not None and not self.stale:
+                etag = self.etag
+                last_modified = self.last_modified
+            source = self.source
+
+        try:
+            response = source.fetch_rates(etag, last_modified)
+        except ProviderError as e:
+            print(f"Error fetching data: {e}")
+            return False
+
+        with self.lock:
+            if source is not self.source:
+                # The provider was replaced during the fetch
+                return False
+            if response.not_modified:
+                if self.rates is None:
+                    return False
+                self.fetched_at = time.monotonic()
+                return True
+            self.rates = response.rates
+            self.etag = response.etag
+            self.last_modified = response.last_modified
+            self.fetched_at = time.monotonic()
+            self.timestamp = time.time()
+            self.provider = source.name
+            self.stale = False
+
+        if self.snapshot_dir is not None:
+            save_snapshot(response.rates, source.name, self.snapshot_dir)
+            if not source.historical:
+                record_history(response.rates, response.date)
+        return True
+
+    def warm_start(self):
+        """
+        @brief Serves the newest snapshot as stale rates and refreshes them in the background
+        @return True if a snapshot was loaded
+        """
+        if self.snapshot_dir is None:
+            return False
+
+        data = load_snapshot(self.snapshot_dir)
+
+        with self.lock:
+            if data is None or self.rates is not None:
+                loaded = False
+            else:
+                self.rates = data["rates"]
+                self.timestamp = data.get("timestamp")
+                self.provider = data.get("provider")
+                self.stale = True
+                # Served until the background refresh replaces them, or for one TTL if it fails
+                self.fetched_at = time.monotonic()
+                loaded = True
+
+        if loaded:
+            threading.Thread(target=self.fetch, daemon=True).start()
+        return loaded
+
+    def table(self, rates=None):
+        """
+        @brief Returns the rates as a vectorized RateTable, reusing it while the rates do not change
+        @param rates Dictionary of rates returned by get_rates, the current rates if None
+        @return The RateTable, or None if the rates could not be fetched
+        """
+        if rates is None:
+            rates = self.get_rates()
+        if rates is None:
+            return None
+
+        table = self._table
+        if table is None or table[0] is not rates:
+            # The NumPy layer is only imported when a table is first needed
+            from .rate_table import RateTable
+            table = (rates, RateTable(rates))
+            self._table = table
+        return table[1]
+
+    def clear(self):
+        """
+        @brief Forgets the cached rates and resets the counters
+        """
+        with self.lock:
+            self.rates = None
+            self.fetched_at = 0.0
+            self.stale = False
+            self.timestamp = None
+            self.provider = None
+            self.etag = None
+            self.last_modified = None
+            self.hits = 0
+            self.misses = 0
+
+    def set_source(self, source):
+        """
+        @brief Replaces the provider and forgets the rates of the previous one
+        @param source RateProvider of the rates
+        """
+        self.clear()
+        with self.lock:
+            self.source = source
+
+    def stats(self):
+        """
+        @brief Returns the cache hit and miss counters
+        @return Dictionary with the number of hits and misses
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+rate_cache = RateCache()
+
+
+def get_cache_stats():
+    """
+    @brief Function returns hit and miss counters of the exchange rate cache
+    @return Dictionary with the number of hits and misses
+    """
+    return rate_cache.stats()
+
+
+def rates_are_stale():
+    """
+    @brief Function returns whether the served rates come from an unconfirmed offline snapshot
+    @return True if the rates are stale
+    """
+    return rate_cache.stale
+
+
+def get_rates_timestamp():
+    """
+    @brief Function returns when the served rates were downloaded
+    @return Unix timestamp, or None if no rates were loaded
+    """
+    return rate_cache.timestamp
+
+
+def get_rate_table():
+    """
+    @brief Function returns the exchange rates as a vectorized table
+    @return RateTable of the current rates, or None if they could not be fetched
+    """
+    return rate_cache.table()
+
+
+def convert_to_all(amount, base_currency):
+    """
+    @brief Function converts one amount into every supported currency
+    @param amount Amount in the base currency
+    @param base_currency Base currency
+    @return Dictionary of converted amounts by currency code, or None if the rates could not be fetched
+    """
+    table = rate_cache.table()
+    if table is None:
+        return None
+    return table.convert_to_all(amount, base_currency)
+
+
+def set_provider(source):
+    """
+    @brief Function replaces the provider of the rates and flags
+    @param source RateProvider, e.g. a FileRateProvider or an HttpRateProvider of a local server
+    """
+    global provider
+    provider = source
+    rate_cache.set_source(source)
+
+
+def import_rates(path, base=None, serve=True):
+    """
+    @brief Function streams a central bank history file (CSV or XML) into the rate history
+    @param path Path of the history file
+    @param base Currency the rates are relative to, the history base (EUR) if None
+    @param serve Whether the latest imported day replaces the downloaded rates, so no network is needed
+    @return Number of imported rates
+
+    @exception OSError: If the file cannot be read.
+    @exception csv.Error: If the CSV file is not valid.
+    @exception ValueError: If the file has no header row or is not valid XML.
+    """
+    # The NumPy history is only imported when it is used
+    from .rate_history import HISTORY_BASE, rate_history
+
+    count = rate_history.import_file(path, base or HISTORY_BASE)
+    if serve:
+        flags = provider.flags if isinstance(provider, HistoryRateProvider) else provider
+        set_provider(HistoryRateProvider(rate_history, flags))
+    return count
+
+
+def get_latency_stats():
+    """
+    @brief Function returns latency statistics of the recent requests per host
+    @return Dictionary mapping hosts to their count, mean, median and maximum latency in seconds
+    """
+    return transport.latency_stats()
+
+
+def set_cache_ttl(seconds):
+    """
+    @brief Function sets how long the exchange rates are served from memory
+    @param seconds Time to live of the cached rates in seconds
+    """
+    rate_cache.ttl = seconds
+
 
 def get_supported_currencies():
     """
     @brief Function returns list of supported currencies
     @return List of supported currencies
     """
-    url = f"{API_URL}"
-    response = requests.get(url)
+    rates = rate_cache.get_rates()
 
-    if response.status_code == 200:
-        data = response.json()
-        return data.get('rates', {}).keys()
+    if rates is not None:
+        return rates.keys()
     else:
-        print(f"Error fetching data: {response.status_code}")
         return None
 
 
+# Names of the supported currencies by code, built once and shared by the whole application
+CURRENCY_NAMES = MappingProxyType({
+    "EUR": "Euro",
+    "AED": "United Arab Emirates Dirham",
+    "AFN": "Afghan Afghani",
+    "ALL": "Albanian Lek",
+    "AMD": "Armenian Dram",
+    "ANG": "Netherlands Antillean Guilder",
+    "AOA": "Angolan Kwanza",
+    "ARS": "Argentine Peso",
+    "AUD": "Australian Dollar",
+    "AWG": "Aruban Florin",
+    "AZN": "Azerbaijani Manat",
+    "BAM": "Bosnian Convertible Mark",
+    "BBD": "Barbadian Dollar",
+    "BDT": "Bangladeshi Taka",
+    "BGN": "Bulgarian Lev",
+    "BHD": "Bahraini Dinar",
+    "BIF": "Burundian Franc",
+    "BMD": "Bermudian Dollar",
+    "BND": "Brunei Dollar",
+    "BOB": "Bolivian Boliviano",
+    "BRL": "Brazilian Real",
+    "BSD": "Bahamian Dollar",
+    "BTN": "Bhutanese Ngultrum",
+    "BWP": "Botswanan Pula",
+    "BYN": "Belarusian Ruble",
+    "BZD": "Belize Dollar",
+    "CAD": "Canadian Dollar",
+    "CDF": "Congolese Franc",
+    "CHF": "Swiss Franc",
+    "CLP": "Chilean Peso",
+    "CNY": "Chinese Yuan",
+    "COP": "Colombian Peso",
+    "CRC": "Costa Rican Colón",
+    "CUP": "Cuban Peso",
+    "CVE": "Cape Verdean Escudo",
+    "CZK": "Czech Koruna",
+    "DJF": "Djiboutian Franc",
+    "DKK": "Danish Krone",
+    "DOP": "Dominican Peso",
+    "DZD": "Algerian Dinar",
+    "EGP": "Egyptian Pound",
+    "ERN": "Eritrean Nakfa",
+    "ETB": "Ethiopian Birr",
+    "FJD": "Fijian Dollar",
+    "FKP": "Falkland Islands Pound",
+    "FOK": "Faroese Króna",
+    "GBP": "British Pound Sterling",
+    "GEL": "Georgian Lari",
+    "GGP": "Guernsey Pound",
+    "GHS": "Ghanaian Cedi",
+    "GIP": "Gibraltar Pound",
+    "GMD": "Gambian Dalasi",
+    "GNF": "Guinean Franc",
+    "GTQ": "Guatemalan Quetzal",
+    "GYD": "Guyanaese Dollar",
+    "HKD": "Hong Kong Dollar",
+    "HNL": "Honduran Lempira",
+    "HRK": "Croatian Kuna",
+    "HTG": "Haitian Gourde",
+    "HUF": "Hungarian Forint",
+    "IDR": "Indonesian Rupiah",
+    "ILS": "Israeli New Sheqel",
+    "IMP": "Isle of Man Pound",
+    "INR": "Indian Rupee",
+    "IQD": "Iraqi Dinar",
+    "IRR": "Iranian Rial",
+    "ISK": "Icelandic Króna",
+    "JEP": "Jersey Pound",
+    "JMD": "Jamaican Dollar",
+    "JOD": "Jordanian Dinar",
+    "JPY": "Japanese Yen",
+    "KES": "Kenyan Shilling",
+    "KGS": "Kyrgyzstani Som",
+    "KHR": "Cambodian Riel",
+    "KID": "Australian Dollar (Kiribati)",
+    "KMF": "Comorian Franc",
+    "KRW": "South Korean Won",
+    "KWD": "Kuwaiti Dinar",
+    "KYD": "Cayman Islands Dollar",
+    "KZT": "Kazakhstani Tenge",
+    "LAK": "Lao Kip",
+    "LBP": "Lebanese Pound",
+    "LKR": "Sri Lankan Rupee",
+    "LRD": "Liberian Dollar",
+    "LSL": "Lesotho Loti",
+    "LYD": "Libyan Dinar",
+    "MAD": "Moroccan Dirham",
+    "MDL": "Moldovan Leu",
+    "MGA": "Malagasy Ariary",
+    "MKD": "Macedonian Denar",
+    "MMK": "Myanma Kyat",
+    "MNT": "Mongolian Tögrög",
+    "MOP": "Macanese Pataca",
+    "MRU": "Mauritanian Ouguiya",
+    "MUR": "Mauritian Rupee",
+    "MVR": "Maldivian Rufiyaa",
+    "MWK": "Malawian Kwacha",
+    "MXN": "Mexican Peso",
+    "MYR": "Malaysian Ringgit",
+    "MZN": "Mozambican Metical",
+    "NAD": "Namibian Dollar",
+    "NGN": "Nigerian Naira",
+    "NIO": "Nicaraguan Córdoba",
+    "NOK": "Norwegian Krone",
+    "NPR": "Nepalese Rupee",
+    "NZD": "New Zealand Dollar",
+    "OMR": "Omani Rial",
+    "PAB": "Panamanian Balboa",
+    "PEN": "Peruvian Nuevo Sol",
+    "PGK": "Papua New Guinean Kina",
+    "PHP": "Philippine Peso",
+    "PKR": "Pakistani Rupee",
+    "PLN": "Polish Zloty",
+    "PYG": "Paraguayan Guarani",
+    "QAR": "Qatari Rial",
+    "RON": "Romanian Leu",
+    "RSD": "Serbian Dinar",
+    "RUB": "Russian Ruble",
+    "RWF": "Rwandan Franc",
+    "SAR": "Saudi Riyal",
+    "SBD": "Solomon Islands Dollar",
+    "SCR": "Seychellois Rupee",
+    "SDG": "Sudanese Pound",
+    "SEK": "Swedish Krona",
+    "SGD": "Singapore Dollar",
+    "SHP": "Saint Helena Pound",
+    "SLE": "Sierra Leonean Leone",
+    "SLL": "Sierra Leonean Leone (new)",
+    "SOS": "Somali Shilling",
+    "SRD": "Surinamese Dollar",
+    "SSP": "South Sudanese Pound",
+    "STN": "São Tomé and Príncipe Dobra",
+    "SYP": "Syrian Pound",
+    "SZL": "Swazi Lilangeni",
+    "THB": "Thai Baht",
+    "TJS": "Tajikistani Somoni",
+    "TMT": "Turkmenistani Manat",
+    "TND": "Tunisian Dinar",
+    "TOP": "Tongan Paʻanga",
+    "TRY": "Turkish Lira",
+    "TTD": "Trinidad and Tobago Dollar",
+    "TVD": "Australian Dollar (Tuvalu)",
+    "TWD": "New Taiwan Dollar",
+    "TZS": "Tanzanian Shilling",
+    "UAH": "Ukrainian Hryvnia",
+    "UGX": "Ugandan Shilling",
+    "USD": "United States Dollar",
+    "UYU": "Uruguayan Peso",
+    "UZS": "Uzbekistani Som",
+    "VES": "Venezuelan Bolívar",
+    "VND": "Vietnamese Dong",
+    "VUV": "Vanuatu Vatu",
+    "WST": "Samoan Tala",
+    "XAF": "Central African CFA Franc",
+    "XCD": "East Caribbean Dollar",
+    "XDR": "Special Drawing Rights",
+    "XOF": "West African CFA Franc",
+    "XPF": "CFP Franc",
+    "YER": "Yemeni Rial",
+    "ZAR": "South African Rand",
+    "ZMW": "Zambian Kwacha",
+    "ZWL": "Zimbabwean Dollar"
+})
+
+
 def get_currency_name():
     """
     @brief Function returns dictionary of currency names.
-    @return Dictionary of currency names
-    """
-    names = {
-        "EUR": "Euro",
-        "AED": "United Arab Emirates Dirham",
-        "AFN": "Afghan Afghani",
-        "ALL": "Albanian Lek",
-        "AMD": "Armenian Dram",
-        "ANG": "Netherlands Antillean Guilder",
-        "AOA": "Angolan Kwanza",
-        "ARS": "Argentine Peso",
-        "AUD": "Australian Dollar",
-        "AWG": "Aruban Florin",
-        "AZN": "Azerbaijani Manat",
-        "BAM": "Bosnian Convertible Mark",
-        "BBD": "Barbadian Dollar",
-        "BDT": "Bangladeshi Taka",
-        "BGN": "Bulgarian Lev",
-        "BHD": "Bahraini Dinar",
-        "BIF": "Burundian Franc",
-        "BMD": "Bermudian Dollar",
-        "BND": "Brunei Dollar",
-        "BOB": "Bolivian Boliviano",
-        "BRL": "Brazilian Real",
-        "BSD": "Bahamian Dollar",
-        "BTN": "Bhutanese Ngultrum",
-        "BWP": "Botswanan Pula",
-        "BYN": "Belarusian Ruble",
-        "BZD": "Belize Dollar",
-        "CAD": "Canadian Dollar",
-        "CDF": "Congolese Franc",
-        "CHF": "Swiss Franc",
-        "CLP": "Chilean Peso",
-        "CNY": "Chinese Yuan",
-        "COP": "Colombian Peso",
-        "CRC": "Costa Rican Colón",
-        "CUP": "Cuban Peso",
-        "CVE": "Cape Verdean Escudo",
-        "CZK": "Czech Koruna",
-        "DJF": "Djiboutian Franc",
-        "DKK": "Danish Krone",
-        "DOP": "Dominican Peso",
-        "DZD": "Algerian Dinar",
-        "EGP": "Egyptian Pound",
-        "ERN": "Eritrean Nakfa",
-        "ETB": "Ethiopian Birr",
-        "FJD": "Fijian Dollar",
-        "FKP": "Falkland Islands Pound",
-        "FOK": "Faroese Króna",
-        "GBP": "British Pound Sterling",
-        "GEL": "Georgian Lari",
-        "GGP": "Guernsey Pound",
-        "GHS": "Ghanaian Cedi",
-        "GIP": "Gibraltar Pound",
-        "GMD": "Gambian Dalasi",
-        "GNF": "Guinean Franc",
-        "GTQ": "Guatemalan Quetzal",
-        "GYD": "Guyanaese Dollar",
-        "HKD": "Hong Kong Dollar",
-        "HNL": "Honduran Lempira",
-        "HRK": "Croatian Kuna",
-        "HTG": "Haitian Gourde",
-        "HUF": "Hungarian Forint",
-        "IDR": "Indonesian Rupiah",
-        "ILS": "Israeli New Sheqel",
-        "IMP": "Isle of Man Pound",
-        "INR": "Indian Rupee",
-        "IQD": "Iraqi Dinar",
-        "IRR": "Iranian Rial",
-        "ISK": "Icelandic Króna",
-        "JEP": "Jersey Pound",
-        "JMD": "Jamaican Dollar",
-        "JOD": "Jordanian Dinar",
-        "JPY": "Japanese Yen",
-        "KES": "Kenyan Shilling",
-        "KGS": "Kyrgyzstani Som",
-        "KHR": "Cambodian Riel",
-        "KID": "Australian Dollar (Kiribati)",
-        "KMF": "Comorian Franc",
-        "KRW": "South Korean Won",
-        "KWD": "Kuwaiti Dinar",
-        "KYD": "Cayman Islands Dollar",
-        "KZT": "Kazakhstani Tenge",
-        "LAK": "Lao Kip",
-        "LBP": "Lebanese Pound",
-        "LKR": "Sri Lankan Rupee",
-        "LRD": "Liberian Dollar",
-        "LSL": "Lesotho Loti",
-        "LYD": "Libyan Dinar",
-        "MAD": "Moroccan Dirham",
-        "MDL": "Moldovan Leu",
-        "MGA": "Malagasy Ariary",
-        "MKD": "Macedonian Denar",
-        "MMK": "Myanma Kyat",
-        "MNT": "Mongolian Tögrög",
-        "MOP": "Macanese Pataca",
-        "MRU": "Mauritanian Ouguiya",
-        "MUR": "Mauritian Rupee",
-        "MVR": "Maldivian Rufiyaa",
-        "MWK": "Malawian Kwacha",
-        "MXN": "Mexican Peso",
-        "MYR": "Malaysian Ringgit",
-        "MZN": "Mozambican Metical",
-        "NAD": "Namibian Dollar",
-        "NGN": "Nigerian Naira",
-        "NIO": "Nicaraguan Córdoba",
-        "NOK": "Norwegian Krone",
-        "NPR": "Nepalese Rupee",
-        "NZD": "New Zealand Dollar",
-        "OMR": "Omani Rial",
-        "PAB": "Panamanian Balboa",
-        "PEN": "Peruvian Nuevo Sol",
-        "PGK": "Papua New Guinean Kina",
-        "PHP": "Philippine Peso",
-        "PKR": "Pakistani Rupee",
-        "PLN": "Polish Zloty",
-        "PYG": "Paraguayan Guarani",
-        "QAR": "Qatari Rial",
-        "RON": "Romanian Leu",
-        "RSD": "Serbian Dinar",
-        "RUB": "Russian Ruble",
-        "RWF": "Rwandan Franc",
-        "SAR": "Saudi Riyal",
-        "SBD": "Solomon Islands Dollar",
-        "SCR": "Seychellois Rupee",
-        "SDG": "Sudanese Pound",
-        "SEK": "Swedish Krona",
-        "SGD": "Singapore Dollar",
-        "SHP": "Saint Helena Pound",
-        "SLE": "Sierra Leonean Leone",
-        "SLL": "Sierra Leonean Leone (new)",
-        "SOS": "Somali Shilling",
-        "SRD": "Surinamese Dollar",
-        "SSP": "South Sudanese Pound",
-        "STN": "São Tomé and Príncipe Dobra",
-        "SYP": "Syrian Pound",
-        "SZL": "Swazi Lilangeni",
-        "THB": "Thai Baht",
-        "TJS": "Tajikistani Somoni",
-        "TMT": "Turkmenistani Manat",
-        "TND": "Tunisian Dinar",
-        "TOP": "Tongan Paʻanga",
-        "TRY": "Turkish Lira",
-        "TTD": "Trinidad and Tobago Dollar",
-        "TVD": "Australian Dollar (Tuvalu)",
-        "TWD": "New Taiwan Dollar",
-        "TZS": "Tanzanian Shilling",
-        "UAH": "Ukrainian Hryvnia",
-        "UGX": "Ugandan Shilling",
-        "USD": "United States Dollar",
-        "UYU": "Uruguayan Peso",
-        "UZS": "Uzbekistani Som",
-        "VES": "Venezuelan Bolívar",
-        "VND": "Vietnamese Dong",
-        "VUV": "Vanuatu Vatu",
-        "WST": "Samoan Tala",
-        "XAF": "Central African CFA Franc",
-        "XCD": "East Caribbean Dollar",
-        "XDR": "Special Drawing Rights",
-        "XOF": "West African CFA Franc",
-        "XPF": "CFP Franc",
-        "YER": "Yemeni Rial",
-        "ZAR": "South African Rand",
-        "ZMW": "Zambian Kwacha",
-        "ZWL": "Zimbabwean Dollar"
-    }
-    return names.items()
+    @return View of the (code, name) pairs of CURRENCY_NAMES
+    """
+    return CURRENCY_NAMES.items()
 
 
 def get_flag_image(country_code, style="flat", size=64):
@@ -208,13 +615,7 @@ def get_flag_image(country_code, style="flat", size=64):
     @param size Flag size
     @return Flag image
     """
-    url = f"{FLAG_API_URL}/{country_code}/{style}/{size}.png"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.content
-    else:
-        print(f"Error fetching flag for {country_code}: {response.status_code}")
-        return None
+    return provider.fetch_flag(country_code, style, size)
 
 
 def get_exchange_rate(base_currency, target_currency):
@@ -224,13 +625,52 @@ def get_exchange_rate(base_currency, target_currency):
     @param target_currency Target currency
     @return Exchange rate
     """
-    response = requests.get(API_URL)
+    rates = rate_cache.get_rates()
 
-    if response.status_code == 200:
-        data = response.json()
-        rates = data.get('rates', {})
+    if rates is not None:
         base_rate = rates.get(base_currency.upper(), None)
         target_rate = rates.get(target_currency.upper(), None)
         return base_rate, target_rate
     else:
         return None
+
+
+def flag_cache_path(country_code, style="flat", size=64, directory=FLAG_CACHE_DIR):
+    """
+    @brief Function returns the path of a flag image in the on-disk cache
+    @param country_code Country code
+    @param style Flag style
+    @param size Flag size
+    @param directory Flag cache directory
+    @return Path of the PNG file
+    """
+    return os.path.join(directory, f"{country_code}-{style}-{size}.png")
+
+
+def get_cached_flag_image(country_code, style="flat", size=64, download=True, directory=FLAG_CACHE_DIR):
+    """
+    @brief Function returns flag image from the on-disk cache, downloading it if missing
+    @param country_code Country code
+    @param style Flag style
+    @param size Flag size
+    @param download If False, only the on-disk cache is read
+    @param directory Flag cache directory
+    @return Flag image, or None if it is not cached and could not be downloaded
+    """
+    path = flag_cache_path(country_code, style, size, directory)
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError:
+        pass
+
+    if not download:
+        return None
+
+    data = get_flag_image(country_code, style, size)
+    if data:
+        try:
+            write_atomically(path, data)
+        except OSError as e:
+            print(f"Error caching flag for {country_code}: {e}")
+    return data
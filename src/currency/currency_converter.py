@@ -6,15 +6,18 @@
 @date 17.09. 2024
 """
 
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QSize, Qt, QTimer
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QFrame, QSizePolicy)
-from .currency_api import get_exchange_rate
+    QWidget, QVBoxLayout, QFrame, QSizePolicy, QFileDialog)
+from .currency_api import rate_cache, rates_are_stale, get_rates_timestamp
+from .currency_worker import BatchRunner, RateLoader, RateScheduler
+from .money import Money
 from utils.img_path import resource_path
 from .currency_display import CurrencyDisplay
 from .currency_buttons import CurrencyButtons
 import os
+import time
 
 # Color definitions
 LIGHT_GRAY = "#979797"
@@ -26,6 +29,12 @@ LABEL_COLOR = "#25265E"
 HOVER_COLOR = "#898989"
 HOVER_OPERATOR = "#FF8409"
 
+# Milliseconds between live conversions, one frame at 60 Hz
+LIVE_CONVERSION_INTERVAL = 16
+
+# Difference between a Julian day number and a Python date ordinal
+JULIAN_DAY_OFFSET = 1721425
+
 class CurrencyConverter(QWidget):
     """
     @brief Class representing the currency converter mode of the calculator
@@ -37,7 +46,13 @@ class CurrencyConverter(QWidget):
         """
         super().__init__()
         self.setStyleSheet(f"background-color: {DARK_GRAY}; color: white;")
-        
+
+        # Live conversion of the typed amount, a burst of edits is converted once per frame
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_CONVERSION_INTERVAL)
+        self.live_timer.timeout.connect(self.live_convert)
+
         self.displayFrame = CurrencyDisplay(self)
         
         self.flag1_label = self.displayFrame.flag1_label
@@ -49,6 +64,8 @@ class CurrencyConverter(QWidget):
         self.amount1 = self.displayFrame.amount1
         self.amount2 = self.displayFrame.amount2
         self.spacer = self.displayFrame.spacer
+        self.batch_button = self.displayFrame.batch_button
+        self.rate_date = self.displayFrame.rate_date
         
         self.buttonWidget = CurrencyButtons(self)
         
@@ -58,6 +75,25 @@ class CurrencyConverter(QWidget):
         self.mainLayout.addWidget(self.displayFrame)
         self.mainLayout.addWidget(self.buttonWidget)
 
+        # Conversion waiting for the rates as (amount, base currency, target currency)
+        self.pending_conversion = None
+        self.rate_loader = RateLoader(self)
+        self.rate_loader.rates_ready.connect(self.on_rates_ready)
+        self.currency1.currentIndexChanged.connect(self.cancel_conversion)
+        self.currency2.currentIndexChanged.connect(self.cancel_conversion)
+
+        self.batch_runner = BatchRunner(self)
+        self.batch_runner.progress.connect(self.on_batch_progress)
+        self.batch_runner.task_finished.connect(self.on_batch_finished)
+
+        # The rates are refreshed in the background, only a change of the shown currencies converts again
+        self.rate_scheduler = RateScheduler(self)
+        self.rate_scheduler.rates_changed.connect(self.on_rates_changed)
+        self.rate_scheduler.start()
+
+        # Conversions are served from the last saved rates until the background refresh finishes
+        rate_cache.warm_start()
+
     def clear_input(self):
         """
         @brief Clears the input fields
@@ -101,31 +137,210 @@ class CurrencyConverter(QWidget):
         target_currency = self.currency2.currentIndex()
         self.currency1.setCurrentIndex(target_currency)
         self.currency2.setCurrentIndex(base_currency)
-        self.amount1.clear()
-        self.amount2.clear()
 
     def convert_currency(self):
         """
         @brief Converts the amount from one currency to another
+        Cached rates are used right away, otherwise they are loaded on a worker thread and
+        the conversion finishes in on_rates_ready.
         """
         if not self.amount1.text():
             return
-            
+
+        base_currency = self.currency1.currentData()
+        target_currency = self.currency2.currentData()
+
         try:
-            base_currency = self.currency1.currentText()
-            base_currency = base_currency.split(' | ')[0]
-            target_currency = self.currency2.currentText()
-            target_currency = target_currency.split(' | ')[0]
-            amount = float(self.amount1.text())
-            exchange_rate = get_exchange_rate(base_currency, target_currency)
-
-            if exchange_rate is not None:
-                converted_amount = amount * exchange_rate[1] / exchange_rate[0]
-                self.amount2.setText(f"{converted_amount:.2f}")
-            else:
-                self.amount2.setText("Error")
-        except (ValueError, ZeroDivisionError):
+            amount = Money.parse(self.amount1.text(), base_currency)
+        except ValueError:
             self.amount2.setText("Error")
+            return
+
+        if self.rate_date.date() != self.rate_date.minimumDate():
+            self.show_historical_conversion(amount, base_currency, target_currency, self.rate_date.date())
+            return
+
+        if rate_cache.is_fresh():
+            self.show_conversion(amount, base_currency, target_currency, rate_cache.get_rates())
+            return
+
+        self.pending_conversion = (amount, base_currency, target_currency)
+        self.amount2.clear()
+        self.amount2.setPlaceholderText("Loading rates...")
+        self.rate_loader.load()
+
+    def schedule_conversion(self):
+        """
+        @brief Converts the amount live on the next frame, edits made until then share the conversion
+        """
+        if not self.live_timer.isActive():
+            self.live_timer.start()
+
+    def live_convert(self):
+        """
+        @brief Converts the typed amount with the cached rates without waiting for the network
+        Expired rates are still shown, and refreshed in the background for the next conversion.
+        """
+        text = self.amount1.text()
+        if not text:
+            self.amount2.clear()
+            self.amount2.setToolTip("")
+            return
+
+        base_currency = self.currency1.currentData()
+        target_currency = self.currency2.currentData()
+
+        try:
+            amount = Money.parse(text, base_currency)
+        except ValueError:
+            # The conversion of the previous amount would be stale
+            self.amount2.clear()
+            self.amount2.setToolTip("")
+            return
+
+        if self.rate_date.date() != self.rate_date.minimumDate():
+            self.show_historical_conversion(amount, base_currency, target_currency, self.rate_date.date())
+            return
+
+        rates = rate_cache.cached_rates()
+        if not rate_cache.is_fresh():
+            self.rate_loader.load()
+        if rates is not None:
+            self.show_conversion(amount, base_currency, target_currency, rates)
+        else:
+            self.amount2.clear()
+            self.amount2.setPlaceholderText("Loading rates...")
+
+    def on_rates_ready(self, rates):
+        """
+        @brief Finishes the pending conversion once the rates are loaded
+        @param rates: Dictionary of rates by currency code, or None if they could not be loaded
+        """
+        self.amount2.setPlaceholderText("Converted Amount")
+        if self.pending_conversion is None:
+            # The live conversion is refreshed with the new rates
+            if self.amount1.text() and rates is not None:
+                self.schedule_conversion()
+            return
+
+        amount, base_currency, target_currency = self.pending_conversion
+        self.pending_conversion = None
+        self.show_conversion(amount, base_currency, target_currency, rates)
+
+    def on_rates_changed(self, codes):
+        """
+        @brief Converts the amount again when the refreshed rates changed one of the shown currencies
+        @param codes: frozenset of the codes whose rate changed
+        """
+        if not self.amount1.text() or self.rate_date.date() != self.rate_date.minimumDate():
+            return
+        if self.currency1.currentData() in codes or self.currency2.currentData() in codes:
+            self.schedule_conversion()
+
+    def cancel_conversion(self):
+        """
+        @brief Drops the conversion waiting for rates when a currency changes
+        """
+        self.pending_conversion = None
+
+    def show_conversion(self, amount, base_currency, target_currency, rates):
+        """
+        @brief Shows the converted amount
+        @param amount: Money in the base currency
+        @param base_currency: Code of the base currency
+        @param target_currency: Code of the target currency
+        @param rates: Dictionary of rates by currency code, or None
+        """
+        if rates is None:
+            self.amount2.setText("Error")
+            return
+
+        try:
+            converted_amount = rate_cache.table(rates).convert_money(amount, target_currency)
+            self.amount2.setText(str(converted_amount))
+            self.show_rates_age()
+        except (KeyError, ValueError, ZeroDivisionError):
+            self.amount2.setText("Error")
+
+    def show_historical_conversion(self, amount, base_currency, target_currency, date):
+        """
+        @brief Shows the amount converted at the rates of a past date from the local rate history
+        @param amount: Money in the base currency
+        @param base_currency: Code of the base currency
+        @param target_currency: Code of the target currency
+        @param date: QDate of the rates
+        """
+        # The NumPy history is only imported when a past date is selected
+        from .rate_history import rate_history
+        from .rate_table import RateTable
+
+        rates = rate_history.rates_on(date.toJulianDay() - JULIAN_DAY_OFFSET)
+        try:
+            converted_amount = RateTable(rates).convert_money(amount, target_currency)
+        except (KeyError, ValueError, ZeroDivisionError):
+            self.amount2.setText("Error")
+            self.amount2.setToolTip(f"No rates stored for {date.toString('dd.MM.yyyy')}")
+            return
+
+        self.amount2.setText(str(converted_amount))
+        self.amount2.setToolTip(f"Rates of {date.toString('dd.MM.yyyy')}")
+
+    def show_rates_age(self):
+        """
+        @brief Marks the converted amount when it was computed from offline rates
+        """
+        timestamp = get_rates_timestamp()
+        if rates_are_stale() and timestamp is not None:
+            saved = time.strftime("%d.%m.%Y %H:%M", time.localtime(timestamp))
+            self.amount2.setToolTip(f"Offline rates from {saved}")
+        else:
+            self.amount2.setToolTip("")
+
+    def convert_batch(self):
+        """
+        @brief Asks for a CSV ledger and converts it into a new file on a worker thread
+        """
+        if self.batch_runner.in_flight:
+            return
+
+        source_path, _ = QFileDialog.getOpenFileName(self, "Convert CSV file", "", "CSV files (*.csv);;All files (*)")
+        if not source_path:
+            return
+        default_path = os.path.splitext(source_path)[0] + "-converted.csv"
+        destination_path, _ = QFileDialog.getSaveFileName(self, "Save converted file", default_path, "CSV files (*.csv)")
+        if not destination_path:
+            return
+        if os.path.abspath(destination_path) == os.path.abspath(source_path):
+            self.amount2.setText("Error")
+            self.amount2.setToolTip("The converted file must not replace the input file")
+            return
+
+        self.batch_runner.start(source_path, destination_path)
+        self.batch_button.setEnabled(False)
+        self.amount2.clear()
+        self.amount2.setPlaceholderText("Converting file...")
+
+    def on_batch_progress(self, summary):
+        """
+        @brief Shows the number of rows converted so far
+        @param summary: BatchSummary of the rows written so far
+        """
+        self.amount2.setPlaceholderText(f"Converted {summary.rows} rows...")
+
+    def on_batch_finished(self, result):
+        """
+        @brief Shows the result of the file conversion
+        @param result: BatchSummary of the converted file, or the error message
+        """
+        self.batch_button.setEnabled(True)
+        self.amount2.setPlaceholderText("Converted Amount")
+        if isinstance(result, str):
+            self.amount2.setText("Error")
+            self.amount2.setToolTip(result)
+            return
+
+        self.amount2.setText(f"{result.converted} of {result.rows} rows converted")
+        self.amount2.setToolTip(f"{result.failed} rows could not be converted" if result.failed else "")
 
     def handle_sidebar_visibility(self, visible):
         """
@@ -5,12 +5,14 @@
 @author: Martin Valapka
 """
 
-from PySide6.QtCore import QSize, Qt, QRegularExpression
+from PySide6.QtCore import QDate, QSize, Qt, QRegularExpression, QTimer
 from PySide6.QtGui import QFont, QIcon, Qt, QShortcut, QKeySequence, QRegularExpressionValidator, QPixmap
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QFrame, QGridLayout, QFormLayout, QComboBox, QHBoxLayout,
-    QSpacerItem, QSizePolicy)
-from .currency_api import get_exchange_rate, get_supported_currencies, get_currency_name, get_flag_image
+    QSpacerItem, QSizePolicy, QDateEdit, QCompleter)
+from .currency_api import get_exchange_rate, get_supported_currencies, get_currency_name
+from .currency_model import CurrencyFilterModel, shared_currency_model
+from .flag_cache import FlagCache, flag_country
 from utils.img_path import resource_path
 import os
 import sys
@@ -43,6 +45,9 @@ class CurrencyDisplay(QWidget):
         self.currency_names = get_currency_name()
         self.eu_flag_path = resource_path(os.path.join('Pictures', 'european-union.png'))
 
+        self.flag_cache = FlagCache(70, 45, parent=self)
+        self.flag_cache.flag_ready.connect(self.on_flag_ready)
+
         self.displayFrame = QFrame(self)
         self.displayFrame.setStyleSheet(f"background-color: {DARK_GRAY};")
         self.displayFrame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -60,6 +65,9 @@ class CurrencyDisplay(QWidget):
         input_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.input_layout, self.currency1, self.currency2, self.amount1, self.amount2 = self.create_input_layout()
         input_widget.setLayout(self.input_layout)
+
+        # Warm the flag cache for every currency in the background
+        self.flag_cache.prefetch(flag_country(code) for code, _ in self.currency_names if code != "EUR")
         
         frame_layout.addWidget(input_widget, 0, 0)
 
@@ -139,7 +147,7 @@ class CurrencyDisplay(QWidget):
         currency1.setStyleSheet(combobox_style)
         currency1.setMinimumSize(320, 40)
         currency1.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        currency1.addItems([f"{code} | {name}" for code, name in self.currency_names])
+        self.setup_currency_search(currency1)
 
         amount1 = QLineEdit()
         amount1.setStyleSheet(amount_style)
@@ -171,7 +179,7 @@ class CurrencyDisplay(QWidget):
         currency2.setStyleSheet(combobox_style)
         currency2.setMinimumSize(320, 40)
         currency2.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        currency2.addItems([f"{code} | {name}" for code, name in self.currency_names])
+        self.setup_currency_search(currency2)
 
         amount2 = QLineEdit()
         amount2.setStyleSheet(amount_style)
@@ -180,6 +188,25 @@ class CurrencyDisplay(QWidget):
         amount2.setPlaceholderText("Converted Amount")
         amount2.setReadOnly(True)
 
+        batch_button = QPushButton("CSV")
+        batch_button.setFont(QFont("Arial", 10))
+        batch_button.setStyleSheet(f"""
+            QPushButton {{
+                background-color: #4F4F4F;
+                border-radius: 15px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background-color: {DARK_GRAY};
+            }}
+        """)
+        batch_button.setFixedSize(40, 40)
+        batch_button.setToolTip("Convert a CSV file of amount, from, to rows")
+        self.batch_button = batch_button
+
+        if self.parent:
+            batch_button.clicked.connect(self.parent.convert_batch)
+
         self.flag1_label = QLabel()
         self.flag1_label.setFixedSize(50, 35)
         self.flag2_label = QLabel()
@@ -209,14 +236,47 @@ class CurrencyDisplay(QWidget):
         vertical_spacer = QSpacerItem(20, 20, QSizePolicy.Minimum, QSizePolicy.Fixed)
         input_layout.addItem(vertical_spacer, 2, 0)
 
+        # Optional date of historical rates, the minimum date stands for the latest rates
+        rate_date = QDateEdit()
+        rate_date.setStyleSheet("""
+        QDateEdit {
+            color: white;
+            background-color: #4F4F4F;
+            border-radius: 5px;
+            padding: 0px 5px;
+        }
+        """)
+        rate_date.setCalendarPopup(True)
+        rate_date.setDisplayFormat("dd.MM.yyyy")
+        rate_date.setMinimumDate(QDate(1999, 1, 1))
+        rate_date.setMaximumDate(QDate.currentDate())
+        rate_date.setSpecialValueText("Latest rates")
+        rate_date.setDate(rate_date.minimumDate())
+        rate_date.setFixedHeight(20)
+        rate_date.setToolTip("Convert at the rates of a past date")
+        self.rate_date = rate_date
+
+        if self.parent:
+            rate_date.dateChanged.connect(self.parent.schedule_conversion)
+
+        input_layout.addWidget(rate_date, 2, 0, Qt.AlignRight)
+
+        amount2_layout = QHBoxLayout()
+        amount2_layout.addWidget(amount2)
+        amount2_layout.addWidget(batch_button)
+        amount2_layout.setSpacing(5)
+        amount2_layout.setAlignment(Qt.AlignLeft)
+
         input_layout.addLayout(currency2_layout, 3, 0)
-        input_layout.addWidget(amount2, 4, 0)
+        input_layout.addLayout(amount2_layout, 4, 0)
 
         currency1.currentIndexChanged.connect(lambda: self.update_flag(currency1, self.flag1_label))
         currency2.currentIndexChanged.connect(lambda: self.update_flag(currency2, self.flag2_label))
 
         if self.parent:
-            currency2.currentIndexChanged.connect(self.parent.clear_input)
+            currency1.currentIndexChanged.connect(self.parent.schedule_conversion)
+            currency2.currentIndexChanged.connect(self.parent.schedule_conversion)
+            amount1.textChanged.connect(self.parent.schedule_conversion)
 
         self.update_flag(currency1, self.flag1_label)
         self.update_flag(currency2, self.flag2_label)
@@ -227,15 +287,44 @@ class CurrencyDisplay(QWidget):
         
         return input_layout, currency1, currency2, amount1, amount2
 
+    def setup_currency_search(self, combo_box):
+        """
+        @brief Fills a combobox from the shared currency model and adds type-ahead search by code or name
+        @param combo_box: The QComboBox of a currency
+        """
+        combo_box.setModel(shared_currency_model())
+        combo_box.setEditable(True)
+        combo_box.setInsertPolicy(QComboBox.NoInsert)
+        combo_box.lineEdit().setStyleSheet("background-color: transparent; color: white;")
+
+        # QComboBox maps the chosen match of the proxy back to its own row
+        search_model = CurrencyFilterModel(combo_box.model(), combo_box)
+        completer = QCompleter(search_model, combo_box)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.popup().setStyleSheet(
+            "color: white; background-color: #4F4F4F; font-size: 14px; font-family: 'Consolas';")
+        combo_box.setCompleter(completer)
+
+        def search(text):
+            search_model.set_filter(text)
+            completer.complete()
+
+        def restore():
+            # Text that did not select a currency is replaced with the current one
+            combo_box.setEditText(combo_box.itemText(combo_box.currentIndex()))
+            search_model.set_filter("")
+
+        combo_box.lineEdit().textEdited.connect(search)
+        # Deferred, so a match chosen with Enter is selected before the text is restored
+        combo_box.lineEdit().editingFinished.connect(lambda: QTimer.singleShot(0, restore))
+
     def update_flag(self, combo_box, flag_label):
         """
         @brief Updates the flag image based on the selected currency
         @param combo_box: The QComboBox containing the currency selection
         @param flag_label: The QLabel where the flag image will be displayed
         """
-        currency_code = combo_box.currentText().split(' | ')[0]
-        flag_width = 70
-        flag_height = 45
+        currency_code = combo_box.currentData()
         eu_flag_width = 50
         eu_flag_height = 35
 
@@ -245,11 +334,18 @@ class CurrencyDisplay(QWidget):
                 flag_label.setPixmap(
                     pixmap.scaled(eu_flag_width, eu_flag_height, Qt.KeepAspectRatio, Qt.SmoothTransformation))
         else:
-            flag_data = get_flag_image(currency_code[:2])
-            if flag_data:
-                pixmap = QPixmap()
-                pixmap.loadFromData(flag_data)
-                flag_label.setPixmap(
-                    pixmap.scaled(flag_width, flag_height, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            # The flag is already scaled, a missing one is set by on_flag_ready once it is loaded
+            pixmap = self.flag_cache.pixmap(flag_country(currency_code))
+            if pixmap is not None:
+                flag_label.setPixmap(pixmap)
             else:
                 flag_label.clear()
+
+    def on_flag_ready(self, country_code):
+        """
+        @brief Shows a flag loaded in the background if its currency is still selected
+        @param country_code: Country code of the loaded flag
+        """
+        for combo_box, flag_label in ((self.currency1, self.flag1_label), (self.currency2, self.flag2_label)):
+            if flag_country(combo_box.currentData()) == country_code:
+                self.update_flag(combo_box, flag_label)
@@ -0,0 +1,150 @@
+"""
+@file currency_model.py
+@brief File containing the shared list model of the supported currencies.
+
+The rows are built once from CURRENCY_NAMES and shared by both currency comboboxes, so their
+items are neither formatted nor stored twice. CurrencyFilterModel filters them for the
+type-ahead search by code or name, narrowing the previous matches while the search text grows.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt
+from .currency_api import CURRENCY_NAMES
+
+# Rows of the model as (code, name, display text, case folded display text, case folded name),
+# in the order of CURRENCY_NAMES
+CURRENCY_ROWS = tuple((code, name, f"{code} | {name}", f"{code} | {name}".casefold(), name.casefold())
+                      for code, name in CURRENCY_NAMES.items())
+
+
+class CurrencyListModel(QAbstractListModel):
+    """
+    @brief Class representing the read-only list of the supported currencies
+    """
+
+    # Role of the currency name, the currency code is the Qt.UserRole data
+    NameRole = Qt.UserRole + 1
+
+    def __init__(self, rows=CURRENCY_ROWS, parent=None):
+        """
+        @brief Initializes the model
+        @param rows Tuple of rows shaped like CURRENCY_ROWS
+        @param parent The parent object
+        """
+        super().__init__(parent)
+        self.rows = rows
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        @brief Returns the number of currencies
+        """
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        @brief Returns the display text, code or name of a currency
+        @param index Index of the currency
+        @param role Qt.DisplayRole or Qt.EditRole for the text, Qt.UserRole for the code, NameRole for the name
+        """
+        if not index.isValid():
+            return None
+        code, name, text = self.rows[index.row()][:3]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return text
+        if role == Qt.UserRole:
+            return code
+        if role == self.NameRole:
+            return name
+        return None
+
+    def rank(self, row, pattern):
+        """
+        @brief Ranks how well a row matches a search pattern
+        @param row Row of the currency
+        @param pattern Case folded search text
+        @return 0 if the display text starts with the pattern (e.g. the code), 1 if the name contains it, None otherwise
+        """
+        _, _, _, text, name = self.rows[row]
+        if text.startswith(pattern):
+            return 0
+        if pattern in name:
+            return 1
+        return None
+
+
+class CurrencyFilterModel(QSortFilterProxyModel):
+    """
+    @brief Class filtering a CurrencyListModel by the start of the code or any part of the name
+    Matches of the code are sorted before matches of the name.
+    """
+
+    def __init__(self, source, parent=None):
+        """
+        @brief Initializes the proxy with all currencies accepted
+        @param source The CurrencyListModel
+        @param parent The parent object
+        """
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.pattern = ""
+        # Matching source rows, None while every row is accepted
+        self.matches = None
+        # Position of every matching source row in the sorted matches
+        self.order = None
+        self.sort(0)
+
+    def set_filter(self, text):
+        """
+        @brief Filters the currencies, a longer version of the previous text only searches its matches
+        @param text Search text, matched case-insensitively
+        """
+        pattern = text.strip().casefold()
+        if pattern == self.pattern:
+            return
+
+        source = self.sourceModel()
+        if self.matches is not None and pattern.startswith(self.pattern):
+            candidates = self.matches
+        else:
+            candidates = range(source.rowCount())
+
+        if pattern:
+            ranks = ((source.rank(row, pattern), row) for row in candidates)
+            self.matches = tuple(row for rank, row in sorted(pair for pair in ranks if pair[0] is not None))
+            self.order = {row: position for position, row in enumerate(self.matches)}
+        else:
+            self.matches = None
+            self.order = None
+        self.pattern = pattern
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """
+        @brief Returns whether a currency matches the search text
+        """
+        return self.order is None or source_row in self.order
+
+    def lessThan(self, source_left, source_right):
+        """
+        @brief Orders the matches by rank, keeping the order of the source model otherwise
+        """
+        if self.order is None:
+            return source_left.row() < source_right.row()
+        return self.order[source_left.row()] < self.order[source_right.row()]
+
+
+# Model shared by all currency comboboxes, created with the first one
+_shared_model = None
+
+
+def shared_currency_model():
+    """
+    @brief Returns the CurrencyListModel shared by the currency comboboxes
+    @return The model, created on the first call
+    """
+    global _shared_model
+    if _shared_model is None:
+        _shared_model = CurrencyListModel()
+    return _shared_model
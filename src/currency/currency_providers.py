@@ -0,0 +1,251 @@
+"""
+@file currency_providers.py
+@brief File containing the exchange rate providers of the currency API.
+
+A provider lists the supported currencies, fetches the rates document and fetches flag
+images. RateCache only talks to a provider, so the rates can come from the exchange rate web
+API (HttpRateProvider), from a rates document on disk (FileRateProvider), from the imported
+rate history (HistoryRateProvider), or from the local stand-in server in fake_rate_server.py.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import datetime
+import json
+import os
+from collections import namedtuple
+
+import requests
+
+# Result of RateProvider.fetch_rates, not_modified is True when the cached document is still valid
+RateResponse = namedtuple("RateResponse", ["rates", "date", "etag", "last_modified", "not_modified"])
+
+
+class ProviderError(Exception):
+    """
+    @brief Exception raised when a provider cannot deliver the rates
+    """
+
+
+class RateProvider:
+    """
+    @brief Base class of the exchange rate providers
+    """
+
+    # Name stored with the rate snapshots, e.g. the URL or path of the rates document
+    name = None
+    # True if the rates come from the rate history, so they are not recorded in it again
+    historical = False
+
+    def list_currencies(self):
+        """
+        @brief Returns the supported currency codes
+        @return List of currency codes
+
+        @exception ProviderError: If the rates cannot be fetched.
+        """
+        return list(self.fetch_rates().rates)
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        """
+        @brief Fetches the rates document, or only revalidates it if validators are given
+        @param etag ETag of the cached document
+        @param last_modified Last-Modified of the cached document
+        @return RateResponse, with rates None if not_modified is True
+
+        @exception ProviderError: If the rates cannot be fetched.
+        """
+        raise NotImplementedError
+
+    def fetch_flag(self, country_code, style="flat", size=64):
+        """
+        @brief Fetches a flag image
+        @param country_code Country code
+        @param style Flag style
+        @param size Flag size
+        @return PNG data, or None if the provider has no flag for the country
+        """
+        return None
+
+
+def parse_rates_document(data):
+    """
+    @brief Returns the rates and the date of a rates document
+    @param data Decoded JSON document with a "rates" object and an optional ISO "date"
+    @return Tuple of the rates dictionary and the date, or None
+
+    @exception ProviderError: If the document has no rates.
+    """
+    rates = data.get("rates") if isinstance(data, dict) else None
+    if not isinstance(rates, dict):
+        raise ProviderError("Rates document has no rates")
+    return rates, data.get("date")
+
+
+class HttpRateProvider(RateProvider):
+    """
+    @brief Class fetching the rates and flags from web APIs
+    """
+
+    def __init__(self, url, flag_url, http):
+        """
+        @brief Initializes the provider
+        @param url URL of the rates document
+        @param flag_url Base URL of the flag images
+        @param http Transport used for the requests
+        """
+        self.name = url
+        self.url = url
+        self.flag_url = flag_url
+        self.http = http
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        """
+        @brief Downloads the rates document with a conditional request if validators are given
+        @param etag ETag of the cached document
+        @param last_modified Last-Modified of the cached document
+        @return RateResponse, with rates None if not_modified is True
+
+        @exception ProviderError: If the download fails.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = self.http.get(self.url, headers=headers)
+        except requests.RequestException as e:
+            raise ProviderError(e) from e
+
+        if response.status_code == 304 and headers:
+            return RateResponse(None, None, etag, last_modified, True)
+        if response.status_code != 200:
+            raise ProviderError(response.status_code)
+
+        try:
+            rates, date = parse_rates_document(response.json())
+        except ValueError as e:
+            raise ProviderError(f"Invalid rates document: {e}") from e
+        return RateResponse(rates, date, response.headers.get("ETag"), response.headers.get("Last-Modified"), False)
+
+    def fetch_flag(self, country_code, style="flat", size=64):
+        """
+        @brief Downloads a flag image
+        @param country_code Country code
+        @param style Flag style
+        @param size Flag size
+        @return PNG data, or None if it could not be downloaded
+        """
+        url = f"{self.flag_url}/{country_code}/{style}/{size}.png"
+        try:
+            response = self.http.get(url)
+        except requests.RequestException as e:
+            print(f"Error fetching flag for {country_code}: {e}")
+            return None
+        if response.status_code == 200:
+            return response.content
+        else:
+            print(f"Error fetching flag for {country_code}: {response.status_code}")
+            return None
+
+
+class FileRateProvider(RateProvider):
+    """
+    @brief Class reading the rates from a rates document on disk, e.g. an exported or fixture file
+    """
+
+    def __init__(self, path, flag_dir=None):
+        """
+        @brief Initializes the provider
+        @param path Path of the JSON rates document
+        @param flag_dir Directory of flag images named <country code>.png, None for no flags
+        """
+        self.name = os.path.abspath(path)
+        self.path = path
+        self.flag_dir = flag_dir
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        """
+        @brief Reads the rates document, unless it did not change since it was read
+        @param etag ETag of the cached document, the modification time of the file
+        @param last_modified Unused, files are revalidated by the ETag only
+        @return RateResponse, with rates None if not_modified is True
+
+        @exception ProviderError: If the file cannot be read.
+        """
+        try:
+            version = str(os.stat(self.path).st_mtime_ns)
+            if etag == version:
+                return RateResponse(None, None, etag, None, True)
+            with open(self.path, encoding="utf-8") as file:
+                rates, date = parse_rates_document(json.load(file))
+        except (OSError, ValueError) as e:
+            raise ProviderError(e) from e
+        return RateResponse(rates, date, version, None, False)
+
+    def fetch_flag(self, country_code, style="flat", size=64):
+        """
+        @brief Reads a flag image from the flag directory
+        @param country_code Country code
+        @param style Unused, the directory has one style
+        @param size Unused, the directory has one size
+        @return PNG data, or None if the directory has no flag for the country
+        """
+        if self.flag_dir is None:
+            return None
+        try:
+            with open(os.path.join(self.flag_dir, f"{country_code}.png"), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+
+class HistoryRateProvider(RateProvider):
+    """
+    @brief Class serving the rates of the last day of the rate history, e.g. imported central bank files
+    """
+
+    historical = True
+
+    def __init__(self, history, flags=None):
+        """
+        @brief Initializes the provider
+        @param history RateHistory of the rates
+        @param flags RateProvider the flag images are fetched from, None for no flags
+        """
+        self.name = f"history:{history.path}"
+        self.history = history
+        self.flags = flags
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        """
+        @brief Returns the rates of the last day, unless the history did not change since they were read
+        @param etag ETag of the cached document, the last day and the version of the history
+        @param last_modified Unused, the history is revalidated by the ETag only
+        @return RateResponse, with rates None if not_modified is True
+
+        @exception ProviderError: If the history is empty.
+        """
+        days = self.history.date_range()
+        if days is None:
+            raise ProviderError("Rate history is empty")
+        version = f"{days[1]}-{self.history.version}"
+        if etag == version:
+            return RateResponse(None, None, etag, None, True)
+        rates = self.history.rates_on(days[1])
+        return RateResponse(rates, datetime.date.fromordinal(days[1]).isoformat(), version, None, False)
+
+    def fetch_flag(self, country_code, style="flat", size=64):
+        """
+        @brief Fetches a flag image from the flag provider
+        @param country_code Country code
+        @param style Flag style
+        @param size Flag size
+        @return PNG data, or None if there is no flag provider or flag
+        """
+        if self.flags is None:
+            return None
+        return self.flags.fetch_flag(country_code, style, size)
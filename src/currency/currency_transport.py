@@ -0,0 +1,178 @@
+"""
+@file currency_transport.py
+@brief File containing the shared HTTP transport of the currency API.
+
+All requests of currency_api go through one pooled requests.Session, so connections are
+kept alive and reused between calls. Every request has connect and read timeouts, failed
+requests are retried with exponential backoff and the retries are limited by a budget that
+only refills with successful requests, so an unreachable server is not hammered.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Seconds to wait for a connection and for the response data
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+# Number of kept-alive host pools and connections per host
+POOL_HOSTS = 4
+POOL_CONNECTIONS_PER_HOST = 4
+# Retries of one request and the delay before the first retry in seconds, doubled every retry
+MAX_RETRIES = 3
+BACKOFF = 0.25
+# Retries available at once and the fraction of a retry each successful request earns back
+RETRY_BUDGET = 10
+RETRY_REFILL = 0.1
+# Status codes worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Number of latencies kept per host
+LATENCY_SAMPLES = 100
+
+
+class RetryBudget:
+    """
+    @brief Class limiting the retries of all requests together
+    """
+
+    def __init__(self, capacity=RETRY_BUDGET, refill=RETRY_REFILL):
+        """
+        @brief Initializes a full budget
+        @param capacity Retries available at once
+        @param refill Fraction of a retry each successful request earns back
+        """
+        self.capacity = capacity
+        self.refill = refill
+        self.tokens = float(capacity)
+        self.lock = threading.Lock()
+
+    def withdraw(self):
+        """
+        @brief Takes one retry from the budget
+        @return True if a retry was available
+        """
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def deposit(self):
+        """
+        @brief Earns back a part of a retry after a successful request
+        """
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + self.refill)
+
+
+class Transport:
+    """
+    @brief Class sending the HTTP requests of the currency API over a pooled session
+    """
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF, budget=None):
+        """
+        @brief Initializes the transport with its own session
+        @param connect_timeout Seconds to wait for a connection
+        @param read_timeout Seconds to wait for the response data
+        @param max_retries Retries of one request
+        @param backoff Delay before the first retry in seconds, doubled every retry
+        @param budget RetryBudget shared by all requests, a new one if None
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.budget = budget if budget is not None else RetryBudget()
+
+        self.session = requests.Session()
+        # Retries are done here, so they can use the backoff and the budget
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_CONNECTIONS_PER_HOST,
+                              pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.latencies = {}
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None):
+        """
+        @brief Sends a GET request, retrying connection errors, timeouts and server errors
+        @param url URL of the request
+        @param headers Additional request headers
+        @return The response, which may still have an error status once the retries are used up
+
+        @exception requests.RequestException: If no response was received.
+        """
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry(attempt):
+                    raise
+            else:
+                self.record(url, time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUSES:
+                    self.budget.deposit()
+                    return response
+                if not self.retry(attempt):
+                    return response
+                response.close()
+            attempt += 1
+
+    def retry(self, attempt):
+        """
+        @brief Waits before the next attempt if a retry is allowed
+        @param attempt Number of the failed attempt, starting at 0
+        @return True if the request should be sent again
+        """
+        if attempt >= self.max_retries or not self.budget.withdraw():
+            return False
+        # Jitter keeps clients that failed together from retrying together
+        time.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1))
+        return True
+
+    def record(self, url, seconds):
+        """
+        @brief Stores the latency of a request
+        @param url URL of the request
+        @param seconds Time from sending the request to receiving the response headers
+        """
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.latencies:
+                self.latencies[host] = deque(maxlen=LATENCY_SAMPLES)
+            self.latencies[host].append(seconds)
+
+    def latency_stats(self):
+        """
+        @brief Returns latency statistics of the recent requests per host
+        @return Dictionary mapping hosts to their count, mean, median and maximum latency in seconds
+        """
+        stats = {}
+        with self.lock:
+            for host, samples in self.latencies.items():
+                ordered = sorted(samples)
+                stats[host] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered),
+                    "median": ordered[len(ordered) // 2],
+                    "max": ordered[-1],
+                }
+        return stats
+
+    def close(self):
+        """
+        @brief Closes the pooled connections
+        """
+        self.session.close()
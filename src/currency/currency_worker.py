@@ -0,0 +1,315 @@
+"""
+@file currency_worker.py
+@brief File containing the background loading and refreshing of exchange rates for the currency converter.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import random
+
+from PySide6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, QTimer, Signal
+from .currency_api import RATE_CACHE_TTL, rate_cache
+
+# Seconds between the background refreshes of the rates
+REFRESH_INTERVAL = RATE_CACHE_TTL
+# Fraction of the interval the refreshes are randomly moved by, so clients do not refresh together
+REFRESH_JITTER = 0.1
+# Seconds before the first retry of a failed refresh, doubled after every failure up to the interval
+REFRESH_BACKOFF = 30
+
+
+class RateTask(QRunnable):
+    """
+    @brief Class representing one download of the exchange rates on a worker thread
+    """
+
+    def __init__(self, loader):
+        """
+        @brief Initializes the task
+        @param loader: The RateLoader the result is delivered to
+        """
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        """
+        @brief Loads the rates and hands them to the GUI thread through a signal
+        """
+        try:
+            rates = rate_cache.get_rates()
+        except Exception as e:
+            print(f"Error fetching data: {e}")
+            rates = None
+        self.loader.task_finished.emit(rates)
+
+
+class RateLoader(QObject):
+    """
+    @brief Class loading exchange rates off the GUI thread, one download at a time
+    """
+
+    # Emitted from the worker thread, delivered on the GUI thread
+    task_finished = Signal(object)
+    # Emitted on the GUI thread with the rates dictionary, or None if the download failed
+    rates_ready = Signal(object)
+
+    def __init__(self, parent=None):
+        """
+        @brief Initializes the loader
+        @param parent: The parent object
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.in_flight = False
+        self.task_finished.connect(self.on_task_finished)
+
+    def load(self):
+        """
+        @brief Starts loading the rates, requests made while a download runs share its result
+        """
+        if self.in_flight:
+            return
+        self.in_flight = True
+        self.pool.start(RateTask(self))
+
+    def on_task_finished(self, rates):
+        """
+        @brief Publishes the loaded rates on the GUI thread
+        @param rates: Dictionary of rates by currency code, or None
+        """
+        self.in_flight = False
+        self.rates_ready.emit(rates)
+
+
+class BatchTask(QRunnable):
+    """
+    @brief Class representing the conversion of one ledger file on a worker thread
+    """
+
+    def __init__(self, runner, source_path, destination_path):
+        """
+        @brief Initializes the task
+        @param runner: The BatchRunner the progress and result are delivered to
+        @param source_path: Path of the input CSV
+        @param destination_path: Path of the output CSV
+        """
+        super().__init__()
+        self.runner = runner
+        self.source_path = source_path
+        self.destination_path = destination_path
+
+    def run(self):
+        """
+        @brief Converts the file and hands the summary, or the error message, to the GUI thread
+        """
+        # The NumPy conversion is only imported when a file is converted
+        from .batch_convert import BATCH_ERRORS, convert_file
+
+        try:
+            table = rate_cache.table()
+            if table is None:
+                raise OSError("Exchange rates are not available")
+            summary = convert_file(self.source_path, self.destination_path, table,
+                                   progress=self.runner.progress.emit,
+                                   should_stop=lambda: self.runner.stopped)
+        except BATCH_ERRORS as e:
+            self.runner.task_finished.emit(str(e) or type(e).__name__)
+            return
+        self.runner.task_finished.emit(summary)
+
+
+class BatchRunner(QObject):
+    """
+    @brief Class converting ledger files off the GUI thread, one file at a time
+    """
+
+    # Emitted from the worker thread with the BatchSummary after every chunk
+    progress = Signal(object)
+    # Emitted from the worker thread with the BatchSummary, or the error message
+    task_finished = Signal(object)
+
+    def __init__(self, parent=None):
+        """
+        @brief Initializes the runner
+        @param parent: The parent object
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.in_flight = False
+        self.stopped = False
+        self.task_finished.connect(self.on_task_finished)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def start(self, source_path, destination_path):
+        """
+        @brief Starts converting a file
+        @param source_path: Path of the input CSV
+        @param destination_path: Path of the output CSV
+        @return False if a conversion is already running
+        """
+        if self.in_flight:
+            return False
+        self.in_flight = True
+        self.stopped = False
+        self.pool.start(BatchTask(self, source_path, destination_path))
+        return True
+
+    def on_task_finished(self, result):
+        """
+        @brief Marks the conversion as finished on the GUI thread
+        @param result: The BatchSummary, or the error message
+        """
+        self.in_flight = False
+
+    def stop(self):
+        """
+        @brief Stops the running conversion after the current chunk
+        """
+        self.stopped = True
+
+
+class RefreshTask(QRunnable):
+    """
+    @brief Class representing one background refresh of the cached rates on a worker thread
+    """
+
+    def __init__(self, scheduler, previous):
+        """
+        @brief Initializes the task
+        @param scheduler: The RateScheduler the result is delivered to
+        @param previous: Dictionary of the rates before the refresh
+        """
+        super().__init__()
+        self.scheduler = scheduler
+        self.previous = previous
+
+    def run(self):
+        """
+        @brief Revalidates the rates and hands the changed currencies to the GUI thread
+        The changed currencies are None if the refresh failed.
+        """
+        # The tables are built here and not by rate_cache.table, whose single cached table
+        # belongs to the GUI thread
+        from .rate_table import RateTable
+
+        try:
+            refreshed = rate_cache.fetch()
+            rates = rate_cache.cached_rates()
+            if not refreshed or rates is None:
+                changed = None
+            elif rates is self.previous:
+                # Not modified, the cache kept the same rates
+                changed = frozenset()
+            else:
+                changed = RateTable(rates).changed_codes(RateTable(self.previous))
+        except Exception as e:
+            print(f"Error refreshing rates: {e}")
+            changed = None
+        self.scheduler.task_finished.emit(changed)
+
+
+class RateScheduler(QObject):
+    """
+    @brief Class refreshing the cached rates in the background on an interval with jitter and backoff
+    """
+
+    # Emitted from the worker thread with the frozenset of changed codes, or None if the refresh failed
+    task_finished = Signal(object)
+    # Emitted on the GUI thread with the frozenset of the codes whose rate changed, never empty
+    rates_changed = Signal(object)
+
+    def __init__(self, parent=None, interval=REFRESH_INTERVAL, jitter=REFRESH_JITTER, backoff=REFRESH_BACKOFF):
+        """
+        @brief Initializes the scheduler, it refreshes nothing until start is called
+        @param parent: The parent object
+        @param interval: Seconds between the refreshes
+        @param jitter: Fraction of the interval the refreshes are randomly moved by
+        @param backoff: Seconds before the first retry of a failed refresh
+        """
+        super().__init__(parent)
+        self.interval = interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.failures = 0
+        self.in_flight = False
+        self.active = False
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.refresh)
+        self.task_finished.connect(self.on_task_finished)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def start(self):
+        """
+        @brief Schedules the next refresh one interval from now
+        """
+        self.active = True
+        self.failures = 0
+        self.schedule(self.interval)
+
+    def stop(self):
+        """
+        @brief Cancels the scheduled refresh, a running one still delivers its result
+        """
+        self.active = False
+        self.timer.stop()
+
+    def set_interval(self, seconds):
+        """
+        @brief Changes the interval and reschedules a running scheduler
+        @param seconds: Seconds between the refreshes
+        """
+        self.interval = seconds
+        if self.active:
+            self.start()
+
+    def schedule(self, delay):
+        """
+        @brief Schedules the next refresh
+        @param delay: Seconds until the refresh, before the jitter is applied
+        """
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        self.timer.start(max(0, int(delay * 1000)))
+
+    def refresh(self):
+        """
+        @brief Starts a refresh, unless one is running or no rates were loaded yet
+        Rates that were never loaded are left to the first conversion.
+        """
+        if self.in_flight:
+            return
+        previous = rate_cache.cached_rates()
+        if previous is None:
+            self.schedule(self.interval)
+            return
+        self.in_flight = True
+        self.pool.start(RefreshTask(self, previous))
+
+    def on_task_finished(self, changed):
+        """
+        @brief Schedules the next refresh and announces the changed currencies on the GUI thread
+        @param changed: frozenset of the changed codes, or None if the refresh failed
+        """
+        self.in_flight = False
+        if changed is None:
+            self.failures += 1
+            if self.active:
+                self.schedule(min(self.backoff * 2 ** (self.failures - 1), self.interval))
+            return
+
+        self.failures = 0
+        if self.active:
+            self.schedule(self.interval)
+        if changed:
+            self.rates_changed.emit(changed)
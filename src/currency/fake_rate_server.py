@@ -0,0 +1,237 @@
+"""
+@file fake_rate_server.py
+@brief File containing a local stand-in for the exchange rate and flag web APIs.
+
+The server answers the same paths as the real services: any path ending in /latest/<base>
+returns a fixture rates document with an ETag (and 304 for a matching If-None-Match), and
+/<country code>/<style>/<size>.png returns a generated one-color flag. Every request can be
+delayed and a part of them can fail with 503, so timeouts, retries and caching can be
+exercised without the internet.
+
+Run from the src directory: python -m currency.fake_rate_server --port 8765 --delay 0.05
+and point the application to it with HttpRateProvider and set_provider.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Fixture rates document served by default
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "latest.json")
+
+
+def solid_png(width, height, color):
+    """
+    @brief Encodes a one-color PNG image
+    @param width Width of the image
+    @param height Height of the image
+    @param color Tuple of the red, green and blue components
+    @return PNG data
+    """
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes(color) * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+class FakeRateServer(ThreadingHTTPServer):
+    """
+    @brief Class representing the local HTTP server of fixture rates and flags
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, fixture_path=FIXTURE_PATH, delay=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        """
+        @brief Initializes the server on localhost
+        @param port Port of the server, 0 for any free port
+        @param fixture_path Path of the served rates document
+        @param delay Seconds every response is delayed
+        @param jitter Additional random delay of up to this many seconds
+        @param failure_rate Fraction of the requests answered with 503
+        @param seed Seed of the random delays and failures
+        """
+        super().__init__(("127.0.0.1", port), FakeRateHandler)
+        self.delay = delay
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+        self.thread = None
+        self.load_fixture(fixture_path)
+
+    def load_fixture(self, path):
+        """
+        @brief Replaces the served rates document, which also changes its ETag
+        @param path Path of the rates document
+
+        @exception OSError: If the file cannot be read.
+        """
+        with open(path, "rb") as file:
+            self.set_document(json.loads(file.read()))
+
+    def set_document(self, document):
+        """
+        @brief Replaces the served rates document
+        @param document Rates document as a dictionary
+        """
+        body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        with self.lock:
+            self.document = body
+            self.etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+    @property
+    def url(self):
+        """
+        @brief Base URL of the server
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rates_url(self, base="euro"):
+        """
+        @brief Returns the URL of the rates document, shaped like the real API_URL
+        @param base Base currency of the path
+        """
+        return f"{self.url}/v4/latest/{base}"
+
+    def next_outcome(self):
+        """
+        @brief Draws the delay and the failure of one request
+        @return Tuple of the delay in seconds and whether the request fails
+        """
+        with self.lock:
+            self.requests += 1
+            delay = self.delay + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        return delay, failed
+
+    def start(self):
+        """
+        @brief Serves requests on a background thread
+        @return The server
+        """
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        @brief Stops the background thread and closes the socket
+        """
+        if self.thread is not None:
+            self.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.server_close()
+
+
+class FakeRateHandler(BaseHTTPRequestHandler):
+    """
+    @brief Class answering one request of the FakeRateServer
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent in separate writes, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """
+        @brief Answers with the rates document or a flag, after the configured delay
+        """
+        delay, failed = self.server.next_outcome()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self.respond(503, b"Service Unavailable", "text/plain")
+            return
+
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if len(parts) >= 2 and parts[-2] == "latest":
+            with self.server.lock:
+                body, etag = self.server.document, self.server.etag
+            if self.headers.get("If-None-Match") == etag:
+                self.respond(304, b"", None, {"ETag": etag})
+            else:
+                self.respond(200, body, "application/json", {"ETag": etag})
+        elif len(parts) == 3 and parts[2].endswith(".png") and parts[2][:-4].isdigit():
+            size = min(int(parts[2][:-4]), 256)
+            color = tuple(hashlib.sha1(parts[0].encode("utf-8")).digest()[:3])
+            self.respond(200, solid_png(size, size * 2 // 3, color), "image/png")
+        else:
+            self.respond(404, b"Not Found", "text/plain")
+
+    def respond(self, status, body, content_type, headers=None):
+        """
+        @brief Sends a complete response
+        @param status HTTP status code
+        @param body Response body
+        @param content_type Content type of the body, None for no body
+        @param headers Dictionary of additional headers
+        """
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """
+        @brief Keeps the request log quiet
+        """
+
+
+def main(argv=None):
+    """
+    @brief Runs the server from the command line until it is interrupted
+    @param argv Command line arguments, sys.argv if None
+    @return Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m currency.fake_rate_server",
+                                     description="Serve fixture exchange rates and flags on localhost.")
+    parser.add_argument("--port", type=int, default=8765, help="port of the server")
+    parser.add_argument("--fixture", default=FIXTURE_PATH, help="served rates document")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds every response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random delay in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    try:
+        server = FakeRateServer(args.port, args.fixture, args.delay, args.jitter, args.failure_rate)
+    except OSError as e:
+        print(f"Error starting server: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Serving rates at {server.rates_url()} and flags at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+@file flag_cache.py
+@brief File containing the flag image cache of the currency converter.
+
+Flags are cached in two tiers: scaled QPixmaps in an in-memory LRU, and the downloaded PNG
+files on disk (see currency_api.get_cached_flag_image). Below them, the sprite atlas bundled in
+Pictures/ (see build_flag_atlas.py) provides all flags offline from one image. Flags found in
+the atlas or on disk are decoded right away, missing ones are downloaded on a worker thread,
+and a prefetcher downloads the flags missing in the atlas in the background, so after the
+first run no flag needs the network.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+
+from PySide6.QtCore import QCoreApplication, QObject, QRect, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+from .currency_api import get_cached_flag_image
+from utils.img_path import resource_path
+
+# Number of scaled flags kept in memory
+FLAG_LRU_SIZE = 256
+# Seconds a flag that could not be loaded is not downloaded again
+FLAG_RETRY_INTERVAL = 600
+
+# Bundled sprite atlas of all flags, its index and the size of one cell
+ATLAS_IMAGE_PATH = resource_path(os.path.join('Pictures', 'flag_atlas.png'))
+ATLAS_INDEX_PATH = resource_path(os.path.join('Pictures', 'flag_atlas.json'))
+ATLAS_CELL = (70, 45)
+
+# Country whose flag is shown for currencies that are not named after one country
+FLAG_COUNTRIES = {
+    "ANG": "CW",  # Netherlands Antillean guilder, Curacao
+    "XAF": "CF",  # Central African CFA franc
+    "XCD": "KN",  # East Caribbean dollar, seat of the central bank
+    "XDR": "UN",  # Special drawing rights of the IMF, a United Nations agency
+    "XOF": "SN",  # West African CFA franc, seat of the central bank
+    "XPF": "PF",  # CFP franc, French Polynesia
+}
+
+
+def flag_country(currency_code):
+    """
+    @brief Returns the country code of the flag of a currency
+    @param currency_code: Currency code
+    @return Country code, the first two letters of the currency code unless FLAG_COUNTRIES has it
+    """
+    return FLAG_COUNTRIES.get(currency_code, currency_code[:2])
+
+
+def decode_flag(data, width, height):
+    """
+    @brief Decodes a flag image and scales it to fit the given size
+    @param data: PNG data of the flag, or None
+    @param width: Maximum width
+    @param height: Maximum height
+    @return The scaled QImage, null if the data is missing or invalid
+    """
+    image = QImage.fromData(data) if data else QImage()
+    if image.isNull():
+        return image
+    return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class FlagAtlas:
+    """
+    @brief Class cutting flags out of the bundled sprite atlas
+    """
+
+    def __init__(self, image_path=ATLAS_IMAGE_PATH, index_path=ATLAS_INDEX_PATH):
+        """
+        @brief Initializes the atlas, the files are read on first use
+        @param image_path: Path of the atlas image
+        @param index_path: Path of the JSON index of the atlas
+        """
+        self.image_path = image_path
+        self.index_path = index_path
+        self.image = None
+        self.index = None
+
+    def load(self):
+        """
+        @brief Reads and decodes the atlas once, a missing atlas is treated as empty
+        """
+        if self.index is not None:
+            return
+
+        self.index = {}
+        try:
+            with open(self.index_path, encoding="utf-8") as file:
+                index = json.load(file).get("flags", {})
+        except (OSError, ValueError, AttributeError):
+            return
+
+        image = QImage(self.image_path)
+        if not image.isNull():
+            self.image = image
+            self.index = index
+
+    def __contains__(self, country_code):
+        """
+        @brief Returns whether the atlas contains the flag of a country code
+        """
+        self.load()
+        return country_code in self.index
+
+    def flag(self, country_code):
+        """
+        @brief Cuts the flag of a country code out of the atlas
+        @param country_code: Country code of the flag
+        @return The QImage of the flag, null if the atlas does not contain it
+        """
+        self.load()
+        rect = self.index.get(country_code)
+        if rect is None:
+            return QImage()
+        return self.image.copy(QRect(*rect))
+
+
+class FlagTask(QRunnable):
+    """
+    @brief Class representing the download and decoding of one flag on a worker thread
+    """
+
+    def __init__(self, cache, country_code):
+        """
+        @brief Initializes the task
+        @param cache: The FlagCache the flag is delivered to
+        @param country_code: Country code of the flag
+        """
+        super().__init__()
+        self.cache = cache
+        self.country_code = country_code
+
+    def run(self):
+        """
+        @brief Downloads the flag and hands the decoded image to the GUI thread
+        """
+        data = get_cached_flag_image(self.country_code)
+        # QImage, unlike QPixmap, may be used outside the GUI thread
+        image = decode_flag(data, self.cache.width, self.cache.height)
+        self.cache.task_finished.emit(self.country_code, image)
+
+
+class FlagPrefetchTask(QRunnable):
+    """
+    @brief Class representing the background download of many flags to the on-disk cache
+    """
+
+    def __init__(self, cache, country_codes):
+        """
+        @brief Initializes the task
+        @param cache: The FlagCache that can stop the prefetch
+        @param country_codes: Country codes of the flags
+        """
+        super().__init__()
+        self.cache = cache
+        self.country_codes = country_codes
+
+    def run(self):
+        """
+        @brief Downloads the flags missing on disk until the cache is stopped
+        """
+        for country_code in self.country_codes:
+            if self.cache.stopped:
+                return
+            get_cached_flag_image(country_code)
+
+
+class FlagCache(QObject):
+    """
+    @brief Class providing scaled flag pixmaps without blocking the GUI thread on the network
+    """
+
+    # Emitted from the worker thread with the country code and the decoded image
+    task_finished = Signal(str, object)
+    # Emitted on the GUI thread when the flag of a country code became available
+    flag_ready = Signal(str)
+
+    def __init__(self, width, height, capacity=FLAG_LRU_SIZE, parent=None):
+        """
+        @brief Initializes the cache
+        @param width: Maximum width of the flags
+        @param height: Maximum height of the flags
+        @param capacity: Number of flags kept in memory
+        @param parent: The parent object
+        """
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()
+        self.in_flight = set()
+        # Monotonic time of the last failed load by country code
+        self.failed = {}
+        self.stopped = False
+        self.atlas = FlagAtlas()
+
+        # Flags that are needed now have their own thread, so the prefetch never delays them
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.prefetch_pool = QThreadPool(self)
+        self.prefetch_pool.setMaxThreadCount(1)
+        self.task_finished.connect(self.on_task_finished)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def pixmap(self, country_code):
+        """
+        @brief Returns the flag of a country code, loading it in the background if it is not cached
+        @param country_code: Country code of the flag
+        @return The scaled QPixmap, or None if it is loading or failed to load within FLAG_RETRY_INTERVAL
+        """
+        pixmap = self.pixmaps.get(country_code)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(country_code)
+            return pixmap
+
+        if country_code in self.atlas:
+            image = self.atlas.flag(country_code)
+            if (self.width, self.height) != ATLAS_CELL:
+                image = image.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            return self.store(country_code, image)
+
+        data = get_cached_flag_image(country_code, download=False)
+        if data:
+            return self.store(country_code, decode_flag(data, self.width, self.height))
+
+        failed_at = self.failed.get(country_code)
+        if failed_at is not None and time.monotonic() - failed_at < FLAG_RETRY_INTERVAL:
+            return None
+
+        if country_code not in self.in_flight:
+            self.in_flight.add(country_code)
+            self.pool.start(FlagTask(self, country_code))
+        return None
+
+    def store(self, country_code, image):
+        """
+        @brief Converts a decoded flag to a pixmap and keeps it in memory
+        @param country_code: Country code of the flag
+        @param image: The scaled QImage
+        @return The QPixmap, or None if the image is null
+        """
+        if image.isNull():
+            return None
+
+        pixmap = QPixmap.fromImage(image)
+        self.pixmaps[country_code] = pixmap
+        if len(self.pixmaps) > self.capacity:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def on_task_finished(self, country_code, image):
+        """
+        @brief Stores a flag loaded on the worker thread and announces it
+        @param country_code: Country code of the flag
+        @param image: The scaled QImage, null if the flag could not be loaded
+        """
+        self.in_flight.discard(country_code)
+        if self.store(country_code, image) is None:
+            self.failed[country_code] = time.monotonic()
+            return
+        self.failed.pop(country_code, None)
+        self.flag_ready.emit(country_code)
+
+    def prefetch(self, country_codes):
+        """
+        @brief Downloads the flags missing in the atlas to the on-disk cache in the background
+        @param country_codes: Iterable of country codes
+        """
+        missing = [code for code in dict.fromkeys(country_codes) if code not in self.atlas]
+        if missing:
+            self.prefetch_pool.start(FlagPrefetchTask(self, missing))
+
+    def stop(self):
+        """
+        @brief Stops the prefetch after the current download
+        """
+        self.stopped = True
@@ -0,0 +1,319 @@
+"""
+@file money.py
+@brief File containing fixed-point money arithmetic in minor currency units.
+
+An amount is stored as an integer number of minor units (cents, fils, or whole yen) together
+with its currency, whose number of decimal places comes from the ISO 4217 exponent table.
+Conversions scale the minor units by the exact decimal value of the rates and round once,
+half-even (bankers') or half-up, so no float drift builds up.
+
+convert_minor_array is the vectorized form: it converts in float64 and recomputes exactly
+only the elements whose float result is too close to a rounding tie or too large to trust,
+so its results equal the scalar conversion.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import functools
+import math
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, InvalidOperation
+from fractions import Fraction
+from types import MappingProxyType
+
+# ISO 4217 exponents (decimal places of the minor unit) of the currencies that do not use 2
+MINOR_UNITS = MappingProxyType({
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "UYI": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+    "CLF": 4, "UYW": 4,
+})
+DEFAULT_MINOR_UNIT = 2
+
+# Largest magnitude a float64 holds as an exact integer
+FLOAT_EXACT_LIMIT = 2 ** 53
+# Relative error of the float conversion below which a result is certainly not a rounding tie
+FLOAT_TOLERANCE = 1e-14
+
+
+def exponent(currency):
+    """
+    @brief Returns the number of decimal places of a currency
+    @param currency Currency code
+    @return ISO 4217 exponent, 2 for currencies missing in MINOR_UNITS
+    """
+    return MINOR_UNITS.get(currency.upper(), DEFAULT_MINOR_UNIT)
+
+
+@functools.lru_cache(maxsize=4096)
+def rate_fraction(rate):
+    """
+    @brief Returns the exact value of a rate as written in the rates document
+    @param rate Rate as float, int, str or Decimal
+    @return Fraction of the shortest decimal representation of the rate
+
+    @exception ValueError: If the rate is not a finite number.
+    """
+    try:
+        return Fraction(Decimal(str(rate)))
+    except (InvalidOperation, OverflowError) as e:
+        raise ValueError(f"Invalid rate: {rate}") from e
+
+
+def round_fraction(value, rounding=ROUND_HALF_EVEN):
+    """
+    @brief Rounds an exact value to an integer
+    @param value Fraction to round
+    @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP (ties away from zero)
+    @return The rounded int
+    """
+    if rounding == ROUND_HALF_EVEN:
+        return round(value)
+    if rounding == ROUND_HALF_UP:
+        rounded = math.floor(abs(value) + Fraction(1, 2))
+        return rounded if value >= 0 else -rounded
+    raise ValueError(f"Unsupported rounding: {rounding}")
+
+
+def convert_minor(minor, base_rate, target_rate, shift, rounding=ROUND_HALF_EVEN):
+    """
+    @brief Converts minor units exactly
+    @param minor Amount in minor units of the base currency
+    @param base_rate Rate of the base currency
+    @param target_rate Rate of the target currency, relative to the same currency as base_rate
+    @param shift Exponent of the target currency minus exponent of the base currency
+    @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+    @return Amount in minor units of the target currency
+
+    @exception ZeroDivisionError: If the rate of the base currency is zero.
+    @exception ValueError: If a rate is not a finite number.
+    """
+    value = Fraction(minor) * rate_fraction(target_rate) / rate_fraction(base_rate) * Fraction(10) ** shift
+    return round_fraction(value, rounding)
+
+
+class Money:
+    """
+    @brief Class representing an amount of money in integer minor units of its currency
+    """
+
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor, currency):
+        """
+        @brief Initializes the amount
+        @param minor Integer number of minor units
+        @param currency Currency code
+        """
+        self.minor = int(minor)
+        self.currency = currency.upper()
+
+    @classmethod
+    def parse(cls, amount, currency, rounding=ROUND_HALF_EVEN):
+        """
+        @brief Creates an amount from a decimal number, rounded to the minor unit of the currency
+        @param amount Amount as str, int, Decimal or float (its shortest decimal representation)
+        @param currency Currency code
+        @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+        @return The Money
+
+        @exception ValueError: If the amount is not a finite number.
+        """
+        try:
+            value = Decimal(str(amount).strip())
+            minor = value.scaleb(exponent(currency)).quantize(Decimal(1), rounding=rounding)
+        except InvalidOperation as e:
+            raise ValueError(f"Invalid amount: {amount}") from e
+        if not minor.is_finite():
+            raise ValueError(f"Invalid amount: {amount}")
+        return cls(int(minor), currency)
+
+    @property
+    def exponent(self):
+        """
+        @brief Number of decimal places of the currency
+        """
+        return exponent(self.currency)
+
+    @property
+    def amount(self):
+        """
+        @brief Exact amount as a Decimal in major units
+        """
+        return Decimal(self.minor).scaleb(-self.exponent)
+
+    def convert(self, currency, base_rate, target_rate, rounding=ROUND_HALF_EVEN):
+        """
+        @brief Converts the amount to another currency
+        @param currency Code of the target currency
+        @param base_rate Rate of the currency of this amount
+        @param target_rate Rate of the target currency, relative to the same currency as base_rate
+        @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+        @return The Money in the target currency
+
+        @exception ZeroDivisionError: If the rate of the base currency is zero.
+        """
+        shift = exponent(currency) - self.exponent
+        return Money(convert_minor(self.minor, base_rate, target_rate, shift, rounding), currency)
+
+    def __add__(self, other):
+        """
+        @brief Adds an amount of the same currency
+        @exception ValueError: If the currencies differ.
+        """
+        if not isinstance(other, Money):
+            return NotImplemented
+        if other.currency != self.currency:
+            raise ValueError(f"Cannot add {other.currency} to {self.currency}")
+        return Money(self.minor + other.minor, self.currency)
+
+    def __sub__(self, other):
+        """
+        @brief Subtracts an amount of the same currency
+        @exception ValueError: If the currencies differ.
+        """
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self + (-other)
+
+    def __neg__(self):
+        """
+        @brief Returns the negated amount
+        """
+        return Money(-self.minor, self.currency)
+
+    def __eq__(self, other):
+        """
+        @brief Returns whether two amounts have the same currency and minor units
+        """
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.minor == other.minor and self.currency == other.currency
+
+    def __hash__(self):
+        """
+        @brief Returns the hash of the amount
+        """
+        return hash((self.minor, self.currency))
+
+    def __str__(self):
+        """
+        @brief Formats the amount with the decimal places of its currency, e.g. 12.50 or 1250
+        """
+        return format_minor(self.minor, self.exponent)
+
+    def __repr__(self):
+        """
+        @brief Returns a representation of the amount
+        """
+        return f"Money({self.minor}, {self.currency!r})"
+
+
+def format_minor(minor, places):
+    """
+    @brief Formats minor units as a decimal number
+    @param minor Integer number of minor units
+    @param places Number of decimal places
+    @return The formatted amount
+    """
+    if places <= 0:
+        return str(minor * 10 ** -places)
+    sign = "-" if minor < 0 else ""
+    digits = str(abs(minor)).rjust(places + 1, "0")
+    return f"{sign}{digits[:-places]}.{digits[-places:]}"
+
+
+def convert_minor_array(minor, base_rates, target_rates, shifts, rounding=ROUND_HALF_EVEN):
+    """
+    @brief Converts arrays of minor units, giving the same results as convert_minor
+    @param minor Array-like of amounts in minor units of their base currencies
+    @param base_rates Array-like of the rates of the base currencies
+    @param target_rates Array-like of the rates of the target currencies
+    @param shifts Array-like of the target minus base currency exponents
+    @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+    @return Tuple of the int64 array of converted minor units and the bool array of valid elements,
+            elements with a zero, missing (NaN) or infinite rate, or a result beyond int64, are invalid
+    """
+    # NumPy is only needed by the vectorized conversion
+    import numpy as np
+
+    minor, base_rates, target_rates, shifts = np.broadcast_arrays(
+        np.asarray(minor, dtype=np.int64), np.asarray(base_rates, dtype=np.float64),
+        np.asarray(target_rates, dtype=np.float64), np.asarray(shifts, dtype=np.int64))
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        values = minor * (target_rates / base_rates) * np.power(10.0, shifts)
+        if rounding == ROUND_HALF_EVEN:
+            rounded = np.rint(values)
+        elif rounding == ROUND_HALF_UP:
+            rounded = np.copysign(np.floor(np.abs(values) + 0.5), values)
+        else:
+            raise ValueError(f"Unsupported rounding: {rounding}")
+
+        valid = np.isfinite(values) & (base_rates != 0) & np.isfinite(base_rates) & np.isfinite(target_rates)
+        # The float result can only round differently from the exact one close to a tie
+        distance = np.abs(np.abs(values - np.trunc(values)) - 0.5)
+        inexact = valid & ((distance <= np.abs(values) * FLOAT_TOLERANCE + FLOAT_TOLERANCE)
+                           | (np.abs(values) >= FLOAT_EXACT_LIMIT) | (np.abs(minor) >= FLOAT_EXACT_LIMIT))
+
+    result = np.where(valid & ~inexact, rounded, 0).astype(np.int64)
+    limit = np.iinfo(np.int64).max
+    for i in np.flatnonzero(inexact).tolist():
+        converted = convert_minor(int(minor.flat[i]), float(base_rates.flat[i]), float(target_rates.flat[i]),
+                                  int(shifts.flat[i]), rounding)
+        if abs(converted) <= limit:
+            result.flat[i] = converted
+        else:
+            valid.flat[i] = False
+    return result, valid
+
+
+def parse_minor_array(texts, exponents, rounding=ROUND_HALF_EVEN):
+    """
+    @brief Parses decimal amounts into minor units, giving the same results as Money.parse
+    @param texts List of amount strings
+    @param exponents Array-like of the exponents of the currencies of the amounts
+    @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+    @return Tuple of the int64 array of minor units and the bool array of valid elements
+    """
+    import numpy as np
+
+    try:
+        amounts = np.array(texts, dtype=np.float64)
+    except ValueError:
+        amounts = np.empty(len(texts), dtype=np.float64)
+        for i, text in enumerate(texts):
+            try:
+                amounts[i] = float(text)
+            except ValueError:
+                amounts[i] = np.nan
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        values = amounts * np.power(10.0, np.asarray(exponents, dtype=np.int64))
+        valid = np.isfinite(values)
+        # Decimal strings are not exact in binary, so amounts close to a tie are parsed exactly
+        distance = np.abs(np.abs(values - np.trunc(values)) - 0.5)
+        inexact = valid & ((distance <= np.abs(values) * FLOAT_TOLERANCE + FLOAT_TOLERANCE)
+                           | (np.abs(values) >= FLOAT_EXACT_LIMIT))
+        if rounding == ROUND_HALF_EVEN:
+            rounded = np.rint(values)
+        elif rounding == ROUND_HALF_UP:
+            rounded = np.copysign(np.floor(np.abs(values) + 0.5), values)
+        else:
+            raise ValueError(f"Unsupported rounding: {rounding}")
+
+    result = np.where(valid & ~inexact, rounded, 0).astype(np.int64)
+    exponents = np.broadcast_to(np.asarray(exponents, dtype=np.int64), result.shape)
+    limit = np.iinfo(np.int64).max
+    for i in np.flatnonzero(inexact).tolist():
+        try:
+            minor = Decimal(texts[i].strip()).scaleb(int(exponents[i])).quantize(Decimal(1), rounding=rounding)
+        except InvalidOperation:
+            # Too many digits for the decimal context, so far out of the int64 range as well
+            valid[i] = False
+            continue
+        if abs(minor) <= limit:
+            result[i] = int(minor)
+        else:
+            valid[i] = False
+    return result, valid
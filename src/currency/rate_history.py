@@ -0,0 +1,462 @@
+"""
+@file rate_history.py
+@brief File containing the local store of historical exchange rates.
+
+Every currency has a RateSeries, two parallel NumPy arrays of day ordinals (date.toordinal())
+and rates, kept sorted by day. The rate on a date is found by a binary search, new days are
+appended in amortized constant time and bulk history files are streamed in and merged in
+chunks. The whole store is saved to one compressed .npz file.
+
+Import a CSV or XML history file from the src directory: python -m currency.rate_history history.xml
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import argparse
+import array
+import codecs
+import csv
+import datetime
+import io
+import os
+import sys
+import threading
+from xml.etree import ElementTree
+
+import numpy as np
+
+from .currency_api import write_atomically
+
+# File of the stored history
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".calcu-lajda", "history.npz")
+# Days a rate is used for after it was published, covering weekends and holidays
+MAX_GAP_DAYS = 7
+# Initial capacity of a series, doubled when it is full
+SERIES_CAPACITY = 64
+# Currency the rates of the history files are relative to
+HISTORY_BASE = "EUR"
+# Imported rates buffered before they are merged into the series
+IMPORT_CHUNK = 100000
+
+
+def day_ordinal(day):
+    """
+    @brief Converts a date to a day ordinal
+    @param day datetime.date, or an ISO date string (YYYY-MM-DD)
+    @return Day ordinal of the date
+
+    @exception ValueError: If the string is not an ISO date.
+    """
+    if isinstance(day, str):
+        day = datetime.date.fromisoformat(day.strip()[:10])
+    return day.toordinal()
+
+
+class RateSeries:
+    """
+    @brief Class representing the rates of one currency by day
+    """
+
+    def __init__(self, days=None, rates=None):
+        """
+        @brief Initializes the series
+        @param days Sorted array-like of unique day ordinals
+        @param rates Array-like of the rates of the days
+        """
+        self.assign(days if days is not None else [], rates if rates is not None else [])
+
+    def assign(self, days, rates):
+        """
+        @brief Replaces the content of the series
+        @param days Sorted array-like of unique day ordinals
+        @param rates Array-like of the rates of the days
+        """
+        days = np.asarray(days, dtype=np.int32)
+        rates = np.asarray(rates, dtype=np.float64)
+        capacity = max(SERIES_CAPACITY, len(days))
+        self._days = np.empty(capacity, dtype=np.int32)
+        self._rates = np.empty(capacity, dtype=np.float64)
+        self._days[:len(days)] = days
+        self._rates[:len(rates)] = rates
+        self.size = len(days)
+
+    def __len__(self):
+        """
+        @brief Returns the number of days of the series
+        """
+        return self.size
+
+    @property
+    def days(self):
+        """
+        @brief Sorted array of the day ordinals
+        """
+        return self._days[:self.size]
+
+    @property
+    def rates(self):
+        """
+        @brief Array of the rates of the days
+        """
+        return self._rates[:self.size]
+
+    def append(self, day, rate):
+        """
+        @brief Adds the rate of one day, replacing the rate the day already has
+        @param day Day ordinal
+        @param rate Rate of the day
+        """
+        if self.size and day <= self._days[self.size - 1]:
+            if day == self._days[self.size - 1]:
+                self._rates[self.size - 1] = rate
+            else:
+                self.extend([day], [rate])
+            return
+
+        if self.size == len(self._days):
+            self._days = np.resize(self._days, 2 * self.size)
+            self._rates = np.resize(self._rates, 2 * self.size)
+        self._days[self.size] = day
+        self._rates[self.size] = rate
+        self.size += 1
+
+    def extend(self, days, rates):
+        """
+        @brief Merges the rates of many days, for days given more than once the last rate is kept
+        @param days Array-like of day ordinals in any order
+        @param rates Array-like of the rates of the days
+        """
+        days = np.concatenate((self.days, np.asarray(days, dtype=np.int32)))
+        rates = np.concatenate((self.rates, np.asarray(rates, dtype=np.float64)))
+        order = np.argsort(days, kind="stable")
+        days = days[order]
+        rates = rates[order]
+        # The stable sort keeps the new rates after the old ones of the same day
+        last = np.append(days[1:] != days[:-1], True)
+        self.assign(days[last], rates[last])
+
+    def index_on(self, day, max_gap=MAX_GAP_DAYS):
+        """
+        @brief Finds the rate valid on a day, which is the last one published on or before it
+        @param day Day ordinal
+        @param max_gap Days a rate stays valid after it was published
+        @return Index of the rate, or -1 if there is none
+        """
+        i = int(np.searchsorted(self.days, day, side="right")) - 1
+        if i < 0 or day - self._days[i] > max_gap:
+            return -1
+        return i
+
+    def rate_on(self, day, max_gap=MAX_GAP_DAYS):
+        """
+        @brief Returns the rate valid on a day
+        @param day Day ordinal
+        @param max_gap Days a rate stays valid after it was published
+        @return The rate, or None if there is none
+        """
+        i = self.index_on(day, max_gap)
+        return None if i < 0 else float(self._rates[i])
+
+
+class RateHistory:
+    """
+    @brief Class storing the historical rates of all currencies
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        """
+        @brief Initializes the store, the file is read on first use
+        @param path Path of the history file, None to keep the history only in memory
+        """
+        self.path = path
+        self.series = None
+        # Incremented on every change, so readers can tell whether the history changed
+        self.version = 0
+        self.lock = threading.RLock()
+
+    def load(self):
+        """
+        @brief Reads the history file once, a missing or broken file is treated as empty
+        """
+        with self.lock:
+            if self.series is not None:
+                return
+            self.series = {}
+            if self.path is None:
+                return
+            try:
+                with np.load(self.path) as data:
+                    for code in data["codes"].tolist():
+                        self.series[code] = RateSeries(data[f"{code}_days"], data[f"{code}_rates"])
+            except (OSError, ValueError, KeyError) as e:
+                if os.path.exists(self.path):
+                    print(f"Error loading rate history: {e}")
+
+    def save(self):
+        """
+        @brief Atomically writes the history file
+        @return True if the file was written
+        """
+        with self.lock:
+            if self.path is None or self.series is None:
+                return False
+            arrays = {"codes": np.array(sorted(self.series), dtype=str)}
+            for code, series in self.series.items():
+                arrays[f"{code}_days"] = series.days
+                arrays[f"{code}_rates"] = series.rates
+            buffer = io.BytesIO()
+            np.savez_compressed(buffer, **arrays)
+
+        try:
+            write_atomically(self.path, buffer.getvalue())
+        except OSError as e:
+            print(f"Error saving rate history: {e}")
+            return False
+        return True
+
+    def add_snapshot(self, day, rates, save=True):
+        """
+        @brief Adds the rates of all currencies on one day
+        @param day Day ordinal
+        @param rates Dictionary of rates by currency code
+        @param save Whether to write the history file afterwards
+        """
+        self.load()
+        with self.lock:
+            for code, rate in rates.items():
+                code = code.upper()
+                if code not in self.series:
+                    self.series[code] = RateSeries()
+                self.series[code].append(day, float(rate))
+            self.version += 1
+        if save:
+            self.save()
+
+    def add_series(self, code, days, rates):
+        """
+        @brief Merges many days of one currency
+        @param code Currency code
+        @param days Array-like of day ordinals
+        @param rates Array-like of the rates of the days
+        """
+        self.load()
+        with self.lock:
+            code = code.upper()
+            if code not in self.series:
+                self.series[code] = RateSeries()
+            self.series[code].extend(days, rates)
+            self.version += 1
+
+    def rate_on(self, code, day, max_gap=MAX_GAP_DAYS):
+        """
+        @brief Returns the rate of a currency on a day
+        @param code Currency code
+        @param day Day ordinal
+        @param max_gap Days a rate stays valid after it was published
+        @return The rate, or None if there is none
+        """
+        self.load()
+        series = self.series.get(code.upper())
+        return None if series is None else series.rate_on(day, max_gap)
+
+    def rates_on(self, day, max_gap=MAX_GAP_DAYS):
+        """
+        @brief Returns the rates of all currencies on a day
+        @param day Day ordinal
+        @param max_gap Days a rate stays valid after it was published
+        @return Dictionary of rates by currency code, empty if there are none
+        """
+        self.load()
+        with self.lock:
+            rates = {}
+            for code, series in self.series.items():
+                i = series.index_on(day, max_gap)
+                if i >= 0:
+                    rates[code] = float(series.rates[i])
+            return rates
+
+    def date_range(self):
+        """
+        @brief Returns the first and last day of the history
+        @return Tuple of day ordinals, or None if the history is empty
+        """
+        self.load()
+        with self.lock:
+            filled = [series for series in self.series.values() if len(series)]
+            if not filled:
+                return None
+            return min(int(series.days[0]) for series in filled), max(int(series.days[-1]) for series in filled)
+
+    def import_records(self, records, base=HISTORY_BASE):
+        """
+        @brief Merges a stream of rates into the history
+        The records are buffered in compact arrays and merged every IMPORT_CHUNK rates, so the
+        memory used by the import does not grow with the length of the stream.
+        @param records Iterable of (day ordinal, currency code, rate) tuples
+        @param base Currency the rates are relative to, stored with rate 1 on every day
+        @return Number of imported rates
+        """
+        pending = {}
+        all_days = set()
+        buffered = 0
+        count = 0
+
+        def flush():
+            for code, (days, rates) in pending.items():
+                self.add_series(code, np.frombuffer(days, dtype=np.int32), np.frombuffer(rates, dtype=np.float64))
+            pending.clear()
+
+        for day, code, rate in records:
+            code = code.strip().upper()
+            if not code:
+                continue
+            if code not in pending:
+                pending[code] = (array.array("i"), array.array("d"))
+            days, rates = pending[code]
+            days.append(day)
+            rates.append(rate)
+            all_days.add(day)
+            buffered += 1
+            count += 1
+            if buffered >= IMPORT_CHUNK:
+                flush()
+                buffered = 0
+        flush()
+
+        if base and all_days:
+            self.add_series(base, sorted(all_days), np.ones(len(all_days)))
+        return count
+
+    def import_file(self, path, base=HISTORY_BASE):
+        """
+        @brief Imports a CSV or XML history file and saves the history
+        The file is read as a stream, see iter_csv_rates and iter_xml_rates for the layouts.
+        @param path Path of the history file, files ending in .xml or starting with < are read as XML
+        @param base Currency the rates are relative to, stored with rate 1 on every day
+        @return Number of imported rates
+
+        @exception OSError: If the file cannot be read.
+        @exception csv.Error: If the file is not a valid CSV file.
+        @exception ValueError: If the CSV file has no header row or the XML file is not valid.
+        """
+        with open(path, "rb") as file:
+            xml = path.lower().endswith(".xml") or file.read(64).lstrip(codecs.BOM_UTF8).lstrip().startswith(b"<")
+            file.seek(0)
+            if xml:
+                count = self.import_records(iter_xml_rates(file), base)
+            else:
+                with io.TextIOWrapper(file, encoding="utf-8-sig", newline="") as text:
+                    count = self.import_records(iter_csv_rates(text), base)
+        self.save()
+        return count
+
+
+def iter_csv_rates(file):
+    """
+    @brief Reads the rates of a CSV history file one row at a time
+    Both the long layout (date, currency, rate rows) and the wide layout (a date column
+    followed by one column of rates per currency, as in the ECB history files) are read.
+    Cells that are not numbers are skipped.
+    @param file Text file opened with newline=""
+    @return Generator of (day ordinal, currency code, rate) tuples
+
+    @exception csv.Error: If the file is not a valid CSV file.
+    @exception ValueError: If the file has no header row.
+    """
+    reader = csv.reader(file)
+    header = [cell.strip().upper() for cell in next(reader, [])]
+    if not header:
+        raise ValueError("History file has no header row")
+    long_layout = len(header) == 3 and header[2] == "RATE"
+
+    for row in reader:
+        try:
+            day = day_ordinal(row[0])
+        except (IndexError, ValueError):
+            continue
+        if long_layout:
+            cells = [(row[1], row[2])] if len(row) >= 3 else []
+        else:
+            cells = zip(header[1:], row[1:])
+        for code, cell in cells:
+            try:
+                yield day, code, float(cell)
+            except ValueError:
+                continue
+
+
+def iter_xml_rates(file):
+    """
+    @brief Reads the rates of an XML history file one element at a time
+    The layout of the ECB and most central bank files is read: an element with a time or date
+    attribute starts a day, and its descendants with a currency attribute hold the rate in a
+    rate attribute or as text. Namespaces are ignored and the read days are dropped from the
+    tree, so the memory use does not depend on the size of the file.
+    @param file Binary file
+    @return Generator of (day ordinal, currency code, rate) tuples
+
+    @exception ValueError: If the file is not valid XML.
+    """
+    day = None
+    parents = []
+    try:
+        for event, element in ElementTree.iterparse(file, events=("start", "end")):
+            if event == "start":
+                parents.append(element)
+                date = element.get("time") or element.get("date")
+                if date is not None:
+                    try:
+                        day = day_ordinal(date)
+                    except ValueError:
+                        day = None
+                continue
+
+            parents.pop()
+            code = element.get("currency")
+            if code is not None and day is not None:
+                try:
+                    yield day, code, float(element.get("rate", element.text or ""))
+                except ValueError:
+                    pass
+            if element.get("time") is not None or element.get("date") is not None:
+                day = None
+                element.clear()
+                if parents:
+                    parents[-1].remove(element)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Invalid XML history file: {e}") from e
+
+
+rate_history = RateHistory()
+
+
+def main(argv=None):
+    """
+    @brief Imports history files from the command line
+    @param argv Command line arguments, sys.argv if None
+    @return Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m currency.rate_history",
+                                     description="Import CSV or XML exchange rate history files.")
+    parser.add_argument("files", nargs="+", help="CSV files of date, currency, rate rows or a date column and one column "
+                                                 "per currency, or XML files of dated elements with currency and rate attributes")
+    parser.add_argument("--base", default=HISTORY_BASE, help="currency the rates are relative to")
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        try:
+            count = rate_history.import_file(path, args.base)
+        except (OSError, csv.Error, ValueError) as e:
+            print(f"Error importing {path}: {e}", file=sys.stderr)
+            return 1
+        print(f"Imported {count} rates from {path}")
+
+    first, last = rate_history.date_range() or (None, None)
+    if first is not None:
+        print(f"History covers {datetime.date.fromordinal(first)} to {datetime.date.fromordinal(last)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
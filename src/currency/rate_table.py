@@ -0,0 +1,172 @@
+"""
+@file rate_table.py
+@brief File containing the vectorized (NumPy) exchange rate table.
+
+The rates are held as one float64 vector with a map from currency codes to vector indices.
+The cross rate of any pair is a division of two vector entries, and the N x N matrix of all
+cross rates is only built when it is first needed, e.g. for converting one amount into every
+currency at once.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from decimal import ROUND_HALF_EVEN
+
+import numpy as np
+
+from .money import Money, exponent
+
+
+class RateTable:
+    """
+    @brief Class representing the exchange rates of all currencies relative to one base currency
+    """
+
+    def __init__(self, rates):
+        """
+        @brief Initializes the table
+        @param rates Dictionary of rates by currency code, as in the rates document
+        """
+        self.codes = [code.upper() for code in rates]
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.vector = np.array([float(rate) for rate in rates.values()], dtype=np.float64)
+        # ISO 4217 exponents of the currencies
+        self.exponents = np.array([exponent(code) for code in self.codes], dtype=np.int64)
+        self._matrix = None
+
+    def __len__(self):
+        """
+        @brief Returns the number of currencies
+        """
+        return len(self.codes)
+
+    def __contains__(self, code):
+        """
+        @brief Returns whether the table has a rate for the currency code
+        """
+        return code.upper() in self.index
+
+    def position(self, code):
+        """
+        @brief Returns the vector index of a currency
+        @param code Currency code
+        @return Index into vector and the rows and columns of matrix
+
+        @exception KeyError: If the currency is not in the table.
+        """
+        return self.index[code.upper()]
+
+    @property
+    def matrix(self):
+        """
+        @brief N x N matrix of cross rates, matrix[i, j] converts currency i into currency j
+        """
+        if self._matrix is None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._matrix = np.outer(1.0 / self.vector, self.vector)
+        return self._matrix
+
+    def rate(self, base, target):
+        """
+        @brief Returns the cross rate between two currencies
+        @param base Code of the base currency
+        @param target Code of the target currency
+        @return Amount of the target currency per one unit of the base currency
+
+        @exception KeyError: If a currency is not in the table.
+        @exception ZeroDivisionError: If the rate of the base currency is zero.
+        """
+        base_rate = self.vector[self.position(base)]
+        if base_rate == 0:
+            raise ZeroDivisionError("Rate of the base currency is zero")
+        return float(self.vector[self.position(target)] / base_rate)
+
+    def convert(self, amounts, base, target):
+        """
+        @brief Converts amounts from one currency to another
+        @param amounts Scalar or array-like of amounts in the base currency
+        @param base Code of the base currency
+        @param target Code of the target currency
+        @return float for a scalar, float64 array for an array of amounts
+
+        @exception KeyError: If a currency is not in the table.
+        @exception ZeroDivisionError: If the rate of the base currency is zero.
+        """
+        rate = self.rate(base, target)
+        if np.ndim(amounts) == 0:
+            return float(amounts) * rate
+        return np.asarray(amounts, dtype=np.float64) * rate
+
+    def convert_money(self, money, target, rounding=ROUND_HALF_EVEN):
+        """
+        @brief Converts an amount exactly to the minor unit of another currency
+        @param money Money in the base currency
+        @param target Code of the target currency
+        @param rounding ROUND_HALF_EVEN or ROUND_HALF_UP
+        @return Money in the target currency
+
+        @exception KeyError: If a currency is not in the table.
+        @exception ZeroDivisionError: If the rate of the base currency is zero.
+        """
+        base_rate = float(self.vector[self.position(money.currency)])
+        target_rate = float(self.vector[self.position(target)])
+        return money.convert(target.upper(), base_rate, target_rate, rounding)
+
+    def convert_to_all(self, amount, base):
+        """
+        @brief Converts one amount into every currency of the table
+        @param amount Amount in the base currency
+        @param base Code of the base currency
+        @return Dictionary of converted amounts by currency code
+
+        @exception KeyError: If the base currency is not in the table.
+        """
+        values = float(amount) * self.matrix[self.position(base)]
+        return dict(zip(self.codes, values.tolist()))
+
+    def positions(self, codes):
+        """
+        @brief Maps currency codes to vector indices
+        @param codes Array-like of currency codes
+        @return int64 array of indices, -1 for codes that are not in the table
+        """
+        unique, inverse = np.unique(np.asarray(codes, dtype=str), return_inverse=True)
+        lookup = np.array([self.index.get(code.strip().upper(), -1) for code in unique.tolist()], dtype=np.int64)
+        return lookup[inverse.reshape(-1)]
+
+    def changed_codes(self, previous):
+        """
+        @brief Compares the table with an older one
+        @param previous RateTable of the older rates
+        @return frozenset of the codes whose rate changed, was added or was removed
+        """
+        if self.codes == previous.codes:
+            # The same currencies in the same order, only the vectors are compared
+            changed = np.flatnonzero(self.vector != previous.vector)
+            return frozenset(self.codes[i] for i in changed.tolist())
+
+        if not previous.codes or not self.codes:
+            return frozenset(self.codes) | frozenset(previous.codes)
+        positions = previous.positions(self.codes)
+        differ = (positions < 0) | (previous.vector[positions] != self.vector)
+        changed = {self.codes[i] for i in np.flatnonzero(differ).tolist()}
+        changed.update(code for code in previous.codes if code not in self.index)
+        return frozenset(changed)
+
+    def convert_pairs(self, amounts, bases, targets):
+        """
+        @brief Converts every amount from its own base currency to its own target currency
+        @param amounts Array-like of amounts
+        @param bases Array of base currency indices from positions
+        @param targets Array of target currency indices from positions
+        @return float64 array of converted amounts, NaN where a currency is unknown or its rate is zero
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        valid = (bases >= 0) & (targets >= 0)
+        base_rates = np.where(valid, self.vector[bases], np.nan)
+        target_rates = np.where(valid, self.vector[targets], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            converted = amounts * target_rates / base_rates
+        converted[~np.isfinite(converted)] = np.nan
+        return converted
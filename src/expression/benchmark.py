@@ -0,0 +1,147 @@
+"""
+@file: benchmark.py
+@brief: This module benchmarks the expression engine against the original string rewriting.
+
+Run from the src directory: python -m expression.benchmark
+
+@author: Martin Valapka
+"""
+
+import math
+import re
+
+from expression.expression_tokenizer import normalize, tokenize
+from expression.expression_parser import parse
+from expression.expression_compiler import compile_tree, run
+from standard.benchmark import measure, format_duration
+
+# Repeated to build the benchmark expressions, uses every prefix and postfix operator
+PATTERN = "3!+√(16)×|2-5|+2√(4!)-"
+LENGTHS = [10, 100, 1000, 10000, 100000]
+
+
+def build_expression(length):
+    """
+    @brief Builds a valid expression of roughly the given length from PATTERN.
+    """
+    repeats = max(length // len(PATTERN), 1)
+    return PATTERN * repeats + "1"
+
+
+def legacy_rewrite(text):
+    """
+    @brief The original rewriting of PhotomathMode.calculate into a Python expression for eval.
+
+    Every operator occurrence is found from the start and rebuilds the whole string.
+    """
+    expression = text.replace("π", f"({math.pi})")
+    expression = re.sub(r'(\d)\(', r'\1*(', expression)
+    expression = re.sub(r'\)(\d)', r')*\1', expression)
+
+    # Replace other custom operators with Python-compatible operators
+    expression = expression.replace("\u00F7", "/").replace("\u00D7", "*").replace("^", "**")
+
+    # Handle factorial
+    while '!' in expression:
+        factorial_index = expression.index('!')
+
+        # Find the start of the number or expression before the factorial
+        start = factorial_index - 1
+        while start >= 0 and (expression[start].isdigit() or expression[start] == '.'):
+            start -= 1
+        start += 1
+
+        # Extract the number or expression
+        factorial_expr = expression[start:factorial_index]
+
+        # Replace the factorial with the factorial engine
+        expression = expression[:start] + f"factorial({factorial_expr})" + expression[factorial_index + 1:]
+
+    # Custom handling for root operations
+    while '√' in expression:
+        root_index = expression.index('√')
+        degree_start = root_index - 1
+        while degree_start >= 0 and (expression[degree_start].isdigit() or expression[degree_start] == '.'):
+            degree_start -= 1
+        degree_start += 1
+
+        if degree_start < root_index:
+            root_degree = expression[degree_start:root_index]
+            expression = expression[:degree_start] + expression[root_index:]
+            root_index -= (root_index - degree_start)
+        else:
+            root_degree = "2"
+
+        if expression[root_index + 1] == '(':
+            paren_count = 1
+            end = root_index + 2
+            while paren_count > 0:
+                if expression[end] == '(':
+                    paren_count += 1
+                elif expression[end] == ')':
+                    paren_count -= 1
+                end += 1
+            root_expr = expression[root_index + 2:end - 1]
+            expression = (expression[:root_index] +
+                          f"math.pow({root_expr}, 1/{root_degree})" +
+                          expression[end:])
+        else:
+            end = root_index + 1
+            while end < len(expression) and (expression[end].isdigit() or expression[end] == '.'):
+                end += 1
+            root_expr = expression[root_index + 1:end]
+            expression = (expression[:root_index] +
+                          f"math.pow({root_expr}, 1/{root_degree})" +
+                          expression[end:])
+
+    # Handle absolute value
+    while '|' in expression:
+        start = expression.index('|')
+        end = expression.index('|', start + 1)
+        abs_expr = expression[start + 1:end]
+        expression = expression[:start] + f"abs({abs_expr})" + expression[end + 1:]
+
+    # Replace other custom functions
+    expression = expression.replace("mod", "%")
+
+    return expression
+
+
+def legacy_compile(text):
+    """
+    @brief Rewrites an expression the original way and compiles it like eval did.
+    """
+    return compile(legacy_rewrite(text), "<expression>", "eval")
+
+
+def engine_compile(text):
+    """
+    @brief Tokenizes, parses and compiles an expression without the cache.
+    """
+    return compile_tree(parse(tokenize(normalize(text))))
+
+
+def benchmark_expressions():
+    """
+    @brief Compares the original rewriting with the expression engine and prints the results.
+    """
+    print(f"{'length':>8} {'legacy':>12} {'compile':>12} {'evaluate':>12} {'speedup':>10}")
+    for length in LENGTHS:
+        text = build_expression(length)
+        try:
+            legacy = measure(legacy_compile, text)
+        except RecursionError:
+            legacy = None
+        compiled = measure(engine_compile, text)
+        evaluated = measure(run, engine_compile(text))
+
+        if legacy is None:
+            print(f"{len(text):>8} {'recursion':>12} {format_duration(compiled):>12} "
+                  f"{format_duration(evaluated):>12} {'-':>10}")
+        else:
+            print(f"{len(text):>8} {format_duration(legacy):>12} {format_duration(compiled):>12} "
+                  f"{format_duration(evaluated):>12} {legacy / compiled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark_expressions()
@@ -0,0 +1,184 @@
+"""
+@file: expression_compiler.py
+@brief: This module compiles Expression mode syntax trees into postfix programs and caches them.
+
+The tree is flattened into a postfix program of (function, arity) instructions, so
+evaluating a compiled expression is a single pass over a value stack without any parsing
+or recursion. Compiled expressions are kept in a bounded LRU cache keyed by the normalized
+expression.
+
+@author: Martin Valapka
+"""
+
+import math
+import operator
+from functools import lru_cache, partial
+
+from expression.expression_tokenizer import normalize, tokenize
+from expression.expression_parser import parse
+from standard.factorial import factorial, log10_factorial
+from standard.power import estimate_log10
+from standard.roots import nth_root
+
+CACHE_SIZE = 256
+# Largest number of digits of an exact power, product or factorial result
+MAX_DIGITS = 100000
+# Bit length of an integer with more than MAX_DIGITS digits for certain
+MAX_BITS = math.ceil(MAX_DIGITS * math.log2(10)) + 1
+
+
+def power(base, exponent):
+    """
+    @brief Computes base^exponent, refusing exact results with more than MAX_DIGITS digits.
+    @exception OverflowError: If the exact result would be too large.
+    """
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        # Any base of 2 or more has over MAX_DIGITS digits from this exponent on
+        if exponent > 4 * MAX_DIGITS or estimate_log10(base, exponent) > MAX_DIGITS:
+            raise OverflowError("Result is too large")
+    return base ** exponent
+
+
+def multiply(left, right):
+    """
+    @brief Computes left * right, refusing exact results with more than MAX_DIGITS digits.
+    @exception OverflowError: If the exact result would be too large.
+    """
+    if isinstance(left, int) and isinstance(right, int) and left.bit_length() + right.bit_length() > MAX_BITS:
+        raise OverflowError("Result is too large")
+    return left * right
+
+
+def root(base, degree):
+    """
+    @brief Computes the root of the given degree, exact for perfect powers.
+    @exception ValueError: If an even root of a negative number is requested.
+    """
+    if not isinstance(degree, int) or isinstance(base, complex):
+        return math.pow(base, 1 / degree)
+
+    if degree <= 0:
+        raise ValueError("Root degree must be a natural number.")
+
+    if base < 0:
+        if degree % 2 == 0:
+            raise ValueError("Cannot compute even root of negative number.")
+        return -nth_root(-base, degree)
+    return nth_root(base, degree)
+
+
+def exact_factorial(num):
+    """
+    @brief Computes the factorial, refusing results with more than MAX_DIGITS digits.
+    @exception OverflowError: If the result would be too large.
+    """
+    if isinstance(num, float) and num.is_integer():
+        num = int(num)
+    if isinstance(num, int) and num > 0 and log10_factorial(num) > MAX_DIGITS:
+        raise OverflowError("Result is too large")
+    return factorial(num)
+
+
+BINARY_FUNCTIONS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": multiply,
+    "/": operator.truediv,
+    "%": operator.mod,
+    "^": power,
+}
+
+
+def instruction(node):
+    """
+    @brief Returns the program instruction of a single node without its operands.
+    @return Tuple of the function (None to push a constant) and its arity or the constant.
+    """
+    kind = node[0]
+
+    if kind == "number":
+        return None, node[1]
+    if kind == "binary":
+        return BINARY_FUNCTIONS[node[1]], 2
+    if kind == "negate":
+        return operator.neg, 1
+    if kind == "factorial":
+        return exact_factorial, 1
+    if kind == "abs":
+        return abs, 1
+    if kind == "root":
+        return partial(root, degree=node[1]), 1
+
+    raise SyntaxError("Invalid input")
+
+
+def compile_tree(tree):
+    """
+    @brief Compiles an expression tree into a postfix program.
+
+    The tree is walked with an explicit stack in root, right, left order, which reversed is
+    the postfix order, so deep trees do not hit the recursion limit.
+
+    @param tree: The root node from the parser.
+    @return Tuple of instructions for the run function.
+    """
+    program = []
+    pending = [tree]
+
+    while pending:
+        node = pending.pop()
+        program.append(instruction(node))
+        if node[0] == "binary":
+            pending.append(node[2])
+            pending.append(node[3])
+        elif node[0] != "number":
+            pending.append(node[-1])
+
+    program.reverse()
+    return tuple(program)
+
+
+def run(program):
+    """
+    @brief Evaluates a postfix program on a value stack.
+    @param program: Instructions from compile_tree.
+    @return The value of the expression.
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+
+    for function, argument in program:
+        if function is None:
+            push(argument)
+        elif argument == 1:
+            stack[-1] = function(stack[-1])
+        else:
+            right = pop()
+            stack[-1] = function(stack[-1], right)
+
+    return stack[0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expression):
+    """
+    @brief Tokenizes, parses and compiles a normalized expression.
+    @param expression: The normalized expression.
+    @return The compiled program.
+
+    @exception SyntaxError: If the expression is not valid.
+    """
+    return compile_tree(parse(tokenize(expression)))
+
+
+def evaluate(expression):
+    """
+    @brief Evaluates an expression as typed in Expression mode.
+    @param expression: The expression as shown on the display.
+    @return The value of the expression (int, float or complex).
+
+    @exception SyntaxError: If the expression is not valid.
+    @exception ZeroDivisionError: If the expression divides by zero.
+    """
+    return run(compile_expression(normalize(expression)))
@@ -38,6 +38,7 @@ class ExpressionDisplay(QWidget):
         
         self.currentInput = None
         self.currentExpression = None
+        self.previewLabel = None
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -68,6 +69,15 @@ class ExpressionDisplay(QWidget):
         self.currentInput.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
         non_essential_layout.addWidget(self.currentInput)
+
+        # Secondary label with the live result of the expression typed so far
+        self.previewLabel = QLabel("", self.non_essential_widget)
+        self.previewLabel.setFont(QFont("Arial", 14))
+        self.previewLabel.setStyleSheet(f"color: {LIGHT_GRAY}; background-color: transparent; border: none;")
+        self.previewLabel.setAlignment(Qt.AlignRight)
+        self.previewLabel.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+
+        non_essential_layout.addWidget(self.previewLabel)
         
         layout.addWidget(self.non_essential_widget)
         displayFrame.setLayout(layout)
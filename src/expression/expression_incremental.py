@@ -0,0 +1,229 @@
+"""
+@file: expression_incremental.py
+@brief: This module evaluates Expression mode input incrementally while it is typed.
+
+The evaluator computes values directly on the parser stacks instead of building a tree and
+keeps a snapshot of the parser state after every token. When the expression changes, only
+the tokens from the first changed character on are tokenized and fed again, so a keystroke
+costs work proportional to the change and not to the length of the expression.
+
+@author: Martin Valapka
+"""
+
+import math
+import operator
+import threading
+from bisect import bisect_left
+
+from expression.expression_tokenizer import normalize, tokenize
+from expression.expression_parser import Parser
+from expression.expression_compiler import BINARY_FUNCTIONS, exact_factorial, root
+
+UNARY_FUNCTIONS = {
+    "negate": operator.neg,
+    "factorial": exact_factorial,
+    "abs": abs,
+}
+
+# Float counterparts of the operators, used to estimate the size of the exact values
+ESTIMATE_BINARY_FUNCTIONS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+    "^": operator.pow,
+}
+ESTIMATE_UNARY_FUNCTIONS = {
+    "negate": operator.neg,
+    "factorial": lambda value: math.gamma(value + 1),
+    "abs": abs,
+}
+
+
+class EvaluatingParser(Parser):
+    """
+    @brief Parser that reduces operators to values as soon as their operands are known.
+    """
+
+    def make_number(self, value):
+        return value
+
+    def make_unary(self, kind, operand, value=None):
+        if kind == "root":
+            return root(operand, value)
+        return UNARY_FUNCTIONS[kind](operand)
+
+    def make_binary(self, operator, left, right):
+        return BINARY_FUNCTIONS[operator](left, right)
+
+
+class EstimatingParser(Parser):
+    """
+    @brief Parser that computes values in floats to estimate the size of the exact values.
+    """
+
+    def __init__(self):
+        """
+        @brief Initializes the parser with an empty state.
+        """
+        super().__init__()
+        # Digits of the largest value computed so far, inf once a value left the float range
+        self.digits = 0
+
+    def track(self, function, *arguments):
+        """
+        @brief Computes a float value and records its number of digits.
+        """
+        try:
+            value = function(*arguments)
+        except OverflowError:
+            value = math.inf
+
+        magnitude = abs(value)
+        if not math.isfinite(magnitude):
+            self.digits = math.inf
+        elif magnitude >= 1:
+            self.digits = max(self.digits, math.floor(math.log10(magnitude)) + 1)
+        return value
+
+    def make_number(self, value):
+        return self.track(float, value)
+
+    def make_unary(self, kind, operand, value=None):
+        if kind == "root":
+            return self.track(lambda base: abs(base) ** (1 / value), operand)
+        return self.track(ESTIMATE_UNARY_FUNCTIONS[kind], operand)
+
+    def make_binary(self, operator, left, right):
+        return self.track(ESTIMATE_BINARY_FUNCTIONS[operator], left, right)
+
+
+def estimate_digits(text):
+    """
+    @brief Estimates the number of digits of the largest value met while previewing an expression.
+
+    The expression is evaluated in floats, so the estimate is cheap however large the exact
+    values are. Values are only tracked up to the first error, as the preview stops there too.
+
+    @param text: The expression as shown on the display.
+    @return The number of digits, inf if a value leaves the float range.
+    """
+    parser = EstimatingParser()
+    try:
+        tokens = tokenize(normalize(text))
+        for index, token in enumerate(tokens):
+            parser.feed(token, tokens[index + 1] if index + 1 < len(tokens) else None)
+        parser.finish(close_groups=True)
+    except (SyntaxError, ArithmeticError, ValueError, TypeError):
+        pass
+    return parser.digits
+
+
+def common_prefix_length(first, second):
+    """
+    @brief Returns the length of the longest common prefix of two strings.
+    """
+    if second.startswith(first):
+        return len(first)
+
+    length = min(len(first), len(second))
+    for index in range(length):
+        if first[index] != second[index]:
+            return index
+    return length
+
+
+class IncrementalEvaluator:
+    """
+    @brief Keeps the parse state of the expression typed so far and previews its value.
+    """
+
+    def __init__(self):
+        """
+        @brief Initializes the evaluator for an empty expression.
+        """
+        self.parser = EvaluatingParser()
+        self.text = ""
+        self.tokens = []
+        self.positions = []
+        # snapshots[i] is the parser state after feeding tokens[:i], the last token is never fed
+        # because it may still grow, shorter lists mean feeding stopped on an error
+        self.snapshots = [self.parser.save()]
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """
+        @brief Forgets the expression typed so far.
+        """
+        self.text = ""
+        self.tokens = []
+        self.positions = []
+        del self.snapshots[1:]
+
+    def sync(self, text):
+        """
+        @brief Brings the parse state up to date with the given expression.
+        @param text: The expression as shown on the display.
+        @return True if the expression could be tokenized and parsed up to its last token.
+        """
+        text = normalize(text)
+        common = common_prefix_length(self.text, text)
+
+        # Keep the tokens that end before the first changed character and whose following
+        # token does as well, since it decided how they were fed
+        kept = max(bisect_left(self.positions, common) - 2, 0)
+        kept = min(kept, len(self.snapshots) - 1)
+        restart = self.positions[kept] if kept < len(self.tokens) else len(self.text)
+        restart = min(restart, common)
+
+        try:
+            tail = tokenize(text, restart)
+        except SyntaxError:
+            self.reset()
+            return False
+
+        del self.tokens[kept:]
+        del self.positions[kept:]
+        del self.snapshots[kept + 1:]
+        self.tokens.extend(tail)
+        self.positions.extend(token.position for token in tail)
+        self.text = text
+
+        parser = self.parser
+        parser.restore(self.snapshots[kept])
+        tokens = self.tokens
+        try:
+            for index in range(kept, len(tokens) - 1):
+                parser.feed(tokens[index], tokens[index + 1])
+                self.snapshots.append(parser.save())
+        except (SyntaxError, ArithmeticError, ValueError, TypeError):
+            return False
+        return True
+
+    def value(self):
+        """
+        @brief Computes the value of the synced expression, closing brackets left open.
+        @return The value, or None if the expression is incomplete or cannot be evaluated.
+        """
+        if not self.tokens or len(self.snapshots) < len(self.tokens):
+            return None
+
+        parser = self.parser
+        parser.restore(self.snapshots[-1])
+        try:
+            parser.feed(self.tokens[-1])
+            return parser.finish(close_groups=True)
+        except (SyntaxError, ArithmeticError, ValueError, TypeError):
+            return None
+
+    def preview(self, text):
+        """
+        @brief Syncs the expression and returns its value, safe to call from worker threads.
+        @param text: The expression as shown on the display.
+        @return The value, or None if the expression is incomplete or cannot be evaluated.
+        """
+        with self.lock:
+            if not self.sync(text):
+                return None
+            return self.value()
@@ -0,0 +1,255 @@
+"""
+@file: expression_parser.py
+@brief: This module parses Expression mode tokens into an abstract syntax tree.
+
+The parser is a single left to right pass with an operand stack and an operator stack
+(operator precedence parsing without recursion), so long or deeply nested input never
+hits the recursion limit. It keeps the precedence rules of the former eval based
+implementation: ^ is right associative and binds tighter than a leading minus, a number
+directly before √ is the root degree, ! applies to the operand before it and a number,
+π or closing bracket followed by a number, π or opening bracket is a multiplication.
+
+Tokens are fed one at a time and the parser state can be saved and restored, so the
+incremental evaluator can resume parsing from any token.
+
+Nodes are tuples whose first item is the node kind:
+    ("number", value), ("negate", operand), ("binary", operator, left, right),
+    ("factorial", operand), ("root", degree, operand), ("abs", operand)
+
+@author: Martin Valapka
+"""
+
+import math
+from expression.expression_tokenizer import NUMBER, PI, OPERATOR, FACTORIAL, ROOT, LEFT, RIGHT, ABS
+
+# Binding power of the binary operators and whether they are right associative
+BINARY_OPERATORS = {
+    "+": (1, False),
+    "-": (1, False),
+    "*": (2, False),
+    "/": (2, False),
+    "%": (2, False),
+    "^": (4, True),
+}
+UNARY_PRECEDENCE = 3
+
+# Tokens that end an operand and tokens that start one, a pair of them is a multiplication
+IMPLICIT_LEFT = (NUMBER, PI, RIGHT)
+IMPLICIT_RIGHT = (NUMBER, PI, LEFT)
+
+DEFAULT_ROOT_DEGREE = 2
+
+# Operator stack entries that wait for an operand or a closing token instead of a right operand
+NEGATE = "negate"
+PREFIXES = (ROOT, LEFT, ABS)
+
+
+class Parser:
+    """
+    @brief Single pass operator precedence parser building an expression tree.
+    """
+
+    def __init__(self):
+        """
+        @brief Initializes the parser with an empty state.
+        """
+        self.operands = []
+        # Entries are (kind, value) with the operator or the root degree as value
+        self.operators = []
+        self.expect_operand = True
+        # Kind of the last fed token, used to detect implicit multiplication
+        self.previous = None
+        # Set when the next root token was already consumed together with its degree
+        self.skip_root = False
+
+    def make_number(self, value):
+        """
+        @brief Creates the node of a number.
+        """
+        return ("number", value)
+
+    def make_unary(self, kind, operand, value=None):
+        """
+        @brief Creates the node of a negation, factorial, absolute value or root (value is the degree).
+        """
+        if kind == "root":
+            return ("root", value, operand)
+        return (kind, operand)
+
+    def make_binary(self, operator, left, right):
+        """
+        @brief Creates the node of a binary operation.
+        """
+        return ("binary", operator, left, right)
+
+    def save(self):
+        """
+        @brief Returns a snapshot of the parser state.
+        """
+        return (tuple(self.operands), tuple(self.operators), self.expect_operand,
+                self.previous, self.skip_root)
+
+    def restore(self, state):
+        """
+        @brief Restores a snapshot created by save.
+        """
+        operands, operators, self.expect_operand, self.previous, self.skip_root = state
+        self.operands = list(operands)
+        self.operators = list(operators)
+
+    def reduce(self):
+        """
+        @brief Pops the top operator and replaces its operands with the resulting node.
+        """
+        kind, value = self.operators.pop()
+        if kind == NEGATE:
+            self.operands[-1] = self.make_unary("negate", self.operands[-1])
+        else:
+            right = self.operands.pop()
+            self.operands[-1] = self.make_binary(value, self.operands[-1], right)
+
+    def reduce_before(self, operator):
+        """
+        @brief Reduces the pending operators that bind at least as tightly as an incoming binary operator.
+        """
+        precedence, right_associative = BINARY_OPERATORS[operator]
+        while self.operators:
+            kind, value = self.operators[-1]
+            if kind in PREFIXES:
+                break
+            top = UNARY_PRECEDENCE if kind == NEGATE else BINARY_OPERATORS[value][0]
+            if top < precedence or (top == precedence and right_associative):
+                break
+            self.reduce()
+
+    def push_operand(self, node):
+        """
+        @brief Pushes a complete operand, applying the roots that wait for it.
+        """
+        while self.operators and self.operators[-1][0] == ROOT:
+            node = self.make_unary("root", node, self.operators.pop()[1])
+        self.operands.append(node)
+        self.expect_operand = False
+
+    def push_operator(self, operator):
+        """
+        @brief Pushes a binary operator after reducing the operators it does not bind tighter than.
+        """
+        self.reduce_before(operator)
+        self.operators.append((OPERATOR, operator))
+        self.expect_operand = True
+
+    def close(self, opening):
+        """
+        @brief Closes the innermost bracket or absolute value and pushes its content as an operand.
+        @exception SyntaxError: If the innermost open group is not of the given kind.
+        """
+        while self.operators and self.operators[-1][0] not in (LEFT, ABS):
+            self.reduce()
+        if not self.operators or self.operators.pop()[0] != opening:
+            raise SyntaxError("Invalid input")
+
+        node = self.operands.pop()
+        self.push_operand(self.make_unary("abs", node) if opening == ABS else node)
+
+    def feed(self, token, following=None):
+        """
+        @brief Processes one token.
+        @param token: The token.
+        @param following: The next token or None, needed to recognize a root degree.
+
+        @exception SyntaxError: If the token cannot follow the tokens fed before.
+        """
+        kind = token.kind
+
+        if self.skip_root:
+            self.skip_root = False
+        elif not self.expect_operand:
+            if kind == FACTORIAL:
+                self.operands[-1] = self.make_unary("factorial", self.operands[-1])
+            elif kind == OPERATOR:
+                self.push_operator(token.value)
+            elif kind == RIGHT:
+                self.close(LEFT)
+            elif kind == ABS:
+                self.close(ABS)
+            elif kind in IMPLICIT_RIGHT and self.previous in IMPLICIT_LEFT:
+                self.push_operator("*")
+                self.feed_operand(token, following)
+            else:
+                raise SyntaxError("Invalid input")
+        else:
+            self.feed_operand(token, following)
+
+        self.previous = kind
+
+    def feed_operand(self, token, following):
+        """
+        @brief Processes a token where an operand is expected.
+        @exception SyntaxError: If the token cannot start an operand.
+        """
+        kind = token.kind
+
+        if kind == NUMBER:
+            if following is not None and following.kind == ROOT:
+                self.operators.append((ROOT, token.value))
+                self.skip_root = True
+            else:
+                self.push_operand(self.make_number(token.value))
+        elif kind == PI:
+            self.push_operand(self.make_number(math.pi))
+        elif kind == ROOT:
+            self.operators.append((ROOT, DEFAULT_ROOT_DEGREE))
+        elif kind in (LEFT, ABS):
+            self.operators.append((kind, None))
+        elif kind == OPERATOR and token.value in "+-" and not (self.operators and self.operators[-1][0] == ROOT):
+            if token.value == "-":
+                self.operators.append((NEGATE, None))
+        else:
+            raise SyntaxError("Invalid input")
+
+    def finish(self, close_groups=False):
+        """
+        @brief Reduces the remaining operators into the final result.
+        @param close_groups: If True, brackets and absolute values left open are closed.
+        @return The root node.
+
+        @exception SyntaxError: If the fed tokens do not form a complete expression.
+        """
+        if self.expect_operand:
+            raise SyntaxError("Invalid input")
+
+        while self.operators:
+            kind = self.operators[-1][0]
+            if close_groups and kind in (LEFT, ABS):
+                self.close(kind)
+            elif kind in PREFIXES:
+                raise SyntaxError("Invalid input")
+            else:
+                self.reduce()
+
+        return self.operands[0]
+
+    def parse(self, tokens):
+        """
+        @brief Parses all tokens into one expression tree.
+        @param tokens: Tokens from the tokenizer.
+        @return The root node.
+
+        @exception SyntaxError: If the tokens do not form a valid expression.
+        """
+        last = len(tokens) - 1
+        for index, token in enumerate(tokens):
+            self.feed(token, tokens[index + 1] if index < last else None)
+        return self.finish()
+
+
+def parse(tokens):
+    """
+    @brief Parses a list of tokens into an expression tree.
+    @param tokens: Tokens from the tokenizer.
+    @return The root node.
+
+    @exception SyntaxError: If the tokens do not form a valid expression.
+    """
+    return Parser().parse(tokens)
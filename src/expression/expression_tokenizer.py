@@ -0,0 +1,94 @@
+"""
+@file: expression_tokenizer.py
+@brief: This module splits Expression mode input into tokens.
+
+@author: Martin Valapka
+"""
+
+from collections import namedtuple
+
+# Token kinds
+NUMBER = "number"
+PI = "pi"
+OPERATOR = "operator"
+FACTORIAL = "factorial"
+ROOT = "root"
+LEFT = "left"
+RIGHT = "right"
+ABS = "abs"
+
+OPERATORS = "+-*/%^"
+# ASCII digits only, str.isdigit also accepts digits such as "²" that int() cannot read
+DIGITS = "0123456789"
+
+SYMBOLS = {
+    "π": PI,
+    "!": FACTORIAL,
+    "√": ROOT,
+    "(": LEFT,
+    ")": RIGHT,
+    "|": ABS,
+}
+
+Token = namedtuple("Token", ["kind", "value", "position"])
+
+
+def normalize(expression):
+    """
+    @brief Replaces the display symbols of the expression with the ones the tokenizer reads.
+    @param expression: The expression as shown on the display.
+    @return The normalized expression.
+    """
+    return (expression.replace("÷", "/").replace("×", "*")
+            .replace("mod", "%").replace(" ", ""))
+
+
+def parse_number(text):
+    """
+    @brief Converts the text of a number token to an int or a float.
+    @param text: Digits with at most one decimal point.
+    @return The number.
+
+    @exception SyntaxError: If the text is not a valid number.
+    """
+    try:
+        if '.' not in text:
+            return int(text)
+        return float(text)
+    except ValueError:
+        raise SyntaxError("Invalid input") from None
+
+
+def tokenize(expression, start=0):
+    """
+    @brief Splits a normalized expression into tokens.
+    @param expression: The normalized expression.
+    @param start: Position where tokenizing starts, it must be the start of a token.
+    @return List of tokens.
+
+    @exception SyntaxError: If the expression contains an unknown character.
+    """
+    tokens = []
+    length = len(expression)
+    position = start
+
+    while position < length:
+        char = expression[position]
+
+        if char in DIGITS or char == '.':
+            end = position + 1
+            while end < length and (expression[end] in DIGITS or expression[end] == '.'):
+                end += 1
+            tokens.append(Token(NUMBER, parse_number(expression[position:end]), position))
+            position = end
+            continue
+
+        if char in OPERATORS:
+            tokens.append(Token(OPERATOR, char, position))
+        elif char in SYMBOLS:
+            tokens.append(Token(SYMBOLS[char], char, position))
+        else:
+            raise SyntaxError("Invalid input")
+        position += 1
+
+    return tokens
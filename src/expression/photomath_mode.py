@@ -6,14 +6,17 @@
 @date 14.08. 2024
 """
 
-import re
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton, QHBoxLayout, \
     QLineEdit, QStackedLayout, QLineEdit
 from PySide6.QtGui import QFont, QKeySequence, QShortcut, QIcon, QRegularExpressionValidator
-from PySide6.QtCore import Qt, QSize, QRegularExpression
-import math
+from PySide6.QtCore import Qt, QSize, QRegularExpression, Signal
+import time
+from concurrent.futures import ThreadPoolExecutor
 from expression.expression_display import ExpressionDisplay
 from expression.expression_buttons import ExpressionButtons
+from expression.expression_compiler import evaluate
+from expression.expression_incremental import IncrementalEvaluator, estimate_digits
+from standard.factorial import scientific_text
 
 
 # TODO: Add shortcuts for all buttons, fix the typing, bug fix
@@ -28,11 +31,27 @@ LABEL_COLOR = "#25265E"
 HOVER_COLOR = "#898989"
 HOVER_OPERATOR = "#FF8409"
 
+# Previews taking longer than this many seconds are computed on a worker thread
+PREVIEW_BUDGET = 0.005
+# Previews of expressions with values longer than this many digits go to the worker right away
+PREVIEW_DIGITS = 300
+
+
+def shutdown_pool(pool):
+    """
+    @brief Shuts down a preview pool without waiting, previews that did not start are dropped.
+    @param pool: The ThreadPoolExecutor of the previews.
+    """
+    pool.shutdown(wait=False, cancel_futures=True)
+
 
 class PhotomathMode(QWidget):
     """
     @brief This class represents the Photomath mode of the calculator.
     """
+    # Emitted from the preview worker with the expression, its preview text and the time spent
+    preview_ready = Signal(str, str, float)
+
     def __init__(self, parent=None):
         """
         @brief Initializes the PhotomathMode with necessary attributes and calls the init_ui method.
@@ -49,8 +68,18 @@ class PhotomathMode(QWidget):
         self.displayFrame = ExpressionDisplay(self)
         self.currentInput = self.displayFrame.currentInput
         self.currentExpression = self.displayFrame.currentExpression
+        self.previewLabel = self.displayFrame.previewLabel
         self.evaluated = False
 
+        self.evaluator = IncrementalEvaluator()
+        self.previewPool = ThreadPoolExecutor(max_workers=1)
+        # The pool is shut down with the widget, the signal must not keep the widget alive
+        self.destroyed.connect(lambda _=None, pool=self.previewPool: shutdown_pool(pool))
+        self.previewFuture = None
+        self.previewPending = False
+        self.previewOffloaded = False
+        self.preview_ready.connect(self.on_preview_ready)
+
         self.init_ui()
 
         regex = QRegularExpression(r"^[0-9+\-*/]*$")
@@ -109,6 +138,7 @@ class PhotomathMode(QWidget):
             self.currentExpression += str(digit)
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def show_operators(self, operator):
         """
@@ -135,6 +165,7 @@ class PhotomathMode(QWidget):
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
         self.evaluated = False
+        self.update_preview()
 
     def update_current_input(self):
         """
@@ -156,12 +187,93 @@ class PhotomathMode(QWidget):
                 self.currentExpression = self.currentExpression[:30]
                 self.currentInput.setText(self.currentExpression)
 
+    def format_preview(self, result):
+        """
+        @brief Formats a preview value the way calculate shows results.
+        @param result: The value from the incremental evaluator or None.
+        @return The preview text, empty if there is no value.
+        """
+        if result is None:
+            return ""
+        if isinstance(result, int) and abs(result) >= 10 ** 30:
+            return "= " + scientific_text(result)
+        if isinstance(result, float) and result.is_integer():
+            return "= " + str(int(result))
+        return "= " + str(result)
+
+    def compute_preview(self, text):
+        """
+        @brief Computes the preview of an expression on the preview worker thread.
+        @param text: The expression to preview.
+        """
+        start = time.perf_counter()
+        preview = self.format_preview(self.evaluator.preview(text))
+        self.preview_ready.emit(text, preview, time.perf_counter() - start)
+
+    def update_preview(self):
+        """
+        @brief Updates the live result preview of the expression typed so far.
+        Cheap previews are computed right away, once one takes longer than PREVIEW_BUDGET
+        the following ones run on a worker thread until they become cheap again. Expressions
+        whose values are estimated to have more than PREVIEW_DIGITS digits skip the GUI thread.
+        """
+        text = self.currentExpression
+        if not text or self.evaluated or 'Error' in text or 'inf' in text:
+            self.previewLabel.setText("")
+            return
+
+        # Only one preview runs on the worker, the latest expression is previewed after it
+        if self.previewFuture is not None and not self.previewFuture.done():
+            self.previewPending = True
+            return
+
+        if self.previewOffloaded or estimate_digits(text) > PREVIEW_DIGITS:
+            if self.previewPool is None:
+                self.previewPool = ThreadPoolExecutor(max_workers=1)
+                self.destroyed.connect(lambda _=None, pool=self.previewPool: shutdown_pool(pool))
+            self.previewFuture = self.previewPool.submit(self.compute_preview, text)
+            return
+
+        start = time.perf_counter()
+        preview = self.format_preview(self.evaluator.preview(text))
+        self.previewOffloaded = time.perf_counter() - start > PREVIEW_BUDGET
+        self.previewLabel.setText(preview)
+
+    def closeEvent(self, event):
+        """
+        @brief Stops the preview worker when the mode is closed.
+        @param event: The close event.
+        """
+        if self.previewPool is not None:
+            shutdown_pool(self.previewPool)
+            self.previewPool = None
+        self.previewFuture = None
+        self.previewPending = False
+        super().closeEvent(event)
+
+    def on_preview_ready(self, text, preview, elapsed):
+        """
+        @brief Shows a preview computed on the worker thread if its expression is still current.
+        @param text: The previewed expression.
+        @param preview: The preview text.
+        @param elapsed: Seconds the preview took.
+        """
+        self.previewFuture = None
+        self.previewOffloaded = elapsed > PREVIEW_BUDGET
+        if text == self.currentExpression and not self.evaluated:
+            self.previewLabel.setText(preview)
+
+        if self.previewPending:
+            self.previewPending = False
+            self.update_preview()
+
     def handle_clear(self):
         """
         @brief Clears the current expression, resetting the calculator.
         """
         self.currentExpression = ""
         self.update_current_input()
+        self.update_preview()
 
     def handle_delete(self):
         """
@@ -178,6 +290,7 @@ class PhotomathMode(QWidget):
             self.currentExpression = ""
             self.update_current_input()
             self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def handle_decimal_point(self):
         """
@@ -203,6 +316,7 @@ class PhotomathMode(QWidget):
                 self.currentExpression += '.'
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def handle_exponentiation(self):
         """
@@ -218,6 +332,7 @@ class PhotomathMode(QWidget):
         self.currentExpression += '^'
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def handle_root(self):
         """
@@ -232,6 +347,7 @@ class PhotomathMode(QWidget):
         self.currentExpression += '√('
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def handle_factorial(self):
         """
@@ -243,6 +359,7 @@ class PhotomathMode(QWidget):
             self.currentExpression += '!'
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def handle_pi(self):
         """
@@ -256,6 +373,7 @@ class PhotomathMode(QWidget):
             return
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def handle_absolute_value(self):
         """
@@ -273,95 +391,22 @@ class PhotomathMode(QWidget):
         self.currentExpression += '|0|'
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
 
     def calculate(self):
         """
         @brief Evaluates the current mathematical expression and updates the display.
         """
-        pi_value = math.pi
+        scientific = False
 
         try:
-            # Replace π with its numeric value, ensuring multiplication where necessary
-            expression = self.currentExpression.replace("π", f"({pi_value})")
-            expression = re.sub(r'(\d)\(', r'\1*(', expression)
-            expression = re.sub(r'\)(\d)', r')*\1', expression)
-
-            # Replace other custom operators with Python-compatible operators
-            expression = expression.replace("\u00F7", "/").replace("\u00D7", "*").replace("^", "**")
-
-            # Handle factorial
-            while '!' in expression:
-                factorial_index = expression.index('!')
-
-                # Find the start of the number or expression before the factorial
-                start = factorial_index - 1
-                while start >= 0 and (expression[start].isdigit() or expression[start] == '.'):
-                    start -= 1
-                start += 1
-
-                # Extract the number or expression
-                factorial_expr = expression[start:factorial_index]
-
-                # Replace the factorial with math.factorial
-                expression = expression[:start] + f"math.factorial({factorial_expr})" + expression[factorial_index + 1:]
-
-            # Custom handling for root operations
-            while '√' in expression:
-                root_index = expression.index('√')
-                degree_start = root_index - 1
-                while degree_start >= 0 and (expression[degree_start].isdigit() or expression[degree_start] == '.'):
-                    degree_start -= 1
-                degree_start += 1
-
-                if degree_start < root_index:
-                    root_degree = expression[degree_start:root_index]
-                    expression = expression[:degree_start] + expression[root_index:]
-                    root_index -= (root_index - degree_start)
-                else:
-                    root_degree = "2"
-
-                if expression[root_index + 1] == '(':
-                    paren_count = 1
-                    end = root_index + 2
-                    while paren_count > 0:
-                        if expression[end] == '(':
-                            paren_count += 1
-                        elif expression[end] == ')':
-                            paren_count -= 1
-                        end += 1
-                    root_expr = expression[root_index + 2:end - 1]
-                    expression = (expression[:root_index] +
-                                  f"math.pow({root_expr}, 1/{root_degree})" +
-                                  expression[end:])
-                else:
-                    end = root_index + 1
-                    while end < len(expression) and (expression[end].isdigit() or expression[end] == '.'):
-                        end += 1
-                    root_expr = expression[root_index + 1:end]
-                    expression = (expression[:root_index] +
-                                  f"math.pow({root_expr}, 1/{root_degree})" +
-                                  expression[end:])
-
-            # Handle absolute value
-            while '|' in expression:
-                start = expression.index('|')
-                end = expression.index('|', start + 1)
-                abs_expr = expression[start + 1:end]
-                expression = expression[:start] + f"abs({abs_expr})" + expression[end + 1:]
-
-            # Replace other custom functions
-            expression = expression.replace("mod", "%")
-
-            # Safe built-in functions that can be used in eval
-            safe_dict = {
-                "math": math,
-                "abs": abs,
-                "factorial": math.factorial,
-            }
-
-            # Evaluate the expression
-            result = eval(expression, safe_dict)
-            self.currentExpression = str(result)
+            # Evaluate the expression with the compiled expression engine
+            result = evaluate(self.currentExpression)
+            if isinstance(result, int) and abs(result) >= 10 ** 30:
+                self.currentExpression = scientific_text(result)
+                scientific = True
+            else:
+                self.currentExpression = str(result)
 
         except ZeroDivisionError:
             self.error("Cannot divide by zero")
@@ -370,7 +415,7 @@ class PhotomathMode(QWidget):
         except Exception as e:
             self.error(str(e))
 
-        if isinstance(self.currentExpression, str) and self.currentExpression.endswith('0'):
+        if isinstance(self.currentExpression, str) and self.currentExpression.endswith('0') and not scientific:
             try:
                 # Convert the result to an integer if it's a whole number
                 value = float(self.currentExpression)
@@ -387,6 +432,7 @@ class PhotomathMode(QWidget):
         self.currentInput.setText(self.currentExpression)
         self.currentInput.setCursorPosition(0)
         self.evaluated = True
+        self.update_preview()
 
     def show_brackets(self, bracket):
         """
@@ -411,3 +457,4 @@ class PhotomathMode(QWidget):
         # Update display
         self.update_current_input()
         self.currentInput.setText(self.currentExpression)
+        self.update_preview()
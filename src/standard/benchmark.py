@@ -0,0 +1,85 @@
+"""
+@file benchmark.py
+@brief File containing benchmarks of the math engines against the original implementations.
+
+Run from the src directory: python -m standard.benchmark
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import timeit
+
+from standard import mathlib
+
+POW_CASES = [
+    (2, 10),
+    (1.5, 300),
+    (7, 118),
+    (-3, 211),
+    (9, 99999),
+    (9, 9999999),
+]
+
+
+def legacy_pow(base, exponent):
+    """
+    @brief The original mathlib.pow, which computes the full power before checking for overflow.
+    """
+    if not isinstance(exponent, int) or exponent < 0:
+        raise TypeError("Exponent must be a natural number.")
+
+    if base == 0 and exponent == 0:
+        raise ValueError("0^0 is undefined.")
+
+    result = base ** exponent
+
+    if result >= 1e100:
+        return float('inf')
+    else:
+        return round(result, mathlib.MAX_PRECISION)
+
+
+def measure(func, *args):
+    """
+    @brief Measures the average duration of one call.
+    @return Seconds per call.
+    """
+    timer = timeit.Timer(lambda: func(*args))
+    number, total = timer.autorange()
+    return total / number
+
+
+def format_duration(seconds):
+    """
+    @brief Formats a duration with a readable unit.
+    """
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def benchmark_pow():
+    """
+    @brief Compares mathlib.pow with the original implementation and prints the results.
+    """
+    print(f"{'case':>14} {'legacy':>12} {'mathlib':>12} {'speedup':>10}")
+    for base, exponent in POW_CASES:
+        try:
+            legacy = measure(legacy_pow, base, exponent)
+        except OverflowError:
+            legacy = None
+        current = measure(mathlib.pow, base, exponent)
+
+        case = f"{base}^{exponent}"
+        if legacy is None:
+            print(f"{case:>14} {'overflow':>12} {format_duration(current):>12} {'-':>10}")
+        else:
+            print(f"{case:>14} {format_duration(legacy):>12} {format_duration(current):>12} "
+                  f"{legacy / current:>9.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark_pow()
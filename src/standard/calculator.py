@@ -11,11 +11,10 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from decimal import getcontext, Decimal
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton, QHBoxLayout
 from PySide6.QtGui import QFont, QKeySequence, QShortcut, QIcon
 from PySide6.QtCore import Qt, QSize
-from standard import mathlib
+from standard.standard_engine import StandardEngine
 from currency.currency_converter import CurrencyConverter
 from day.date_calculation import DateCalculation
 from help.help_menu import HelpWindow
@@ -54,7 +53,6 @@ class App(QWidget):
         self.help_menu_button = None
         self.mode_menu_button = None
         self.non_essential_widget = None
-        self.equals_pressed = False
         self.help_window = None
         self.buttonFrameLayout = None
         self.buttonLayout = None
@@ -70,9 +68,8 @@ class App(QWidget):
         self.setWindowTitle("Calcu-lajda")
         self.setFixedSize(400, 405)
 
-        self.totalExpression = self.displayFrame.totalExpression
-        self.currentExpression = self.displayFrame.currentExpression
-        self.evaluated = False
+        # Expressions and calculation logic live in the Qt-free engine, this widget only renders it
+        self.engine = StandardEngine()
 
         # Digit button positions
         self.digits = {
@@ -188,517 +185,92 @@ class App(QWidget):
             self.sidebar.visibility_changed.emit(True)
             self.setFixedWidth(640)
 
-    def error(self, message):
+    def render_state(self, state):
         """
-        @brief Displays an error message on the calculator's display.
-        @param message The error message to display.
+        @brief Shows a display snapshot of the engine on the labels.
+        @param state: DisplayState returned by the engine.
         """
-        self.totalExpression = ""
-        self.update_total_label()
-        self.currentExpression = "Error: " + message
-        self.currentLabel.setText(self.currentExpression)
-        self.update_current_label()
-
-    def show_numbers(self, digit):
-        """
-        @brief Updates the current expression when a digit is pressed.
-        @param digit: The digit to add to the current expression.
-        """
-        if (self.currentExpression.startswith("0") and not self.currentExpression.startswith("0.")
-                and '^' not in self.currentExpression and '√' not in self.currentExpression):
-            self.currentExpression = self.currentExpression[1:]
-        if 'Error' in self.currentExpression or 'inf' in self.currentExpression:
-            self.currentExpression = str(digit)
-        elif self.evaluated:
-            self.currentExpression = ''
-            self.currentExpression += str(digit)
-            self.evaluated = False
-        else:
-            self.currentExpression += str(digit)
-        self.update_current_label()
-
-    def show_operators(self, operator):
-        """
-        @brief Appends the provided operator to the current expression and updates the labels.
-        @param operator: The operator to append to the current expression.
-        """
-        self.update_current_label()
-
-        if '.' in self.currentExpression and not self.currentExpression[-1].isdigit():
-            self.currentExpression = self.currentExpression[:-1]
-
-        if '.' in self.currentExpression:
-            if all(char == '0' for char in self.currentExpression[self.currentExpression.index('.') + 1:]):
-                rounded_num = round(float(self.currentExpression))
-                self.currentExpression = str(rounded_num)
-
-        if 'Error' in self.currentExpression or 'inf' in self.currentExpression:
-            if operator == '-':
-                self.currentLabel.setFont(QFont("Arial", 50))
-                self.currentLabel.setContentsMargins(0, 20, 0, 20)
-                self.currentExpression = operator
-                self.update_current_label()
-                return
-            else:
-                return
-
-        if self.currentExpression.endswith('e+') or self.currentExpression.endswith('e-'):
-            self.currentExpression += '0'
-
-        if self.currentExpression == '0':
-            if operator == '-':
-                self.currentExpression = operator
-            elif not self.totalExpression:
-                self.totalExpression = self.currentExpression + operator
-        self.update_current_label()
-
-        if '-' in self.currentExpression and not self.currentExpression[-1].isdigit():
-            return
-
-        if '√' in self.currentExpression and not self.currentExpression[-1].isdigit():
-            if operator == '-':
-                self.currentExpression += operator
-                self.update_current_label()
-                return
-            else:
-                self.currentExpression += '0'
-
-        if '^' in self.currentExpression and not self.currentExpression[-1].isdigit():
-            if operator == '-':
-                self.currentExpression += operator
-                self.update_current_label()
-                return
-            else:
-                self.currentExpression += '0'
-
-        if self.totalExpression and self.totalExpression[-1] in "+-*/%" and self.currentExpression == '0' and len(
-                self.totalExpression) != 0:
-            if operator == '-' and self.totalExpression[-1] in "+-*/%":
-                self.currentExpression = operator
-            else:
-                self.totalExpression = self.totalExpression[:-1] + operator
-        else:
-            if self.currentLabel.text() != '0':
-                self.totalExpression += self.currentExpression + operator
-
-        self.evaluated = False
-        self.currentExpression = ''
-        self.update_total_label()
-        self.update_current_label()
-
-        if self.signal():
-            self.evaluate()
-        else:
-            pass
-
-    def update_current_label(self):
-        """
-        @brief Updates the current expression label by truncating if necessary.
-        """
-        if 'Error' in self.currentExpression:
-            if len(self.currentExpression) > 80:
-                self.currentExpression = self.currentExpression[:80]
+        if state.error:
             self.currentLabel.setFont(QFont("Arial", 11))
             self.currentLabel.setAlignment(Qt.AlignCenter)
         else:
             self.currentLabel.setFont(QFont("Arial", 32))
             self.currentLabel.setAlignment(Qt.AlignRight)
+        self.currentLabel.setText(state.current)
+        self.totalLabel.setText(state.total)
 
-            if len(self.currentExpression) > 16:
-                self.currentExpression = self.currentExpression[:16]
+    def press(self, key):
+        """
+        @brief Passes a key press to the engine and renders the resulting display.
+        @param key: Key accepted by StandardEngine.press.
+        """
+        self.render_state(self.engine.press(key))
 
-        if not self.currentExpression or self.currentExpression == "0":
-            self.currentLabel.setText("0")
-            self.currentExpression = '0'
-        else:
-            self.currentLabel.setText(self.currentExpression)
-
-    def update_total_label(self):
-        """
-        @brief Updates the total expression label with formatted operators.
-        """
-        expression = self.totalExpression
-
-        for operator, symbol in self.operations.items():
-            expression = expression.replace(operator, f'{symbol}')
-        self.totalLabel.setText(expression[:30])
-
-    def parse_exponentiation(self):
-        """
-        @brief Parses the current expression for exponentiation operation (x^y).
-        @param self: Instance of the class.
-        @return: Result of the exponentiation operation if successful, None otherwise.
-        """
-        result = None
-        if '^' in self.currentExpression and not self.totalExpression:
-            expCurrLeft = self.currentExpression.split('^')[0]
-            expCurrRight = self.currentExpression.split('^')[1]
-            if '.' in expCurrRight or int(expCurrRight) < 0:
-                self.error("Exponent must be a non-negative integer")
-                return None
-            if expCurrLeft == '0' and expCurrRight == '0':
-                self.error("0^0 is undefined")
-                return None
-            if '.' not in expCurrLeft:
-                result = str(mathlib.pow(int(expCurrLeft), int(expCurrRight)))
-            else:
-                result = str(mathlib.pow(float(expCurrLeft), int(expCurrRight)))
-
-            if len(result) > 16:
-                result = "{:.5e}".format(float(result))
-        return result
-
-    def parse_root(self):
-        """
-        @brief Parses the current expression for root operation (√x).
-        @param self: Instance of the class.
-        @return: Result of the root operation if successful, None otherwise.
-        """
-        result = None
-        if '√' in self.currentExpression and not self.totalExpression:
-            rootCurrLeft = self.currentExpression.split('√')[0]
-            rootCurrRight = self.currentExpression.split('√')[1]
-            if '.' in rootCurrLeft or int(rootCurrLeft) < 0 or int(rootCurrLeft) == 0:
-                return None
-            if float(rootCurrRight) < 0:
-                return None
-            result_float = mathlib.root(float(rootCurrRight), int(rootCurrLeft))
-
-            epsilon = 1e-10
-            if abs(result_float - round(result_float)) < epsilon:
-                result = str(int(round(result_float)))
-            else:
-                result = f"{result_float:.10f}".rstrip('0').rstrip('.')
-
-            if len(result) > 16:
-                result = f"{float(result):.5e}"
-
-        return result
+    def show_numbers(self, digit):
+        """
+        @brief Handles a digit button press.
+        @param digit: The pressed digit.
+        """
+        self.press(str(digit))
+
+    def show_operators(self, operator):
+        """
+        @brief Handles an operator button press.
+        @param operator: The pressed operator.
+        """
+        self.press(operator)
 
     def handle_clear(self):
         """
         @brief Clears the current expression and total expression, resetting the calculator.
         """
-        self.currentExpression = "0"
-        self.totalExpression = ""
-        self.update_total_label()
-        self.update_current_label()
+        self.press("C")
 
     def handle_delete(self):
         """
-        @brief Deletes the last character in the current expression or resets it if empty.
+        @brief Deletes the last character in the current expression.
         """
-        if 'Error' not in self.currentExpression and 'inf' not in self.currentExpression:
-            if self.currentExpression:
-                self.currentExpression = self.currentExpression[:-1]
-                self.update_current_label()
-
-        if len(self.currentExpression) == 0:
-            self.currentExpression = "0"
-            self.update_current_label()
+        self.press("⌫")
 
     def handle_exponentiation(self):
         """
-        @brief Appends the exponentiation operator (^) to the current expression if valid.
+        @brief Appends the exponentiation operator (^) to the current expression.
         """
-        if ('^' not in self.currentExpression and '√' not in self.currentExpression
-                and self.currentExpression[-1] != '.' and self.currentExpression[-1] != '-'
-                and 'Error' not in self.currentExpression and 'inf' not in self.currentExpression):
-            self.currentExpression += '^'
-            self.update_current_label()
+        self.press("^")
 
     def handle_root(self):
         """
-        @brief Appends the root operator (√) to the current expression if valid.
+        @brief Appends the root operator (√) to the current expression.
         """
-        if ('√' not in self.currentExpression and '^' not in self.currentExpression
-                and self.currentExpression[-1] != '.' and self.currentExpression[-1] != '-'
-                and 'Error' not in self.currentExpression and 'inf' not in self.currentExpression):
-            self.currentExpression += '√'
-        self.update_current_label()
+        self.press("√")
 
     def handle_factorial(self):
         """
-        @brief Calculates the factorial of the current expression if valid and updates it.
-        """
-        if self.totalExpression:
-            self.error("The total expression is not empty. Clear it first!")
-            return
-
-        functions_to_parse = [self.parse_exponentiation, self.parse_root]
-
-        for func in functions_to_parse:
-            result = func()
-            if result is not None:
-                if '.' in result or int(result) < 0:
-                    self.error("Factorial is only defined for non-negative integers")
-                    return
-                elif int(result) > 100:
-                    self.error("Factorial of numbers greater than 100 is too large")
-                    return
-                else:
-                    result = mathlib.fac(int(result))
-                if result.is_integer():
-                    result = int(result)
-                self.currentExpression = str(result)
-                self.update_current_label()
-                return
-
-        if '.' in self.currentExpression or int(self.currentExpression) < 0:
-            self.error("Factorial is only defined for non-negative integers")
-            return
-        elif int(self.currentExpression) > 100:
-            self.error("Factorial of numbers greater than 100 is too large")
-            return
-        else:
-            result = mathlib.fac(int(self.currentExpression))
-
-        if len(str(result)) > 16:
-            result = "{:.5e}".format(result)
-        else:
-            result = int(result)
-        self.currentExpression = str(result)
-        self.update_current_label()
+        @brief Calculates the factorial of the current expression.
+        """
+        self.press("!")
 
     def handle_absolute_value(self):
         """
-        @brief Calculates the absolute value of the current expression if valid and updates it.
-        """
-        if self.totalExpression:
-            self.error("The total expression is not empty. Clear it first!")
-            return
-
-        if not self.totalExpression:
-            functions_to_parse = [self.parse_exponentiation, self.parse_root]
-            for func in functions_to_parse:
-                result = func()
-                if result is not None:
-                    if '.' in result:
-                        result = mathlib.abs(float(result))
-                    else:
-                        result = mathlib.abs(int(result))
-                    self.currentExpression = str(result)
-                    self.update_current_label()
-                    return
-
-        if '.' in self.currentExpression:
-            result = mathlib.abs(float(self.currentExpression))
-        else:
-            result = mathlib.abs(int(self.currentExpression))
-
-        self.currentExpression = str(result)
-        self.update_current_label()
+        @brief Calculates the absolute value of the current expression.
+        """
+        self.press("|x|")
 
     def handle_modulo(self):
         """
         @brief Appends the modulo operator (%) to the current expression.
         """
-        self.show_operators('%')
+        self.press("%")
 
     def handle_decimal_point(self):
         """
-        @brief Appends a decimal point to the current expression if valid.
-        """
-        if 'Error' not in self.currentExpression and 'inf' not in self.currentExpression:
-            if not self.currentExpression or self.currentExpression[-1] != '-':
-                if not self.currentExpression:
-                    self.currentExpression += '0.'
-                elif '.' not in self.currentExpression:
-                    self.currentExpression += '.'
-        self.update_current_label()
-
-    def parsing(self):
-        """
-        @brief Parses the total expression into its components.
+        @brief Appends a decimal point to the current expression.
         """
-        operators = {'+', '-', '*', '/', '%'}
-
-        lastOperator = self.totalExpression[-1] if self.totalExpression else ""
-        expression = self.totalExpression[:-1] if lastOperator in operators else self.totalExpression
-
-        for i in range(len(expression) - 1, -1, -1):
-            if expression[i] in operators and not (
-                    (expression[i] == '-' and (i == 0 or expression[i - 1] in operators)) or
-                    (i > 0 and expression[i - 1].lower() == 'e')
-            ):
-                return expression[:i], expression[i], expression[i + 1:], lastOperator
-
-        return expression, "", "", lastOperator
+        self.press(".")
 
     def evaluate(self, equals_button=False):
         """
-        @brief Evaluates the expression by parsing and calculating the result.
-        @param equals_button bool True if called from equals button, False otherwise.
-        @return bool True if the evaluation was successful, False otherwise.
-        """
-        self.equals_pressed = equals_button
-
-        if '^' in self.currentExpression or '√' in self.currentExpression:
-            result = self.process_special_operations(self.currentExpression)
-            if result is not None:
-                self.update_result(float(result), "")
-                return True
-
-        leftSide, operator, rightSide, lastOperator = self.parsing()
-
-        if not operator and not rightSide:
-            rightSide = self.currentExpression
-            operator = lastOperator
-
-        leftSide = self.process_special_operations(leftSide)
-        rightSide = self.process_special_operations(rightSide)
-
-        try:
-            leftValue = float(leftSide)
-            rightValue = float(rightSide)
-        except ValueError:
-            self.error("Invalid number format")
-            return False
-
-        result = self.perform_operation(leftValue, rightValue, operator)
-        if result is None:
-            return False
-
-        self.update_result(result, lastOperator)
-        return True
-
-    def process_special_operations(self, value):
-        """
-        @brief Processes exponentiation and root operations.
-        @param value str The string representation of the value to process.
-        @return str The processed value as a string, or None if an error occurred.
-        """
-        if '^' in value:
-            base, exponent = value.split('^')
-            return self.calculate_power(float(base), int(exponent))
-        elif '√' in value:
-            parts = value.split('√')
-            if len(parts) == 2:
-                index, radicand = parts
-                if index:
-                    return self.calculate_root(float(radicand), int(index))
-                else:
-                    return self.calculate_root(float(radicand), 2)
-            else:
-                self.error("Invalid root format")
-                return None
-        return value
-
-    def calculate_power(self, base, exponent):
-        """
-        @brief Calculates the power of a number.
-        @param base float The base number.
-        @param exponent int The exponent.
-        @return str The result as a string, or None if an error occurred.
-        """
-        if exponent < 0 or '.' in str(exponent):
-            self.error("Exponent must be a non-negative integer")
-            return None
-        if base == 0 and exponent == 0:
-            self.error("0^0 is undefined")
-            return None
-        return str(mathlib.pow(base, exponent))
-
-    def calculate_root(self, radicand, index):
-        """
-        @brief Calculates the nth root of a number.
-        @param radicand float The number under the root.
-        @param index int The root index.
-        @return str The result as a string, or None if an error occurred.
-        """
-        if index <= 0 or '.' in str(index):
-            self.error("Root index must be a positive integer")
-            return None
-        if radicand < 0:
-            self.error("Cannot take the root of a negative number")
-            return None
-        result = mathlib.root(radicand, index)
-        if abs(result - round(result)) < 1e-5:
-            return str(round(result, 5))
-        else:
-            return str(result)
-
-    def perform_operation(self, left, right, operator):
-        """
-        @brief Performs the specified arithmetic operation.
-        @param left float The left operand.
-        @param right float The right operand.
-        @param operator str The arithmetic operator.
-        @return float The result of the operation, or None if an error occurred.
-        """
-        getcontext().prec = 28
-        left = Decimal(left)
-        right = Decimal(right)
-
-        if operator == '+':
-            return float(left + right)
-        elif operator == '-':
-            return float(left - right)
-        elif operator == '*':
-            return float(left * right)
-        elif operator == '/':
-            if right == 0:
-                self.error("Cannot divide by zero")
-                return None
-            return float(left / right)
-        elif operator == '%':
-            if right == 0:
-                self.error("Cannot perform modulo operation with zero")
-                return None
-            return float(left % right)
-        else:
-            self.error("Invalid operator")
-            return None
-
-    def update_result(self, result, lastOperator):
-        """
-        @brief Updates the current and total expressions with the calculated result.
-        @param result float The calculated result.
-        @param lastOperator str The last operator used in the calculation.
-        """
-        if -1e16 < result < 1e16:
-            if abs(result - round(result)) < 1e-10:
-                resultStr = str(int(round(result)))
-            else:
-                resultStr = str(result)
-
-            if len(resultStr) > 16:
-                if '.' in resultStr:
-                    integer_part = len(str(int(float(resultStr))))
-                    result = round(result, 16 - integer_part)
-                else:
-                    result = round(result)
-                resultStr = str(result)
-        else:
-            resultStr = "{:.10e}".format(result)
-
-        self.currentExpression = resultStr
-        if self.equals_pressed:
-            self.totalExpression = ""
-        else:
-            self.totalExpression = resultStr + lastOperator
-        self.update_current_label()
-        self.update_total_label()
-        self.evaluated = True
-
-    def signal(self):
-        """
-        @brief Handles signal when the total expression has two operators.
-        @param self: Instance of the class.
-        @return: True if the total expression has exactly two operators, False otherwise.
-        """
-        # Check if totalExpression is not empty and has at least two characters
-        if self.totalExpression and len(self.totalExpression) >= 2:
-            operators = ['+', '-', '*', '/', '%']
-            operatorCount = 0
-            for i, char in enumerate(self.totalExpression):
-                if char in operators and i != 0 and self.totalExpression[i - 1] not in ['^', '√']:
-                    # Skip the operator if it's a minus sign and the character before it is a digit or another operator
-                    if char == '-' and self.totalExpression[i - 1] in operators:
-                        continue
-                    # Skip if the previous character is 'e'
-                    if self.totalExpression[i - 1] == 'e':
-                        continue
-                    operatorCount += 1
-            return operatorCount == 2
-        return False
+        @brief Handles the equals button press by evaluating the expression.
+        @param equals_button bool Kept for the button connections, the equals key always clears the total.
+        """
+        self.press("=")
@@ -0,0 +1,218 @@
+"""
+@file factorial.py
+@brief File containing the factorial engine shared by the calculator modes.
+
+Exact factorials come from a precomputed table for small numbers and from binary splitting
+for large ones, with an LRU memo for repeated values. For numbers whose factorial is too long
+to display, the Stirling series gives the leading digits and the exponent without computing
+the factorial itself.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import math
+from decimal import Context, Decimal, ROUND_FLOOR, ROUND_HALF_EVEN
+from functools import lru_cache
+
+TABLE_SIZE = 128
+# Largest number whose factorial is computed exactly when only its text is needed
+EXACT_TEXT_LIMIT = 1000
+# Below this width the range product is multiplied sequentially
+SPLIT_THRESHOLD = 16
+# Digits kept beyond the requested ones when a long integer is cut down for scientific notation
+GUARD_DIGITS = 3
+
+PI = Decimal("3.14159265358979323846264338327950288419716939937510")
+
+
+def _build_table():
+    """
+    @brief Builds the table of exact factorials 0! .. (TABLE_SIZE - 1)!.
+    """
+    table = [1]
+    for i in range(1, TABLE_SIZE):
+        table.append(table[-1] * i)
+    return tuple(table)
+
+
+_TABLE = _build_table()
+
+
+def _check(num):
+    """
+    @brief Validates the argument of the factorial functions.
+    @exception TypeError: If number is not a natural number.
+    """
+    if not isinstance(num, int) or num < 0:
+        raise TypeError("Number must be a natural number.")
+
+
+def _range_product(low, high):
+    """
+    @brief Multiplies all integers from low to high (inclusive) by binary splitting.
+
+    Splitting keeps both operands of every multiplication about the same size, which lets the
+    big integer multiplication use its fast path instead of growing one huge number digit by digit.
+    """
+    if high - low < SPLIT_THRESHOLD:
+        result = low
+        for i in range(low + 1, high + 1):
+            result *= i
+        return result
+
+    middle = (low + high) // 2
+    return _range_product(low, middle) * _range_product(middle + 1, high)
+
+
+@lru_cache(maxsize=64)
+def _large_factorial(num):
+    """
+    @brief Computes the factorial of a number outside the table, memoized.
+    """
+    return _TABLE[TABLE_SIZE - 1] * _range_product(TABLE_SIZE, num)
+
+
+def factorial(num):
+    """
+    @brief Computes the exact factorial of a non-negative integer.
+
+    @param num: The non-negative integer.
+
+    @return The factorial as an int.
+
+    @exception TypeError: If number is not a natural number.
+    """
+    _check(num)
+
+    if num < TABLE_SIZE:
+        return _TABLE[num]
+
+    return _large_factorial(num)
+
+
+def _stirling_log10(num, context):
+    """
+    @brief Computes log10(num!) with the Stirling series in the given Decimal context.
+    """
+    n = Decimal(num)
+    ln_n = context.ln(n)
+
+    # ln(n!) = n ln n - n + ln(2 pi n) / 2 + 1/(12n) - 1/(360n^3) + 1/(1260n^5)
+    result = context.subtract(context.multiply(n, ln_n), n)
+    result = context.add(result, context.divide(context.ln(context.multiply(context.multiply(2, PI), n)), 2))
+    result = context.add(result, context.divide(1, context.multiply(12, n)))
+    result = context.subtract(result, context.divide(1, context.multiply(360, context.power(n, 3))))
+    result = context.add(result, context.divide(1, context.multiply(1260, context.power(n, 5))))
+
+    return context.divide(result, context.ln(Decimal(10)))
+
+
+def log10_factorial(num):
+    """
+    @brief Computes the decimal logarithm of num! without computing the factorial.
+
+    @param num: The non-negative integer.
+
+    @return log10(num!) as a Decimal.
+
+    @exception TypeError: If number is not a natural number.
+    """
+    _check(num)
+
+    context = Context(prec=len(str(num)) + 20)
+    if num < TABLE_SIZE:
+        return context.log10(Decimal(_TABLE[num]))
+
+    return _stirling_log10(num, context)
+
+
+def format_scientific(mantissa, exponent, digits):
+    """
+    @brief Formats a mantissa with 1 <= |mantissa| < 10 and an exponent like the "{:.Ne}" format does.
+    """
+    context = Context(prec=digits + 2)
+    step = Decimal(1).scaleb(-digits)
+
+    mantissa = mantissa.quantize(step, rounding=ROUND_HALF_EVEN, context=context)
+    if abs(mantissa) >= 10:
+        mantissa = Decimal(1).copy_sign(mantissa).quantize(step, context=context)
+        exponent += 1
+
+    sign = '-' if exponent < 0 else '+'
+    return f"{mantissa}e{sign}{abs(exponent):02d}"
+
+
+def scientific_text(value, digits=5):
+    """
+    @brief Formats an exact integer in scientific notation, rounded correctly.
+
+    @param value: The integer to format.
+    @param digits: Number of digits after the decimal point.
+
+    @return Text such as "2.43290e+18".
+    """
+    # Converting a long integer to Decimal takes quadratic time, so only its leading digits
+    # are kept; the exponent estimate from the bit length is never above the real one
+    magnitude = abs(value)
+    shift = int((magnitude.bit_length() - 1) * math.log10(2)) - digits - GUARD_DIGITS
+    if shift > 0:
+        leading, rest = divmod(magnitude, 10 ** shift)
+        # A trailing 1 stands for the dropped digits, so a tie is still rounded correctly
+        magnitude = leading * 10 + (rest != 0)
+        shift -= 1
+    else:
+        shift = 0
+
+    value = Decimal(-magnitude if value < 0 else magnitude).scaleb(shift)
+    exponent = value.adjusted()
+    mantissa = value.scaleb(-exponent, context=Context(prec=exponent + 1))
+    return format_scientific(mantissa, exponent, digits)
+
+
+def factorial_scientific(num, digits=5):
+    """
+    @brief Returns num! in scientific notation.
+
+    Small factorials are rounded from the exact value. Above EXACT_TEXT_LIMIT the mantissa and
+    exponent come from the Stirling series, so the factorial itself is never computed.
+
+    @param num: The non-negative integer.
+    @param digits: Number of digits after the decimal point.
+
+    @return Text such as "2.84626e+35659".
+
+    @exception TypeError: If number is not a natural number.
+    """
+    _check(num)
+
+    if num <= EXACT_TEXT_LIMIT:
+        return scientific_text(factorial(num), digits)
+
+    context = Context(prec=len(str(num)) + digits + 20)
+    log10 = _stirling_log10(num, context)
+    exponent = int(log10.to_integral_value(rounding=ROUND_FLOOR))
+    mantissa = context.power(10, context.subtract(log10, exponent))
+    return format_scientific(mantissa, exponent, digits)
+
+
+def factorial_text(num, max_length=16, digits=5):
+    """
+    @brief Returns num! as display text.
+
+    @param num: The non-negative integer.
+    @param max_length: Longest exact result shown in full.
+    @param digits: Number of digits after the decimal point in scientific notation.
+
+    @return All digits of num! if they fit into max_length characters, scientific notation otherwise.
+
+    @exception TypeError: If number is not a natural number.
+    """
+    _check(num)
+
+    if num < TABLE_SIZE:
+        text = str(_TABLE[num])
+        if len(text) <= max_length:
+            return text
+
+    return factorial_scientific(num, digits)
@@ -8,52 +8,61 @@
 @date April 11, 2024
 """
 
-MAX_PRECISION = 14
-TOLERANCE = 1e-10
+from standard.mathlib_backend import (MAX_PRECISION, TOLERANCE, FloatBackend, DecimalBackend, FractionBackend,
+                                      get_backend, set_backend, reset_backend, use_backend, resolve_backend)
+from standard.factorial import factorial
+from standard.power import power
 
 
-def add(num1, num2):
+def add(num1, num2, backend=None):
     """
     @brief Function to add two numbers.
 
     @param num1: First number.
     @param num2: Second number.
+    @param backend: Numeric backend, the session backend if None.
 
     @return Sum of numbers num1 and num2.
     """
-    return round(num1 + num2, MAX_PRECISION)
+    backend = resolve_backend(backend)
+    return backend.finish(backend.add(backend.convert(num1), backend.convert(num2)))
 
 
-def sub(num1, num2):
+def sub(num1, num2, backend=None):
     """
     @brief Function to subtract two numbers.
 
     @param num1: First number.
     @param num2: Second number.
+    @param backend: Numeric backend, the session backend if None.
 
     @return Difference of numbers num1 and num2 (num1 - num2).
     """
-    return round(num1 - num2, MAX_PRECISION)
+    backend = resolve_backend(backend)
+    return backend.finish(backend.sub(backend.convert(num1), backend.convert(num2)))
 
 
-def mul(num1, num2):
+def mul(num1, num2, backend=None):
     """
     @brief Function to multiply two numbers.
 
     @param num1: First number.
     @param num2: Second number.
+    @param backend: Numeric backend, the session backend if None.
 
     @return Product of num1 and num2 (num1 * num2).
     """
-    return round(num1 * num2, MAX_PRECISION)
+    backend = resolve_backend(backend)
+    return backend.finish(backend.mul(backend.convert(num1), backend.convert(num2)))
 
 
-def div(dividend, divisor):
+def div(dividend, divisor, backend=None):
     """
     @brief Function to divide two numbers.
 
     @param dividend: The number to be divided (numerator).
     @param divisor: The number by which the dividend is divided (denominator).
+    @param backend: Numeric backend, the session backend if None.
 
     @return The quotient of dividend divided by divisor.
 
@@ -62,15 +71,17 @@ def div(dividend, divisor):
     if divisor == 0:
         raise ZeroDivisionError
 
-    return round(dividend / divisor, MAX_PRECISION)
+    backend = resolve_backend(backend)
+    return backend.finish(backend.div(backend.convert(dividend), backend.convert(divisor)))
 
 
-def mod(dividend, divisor):
+def mod(dividend, divisor, backend=None):
     """
     @brief Function to compute the modulo operation.
 
     @param dividend: The number to be divided.
     @param divisor: The number by which the dividend is divided.
+    @param backend: Numeric backend, the session backend if None.
 
     @return The remainder after dividing dividend by divisor.
 
@@ -79,15 +90,19 @@ def mod(dividend, divisor):
     if divisor == 0:
         raise ZeroDivisionError
 
-    remainder = abs(dividend) % abs(divisor)
+    backend = resolve_backend(backend)
+    dividend = backend.convert(dividend)
+    divisor = backend.convert(divisor)
+
+    remainder = backend.mod(abs(dividend), abs(divisor))
 
     if divisor < 0:
         remainder = -remainder
 
-    if abs(divisor - remainder) < TOLERANCE:
+    if backend.tolerance is not None and abs(backend.sub(divisor, remainder)) < backend.tolerance:
         return 0
 
-    return round(remainder, MAX_PRECISION)
+    return backend.finish(remainder)
 
 
 def abs(num):
@@ -104,39 +119,27 @@ def abs(num):
         return num
 
 
-def fac(num):
+def fac(num, backend=None):
     """
     @brief Function to compute the factorial of a non-negative integer.
 
     @param num: The non-negative integer.
+    @param backend: Numeric backend, the session backend if None.
 
-    @return The factorial of the input integer.
+    @return The factorial of the input integer, an exact int with the float backend.
 
     @exception ValueError: If number is not a natural number.
-    @exception ValueError: If number is bigger than 100.
     """
-    if not isinstance(num, int) or num < 0:
-        raise TypeError("Number must be a natural number.")
-
-    if num > 100:
-        raise ValueError("Factorial computation is limited to numbers up to 100.")
-
-    if num == 0:
-        return 1
-
-    result = 1
-    for i in range(1, num + 1):
-        result *= i
+    return resolve_backend(backend).from_int(factorial(num))
 
-    return float(result)
 
-
-def pow(base, exponent):
+def pow(base, exponent, backend=None):
     """
     @brief Function to compute the power of a number.
 
     @param base: The base number.
     @param exponent: The exponent.
+    @param backend: Numeric backend, the session backend if None.
 
     @return The result of raising base to the power of exponent.
 
@@ -149,22 +152,29 @@ def pow(base, exponent):
     if base == 0 and exponent == 0:
         raise ValueError("0^0 is undefined.")
 
-    result = base ** exponent
+    backend = resolve_backend(backend)
+    base = backend.convert(base)
+
+    if backend.overflow is None:
+        return backend.finish(backend.pow(base, exponent))
 
-    if result >= 1e100:
-        return float('inf')
+    result = power(base, exponent, backend.overflow)
+
+    if result in (float('inf'), float('-inf')):
+        return result
     else:
-        return round(result, MAX_PRECISION)
+        return backend.finish(result)
 
 
-def root(base, index):
+def root(base, index, backend=None):
     """
     @brief Function to compute the nth root of a base using Newton's method.
 
     @param base: The base whose root is to be calculated.
     @param index: The root to be calculated (e.g., 2 for square root).
+    @param backend: Numeric backend, the session backend if None.
 
-    @return Nth root of the given base.
+    @return Nth root of the given base, an exact int if an integer base is a perfect power.
 
     @exception ValueError: If index is not a natural base.
     @exception ValueError: If index is not divisible by 2 and base is negative.
@@ -181,7 +191,25 @@ def root(base, index):
     if base == 0:
         return 0
 
+    backend = resolve_backend(backend)
+    base = backend.convert(base)
+
     if base < 0:
-        return round(-((-base) ** (1 / index)), MAX_PRECISION)
+        return backend.finish(-backend.root(-base, index))
+
+    return backend.finish(backend.root(base, index))
+
+
+def __getattr__(name):
+    """
+    @brief Lazily exposes the NumPy batch layer as mathlib.batch.
+
+    @param name: Name of the requested module attribute.
+
+    @return The standard.mathlib_batch module for "batch".
+    """
+    if name == "batch":
+        from standard import mathlib_batch
+        return mathlib_batch
 
-    return round(base ** (1 / index), MAX_PRECISION)
\ No newline at end of file
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
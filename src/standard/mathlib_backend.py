@@ -0,0 +1,240 @@
+"""
+@file mathlib_backend.py
+@brief File containing numeric backends for the math library.
+
+A backend decides which number type mathlib computes in (float, Decimal or Fraction)
+and how results are rounded. The Decimal backend owns its own context, so choosing a
+precision never touches the decimal context of the calling thread or of any other thread.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import contextvars
+from contextlib import contextmanager
+from decimal import Context, Decimal
+from fractions import Fraction
+
+from standard.roots import nth_root
+
+MAX_PRECISION = 14
+TOLERANCE = 1e-10
+POW_OVERFLOW = 1e100
+
+
+class FloatBackend:
+    """
+    @brief Binary float backend, the original behaviour of mathlib.
+
+    Values are used as they are given, results are rounded to MAX_PRECISION decimal places.
+    Factorials stay exact ints.
+    """
+    name = "float"
+    tolerance = TOLERANCE
+    overflow = POW_OVERFLOW
+
+    def convert(self, value):
+        return value
+
+    def from_int(self, value):
+        return value
+
+    def finish(self, value):
+        return round(value, MAX_PRECISION)
+
+    def add(self, num1, num2):
+        return num1 + num2
+
+    def sub(self, num1, num2):
+        return num1 - num2
+
+    def mul(self, num1, num2):
+        return num1 * num2
+
+    def div(self, dividend, divisor):
+        return dividend / divisor
+
+    def mod(self, dividend, divisor):
+        return dividend % divisor
+
+    def pow(self, base, exponent):
+        return base ** exponent
+
+    def root(self, base, index):
+        return nth_root(base, index)
+
+
+class DecimalBackend:
+    """
+    @brief Decimal backend with a selectable number of significant digits.
+
+    Every operation is a single call on the backend's own decimal.Context.
+    """
+    name = "decimal"
+    tolerance = None
+    overflow = None
+
+    def __init__(self, precision=28):
+        """
+        @brief Initializes the backend.
+        @param precision: Number of significant digits kept by every operation.
+        """
+        self.precision = precision
+        self.context = Context(prec=precision)
+
+    def convert(self, value):
+        """
+        @brief Converts a value to a Decimal rounded to the backend precision.
+
+        Floats are converted through their shortest representation, so 0.1 becomes Decimal('0.1')
+        and not the exact binary value.
+        """
+        if isinstance(value, Decimal):
+            return self.context.plus(value)
+        if isinstance(value, float):
+            value = repr(value)
+        elif isinstance(value, Fraction):
+            return self.context.divide(Decimal(value.numerator), Decimal(value.denominator))
+        return self.context.create_decimal(value)
+
+    def from_int(self, value):
+        return self.context.create_decimal(value)
+
+    def finish(self, value):
+        return self.context.plus(value)
+
+    def add(self, num1, num2):
+        return self.context.add(num1, num2)
+
+    def sub(self, num1, num2):
+        return self.context.subtract(num1, num2)
+
+    def mul(self, num1, num2):
+        return self.context.multiply(num1, num2)
+
+    def div(self, dividend, divisor):
+        return self.context.divide(dividend, divisor)
+
+    def mod(self, dividend, divisor):
+        return self.context.remainder(dividend, divisor)
+
+    def pow(self, base, exponent):
+        return self.context.power(base, exponent)
+
+    def root(self, base, index):
+        return nth_root(base, index, self.precision)
+
+
+class FractionBackend:
+    """
+    @brief Exact rational backend.
+
+    Results are never rounded. Roots that are not rational are correctly rounded floats.
+    """
+    name = "fraction"
+    tolerance = None
+    overflow = None
+
+    def convert(self, value):
+        """
+        @brief Converts a value to a Fraction, floats through their shortest representation.
+        """
+        if isinstance(value, float):
+            value = repr(value)
+        return Fraction(value)
+
+    def from_int(self, value):
+        return Fraction(value)
+
+    def finish(self, value):
+        return value
+
+    def add(self, num1, num2):
+        return num1 + num2
+
+    def sub(self, num1, num2):
+        return num1 - num2
+
+    def mul(self, num1, num2):
+        return num1 * num2
+
+    def div(self, dividend, divisor):
+        return dividend / divisor
+
+    def mod(self, dividend, divisor):
+        return dividend % divisor
+
+    def pow(self, base, exponent):
+        return base ** exponent
+
+    def root(self, base, index):
+        return Fraction(nth_root(base, index))
+
+
+BACKENDS = {
+    "float": FloatBackend,
+    "decimal": DecimalBackend,
+    "fraction": FractionBackend,
+}
+
+FLOAT = FloatBackend()
+
+_current_backend = contextvars.ContextVar("mathlib_backend", default=FLOAT)
+
+
+def get_backend():
+    """
+    @brief Returns the backend of the current session (thread or task).
+    @return The active backend.
+    """
+    return _current_backend.get()
+
+
+def set_backend(backend):
+    """
+    @brief Sets the backend of the current session (thread or task).
+    @param backend: Backend instance or name ("float", "decimal", "fraction").
+    @return Token that can be passed to reset_backend.
+    """
+    return _current_backend.set(resolve_backend(backend))
+
+
+def reset_backend(token):
+    """
+    @brief Restores the backend that was active before set_backend.
+    @param token: Token returned by set_backend.
+    """
+    _current_backend.reset(token)
+
+
+@contextmanager
+def use_backend(backend):
+    """
+    @brief Context manager that activates a backend for the enclosed block.
+    @param backend: Backend instance or name ("float", "decimal", "fraction").
+    """
+    token = set_backend(backend)
+    try:
+        yield get_backend()
+    finally:
+        reset_backend(token)
+
+
+def resolve_backend(backend=None):
+    """
+    @brief Turns a backend argument into a backend instance.
+    @param backend: None for the session backend, a backend name or a backend instance.
+    @return The backend instance.
+
+    @exception ValueError: If the backend name is unknown.
+    """
+    if backend is None:
+        return _current_backend.get()
+
+    if isinstance(backend, str):
+        try:
+            return BACKENDS[backend]()
+        except KeyError:
+            raise ValueError(f"Unknown backend: {backend}") from None
+
+    return backend
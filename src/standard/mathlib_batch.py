@@ -0,0 +1,383 @@
+"""
+@file mathlib_batch.py
+@brief File containing vectorized (NumPy) versions of the math library functions.
+
+Every function takes array-like operands (scalars are broadcast) and returns a BatchResult.
+Results match the scalar functions in mathlib element by element, including the rounding
+to MAX_PRECISION decimal places, the TOLERANCE snap in mod and the overflow to inf in pow.
+The scalar fac returns exact ints, the batch fac returns them rounded to float64, which is
+inf from FACTORIAL_LIMIT + 1 upwards.
+Instead of raising, invalid elements are flagged in the result mask and their value is NaN.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from standard.mathlib import MAX_PRECISION, TOLERANCE
+from standard.mathlib import root as root_scalar
+
+# Error codes stored in BatchResult.errors
+OK = 0
+ZERO_DIVISION = 1
+VALUE_ERROR = 2
+TYPE_ERROR = 3
+OVERFLOW_ERROR = 4
+
+# Exception the scalar function would have raised for each error code
+ERROR_TYPES = {
+    ZERO_DIVISION: ZeroDivisionError,
+    VALUE_ERROR: ValueError,
+    TYPE_ERROR: TypeError,
+    OVERFLOW_ERROR: OverflowError,
+}
+
+POW_OVERFLOW = 1e100
+# Largest number whose factorial fits into a float
+FACTORIAL_LIMIT = 170
+
+_SCALE = 10.0 ** MAX_PRECISION
+# From this magnitude round(x, MAX_PRECISION) always returns x unchanged
+_ROUND_IDENTITY = 64.0
+# Dekker's splitting constant 2^27 + 1
+_SPLITTER = 134217729.0
+# Largest root index the vectorized root handles, larger ones use the scalar root
+ROOT_INDEX_LIMIT = 64
+# Closer than this (in units of the last place) to a rounding boundary the scalar root decides
+ROOT_ROUNDING_MARGIN = 1e-6
+# float(n!) for every n up to FACTORIAL_LIMIT
+_FACTORIALS = np.array([float(math.factorial(n)) for n in range(FACTORIAL_LIMIT + 1)])
+
+
+class BatchResult(namedtuple("BatchResult", ["values", "mask", "errors"])):
+    """
+    @brief Result of a batch operation.
+
+    values: float64 array of results, NaN where the element failed.
+    mask: bool array, True where the element failed.
+    errors: int8 array of error codes (OK, ZERO_DIVISION, VALUE_ERROR, TYPE_ERROR, OVERFLOW_ERROR).
+    """
+    __slots__ = ()
+
+    def raise_first(self):
+        """
+        @brief Raises the exception of the first failed element, like the scalar function would.
+        """
+        failed = np.flatnonzero(self.mask)
+        if failed.size:
+            raise ERROR_TYPES[int(self.errors.flat[failed[0]])]
+
+
+def _as_float(values):
+    """
+    @brief Converts an array-like operand to a float64 array.
+    """
+    return np.asarray(values, dtype=np.float64)
+
+
+def _split(values):
+    """
+    @brief Splits floats into high and low halves whose products are exact (Dekker).
+    """
+    scaled = _SPLITTER * values
+    high = scaled - (scaled - values)
+    return high, values - high
+
+
+def _two_product(left, right):
+    """
+    @brief Returns the rounded product and its exact rounding error.
+    """
+    product = left * right
+    left_high, left_low = _split(left)
+    right_high, right_low = _split(right)
+    error = ((left_high * right_high - product) + left_high * right_low + left_low * right_high) \
+        + left_low * right_low
+    return product, error
+
+
+def _round(values):
+    """
+    @brief Rounds every element to MAX_PRECISION decimal places exactly like the built-in round.
+
+    The product with 10^MAX_PRECISION is split into its rounded value and exact error, so the
+    nearest integer (ties to even) is chosen from the exact scaled value, and dividing it back
+    gives the same float as the correctly rounded built-in.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    small = np.abs(values) < _ROUND_IDENTITY
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled, error = _two_product(np.where(small, values, 0.0), _SCALE)
+        nearest = np.rint(scaled)
+        fraction = scaled - nearest
+        # A halfway scaled value is only a real tie if the product was exact
+        past_half = (np.abs(fraction) == 0.5) & (np.sign(error) == np.sign(fraction))
+        rounded = (nearest + np.where(past_half, 2 * fraction, 0.0)) / _SCALE
+
+    return np.where(small, rounded, values)
+
+
+def _finish(values, errors):
+    """
+    @brief Builds a BatchResult, replacing failed elements by NaN.
+    """
+    mask = errors != OK
+    values = np.where(mask, np.nan, values)
+    return BatchResult(values, mask, errors)
+
+
+def _no_errors(shape):
+    """
+    @brief Returns an error code array with no failures.
+    """
+    return np.zeros(shape, dtype=np.int8)
+
+
+def add(num1, num2):
+    """
+    @brief Adds two arrays of numbers element by element.
+
+    @param num1: First operands.
+    @param num2: Second operands.
+
+    @return BatchResult with the sums.
+    """
+    num1, num2 = np.broadcast_arrays(_as_float(num1), _as_float(num2))
+    return _finish(_round(num1 + num2), _no_errors(num1.shape))
+
+
+def sub(num1, num2):
+    """
+    @brief Subtracts two arrays of numbers element by element.
+
+    @param num1: First operands.
+    @param num2: Second operands.
+
+    @return BatchResult with the differences (num1 - num2).
+    """
+    num1, num2 = np.broadcast_arrays(_as_float(num1), _as_float(num2))
+    return _finish(_round(num1 - num2), _no_errors(num1.shape))
+
+
+def mul(num1, num2):
+    """
+    @brief Multiplies two arrays of numbers element by element.
+
+    @param num1: First operands.
+    @param num2: Second operands.
+
+    @return BatchResult with the products (num1 * num2).
+    """
+    num1, num2 = np.broadcast_arrays(_as_float(num1), _as_float(num2))
+    return _finish(_round(num1 * num2), _no_errors(num1.shape))
+
+
+def div(dividend, divisor):
+    """
+    @brief Divides two arrays of numbers element by element.
+
+    @param dividend: The numbers to be divided.
+    @param divisor: The numbers by which the dividends are divided.
+
+    @return BatchResult with the quotients, ZERO_DIVISION where the divisor is zero.
+    """
+    dividend, divisor = np.broadcast_arrays(_as_float(dividend), _as_float(divisor))
+    errors = _no_errors(dividend.shape)
+    errors[divisor == 0] = ZERO_DIVISION
+
+    safe_divisor = np.where(divisor == 0, 1.0, divisor)
+    return _finish(_round(dividend / safe_divisor), errors)
+
+
+def mod(dividend, divisor):
+    """
+    @brief Computes the modulo operation element by element.
+
+    @param dividend: The numbers to be divided.
+    @param divisor: The numbers by which the dividends are divided.
+
+    @return BatchResult with the remainders, ZERO_DIVISION where the divisor is zero.
+    """
+    dividend, divisor = np.broadcast_arrays(_as_float(dividend), _as_float(divisor))
+    errors = _no_errors(dividend.shape)
+    errors[divisor == 0] = ZERO_DIVISION
+
+    safe_divisor = np.where(divisor == 0, 1.0, divisor)
+    remainder = np.mod(np.abs(dividend), np.abs(safe_divisor))
+    remainder = np.where(safe_divisor < 0, -remainder, remainder)
+
+    snapped = np.abs(safe_divisor - remainder) < TOLERANCE
+    result = np.where(snapped, 0.0, _round(remainder))
+    return _finish(result, errors)
+
+
+def abs(num):
+    """
+    @brief Calculates the absolute value of every element.
+
+    @param num: The input numbers.
+
+    @return BatchResult with the absolute values.
+    """
+    num = _as_float(num)
+    return _finish(np.abs(num), _no_errors(num.shape))
+
+
+def fac(num):
+    """
+    @brief Computes the factorial of every element.
+
+    @param num: Integer array of non-negative numbers.
+
+    @return BatchResult with the factorials rounded to floats (inf where the exact factorial of
+            the scalar fac exceeds the float range) and TYPE_ERROR for negative or non-integer input.
+    """
+    num = np.asarray(num)
+    errors = _no_errors(num.shape)
+
+    if not np.issubdtype(num.dtype, np.integer):
+        errors[...] = TYPE_ERROR
+        return _finish(np.zeros(num.shape), errors)
+
+    errors[num < 0] = TYPE_ERROR
+
+    index = np.clip(num, 0, FACTORIAL_LIMIT)
+    values = np.where(num > FACTORIAL_LIMIT, np.inf, _FACTORIALS[index])
+    return _finish(values, errors)
+
+
+def pow(base, exponent):
+    """
+    @brief Raises every base to the power of the matching exponent.
+
+    @param base: The base numbers.
+    @param exponent: Integer array of non-negative exponents.
+
+    @return BatchResult with the powers (+-inf from a magnitude of 1e100 upwards), TYPE_ERROR
+            for negative or non-integer exponents and VALUE_ERROR for 0^0.
+    """
+    exponent = np.asarray(exponent)
+    base, exponent = np.broadcast_arrays(_as_float(base), exponent)
+    errors = _no_errors(base.shape)
+
+    if not np.issubdtype(exponent.dtype, np.integer):
+        errors[...] = TYPE_ERROR
+        return _finish(np.zeros(base.shape), errors)
+
+    errors[(base == 0) & (exponent == 0)] = VALUE_ERROR
+    errors[exponent < 0] = TYPE_ERROR
+
+    # float_power goes through the C library pow like the ** operator does, np.power may use
+    # a SIMD kernel that differs in the last bit
+    with np.errstate(over="ignore", invalid="ignore"):
+        result = np.float_power(base, np.maximum(exponent, 0).astype(np.float64))
+    overflow = np.abs(result) >= POW_OVERFLOW
+    result = np.where(overflow, np.copysign(np.inf, result), _round(result))
+    return _finish(result, errors)
+
+
+def root(base, index):
+    """
+    @brief Computes the nth root of every base.
+
+    @param base: The bases whose roots are to be calculated.
+    @param index: Integer array of root indexes (e.g., 2 for square root).
+
+    @return BatchResult with the roots, TYPE_ERROR for negative or non-integer indexes and
+            VALUE_ERROR for a zero index or an even root of a negative number.
+    """
+    index = np.asarray(index)
+    base, index = np.broadcast_arrays(_as_float(base), index)
+    errors = _no_errors(base.shape)
+
+    if not np.issubdtype(index.dtype, np.integer):
+        errors[...] = TYPE_ERROR
+        return _finish(np.zeros(base.shape), errors)
+
+    errors[(base < 0) & (index % 2 == 0)] = VALUE_ERROR
+    errors[index == 0] = VALUE_ERROR
+    errors[index < 0] = TYPE_ERROR
+
+    safe_index = np.where(index > 0, index, 1)
+    magnitude, undecided = _correct_root(np.abs(base), safe_index)
+    result = _round(np.where(base < 0, -magnitude, magnitude))
+
+    undecided &= (errors == OK) & (base != 0)
+    if undecided.any():
+        result[undecided] = [root_scalar(value, int(idx)) for value, idx
+                             in zip(base[undecided].tolist(), index[undecided].tolist())]
+
+    result = np.where(base == 0, 0.0, result)
+    return _finish(result, errors)
+
+
+def _dd_multiply(left_high, left_low, right_high, right_low):
+    """
+    @brief Multiplies two double-double numbers.
+    """
+    product, error = _two_product(left_high, right_high)
+    error = error + (left_high * right_low + left_low * right_high)
+    high = product + error
+    return high, error - (high - product)
+
+
+def _dd_power(values, exponent):
+    """
+    @brief Raises floats to per-element integer powers in double-double precision.
+    """
+    result_high = np.ones_like(values)
+    result_low = np.zeros_like(values)
+    base_high = values
+    base_low = np.zeros_like(values)
+    exponent = exponent.copy()
+
+    while (exponent > 0).any():
+        odd = (exponent & 1) == 1
+        high, low = _dd_multiply(result_high, result_low, base_high, base_low)
+        result_high = np.where(odd, high, result_high)
+        result_low = np.where(odd, low, result_low)
+        exponent >>= 1
+        base_high, base_low = _dd_multiply(base_high, base_low, base_high, base_low)
+
+    return result_high, result_low
+
+
+def _correct_root(values, index):
+    """
+    @brief Computes correctly rounded nth roots of non-negative floats, like the scalar root.
+
+    The value is scaled by a power of 2^index into [0.5, 2^index), the root estimate from
+    float_power is refined by one Newton step evaluated in double-double precision and rounded.
+    Elements too close to a rounding boundary to decide, or with an index above ROOT_INDEX_LIMIT,
+    are reported as undecided.
+
+    @return Tuple of the roots and a bool array of undecided elements.
+    """
+    index = np.broadcast_to(index, values.shape).astype(np.int64)
+    safe_index = np.clip(index, 1, ROOT_INDEX_LIMIT)
+    positive = values > 0
+
+    _, exponent = np.frexp(np.where(positive, values, 1.0))
+    shift = np.floor_divide(exponent, safe_index)
+    scaled = np.ldexp(np.where(positive, values, 1.0), -shift * safe_index)
+
+    with np.errstate(invalid="ignore"):
+        estimate = np.float_power(scaled, 1.0 / safe_index)
+        power_high, power_low = _dd_power(estimate, safe_index)
+        derivative = safe_index * power_high / estimate
+        correction = ((power_high - scaled) + power_low) / derivative
+
+        refined = estimate - correction
+        # Distance of the exact refined value from the rounded one, in units of the last place
+        residual = ((estimate - refined) - correction) / np.abs(np.spacing(refined))
+
+    undecided = (np.abs(np.abs(residual) - 0.5) < ROOT_ROUNDING_MARGIN) | (index > ROOT_INDEX_LIMIT)
+    undecided &= positive
+
+    result = np.where(positive, np.ldexp(refined, shift), 0.0)
+    return result, undecided
@@ -0,0 +1,192 @@
+"""
+@file power.py
+@brief File containing the power engine used by the math library.
+
+The magnitude of base^exponent is estimated with logarithms before anything is computed,
+so results that would overflow are reported as inf without building a huge number first.
+Square-and-multiply variants cover exact, modular and bounded exponentiation.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import math
+from decimal import Context, Decimal, ROUND_FLOOR
+
+from standard.factorial import format_scientific
+
+# Margin (in decimal digits) within which the logarithm estimate is not trusted
+ESTIMATE_MARGIN = 1e-6
+
+
+def _check(exponent):
+    """
+    @brief Validates the exponent of the power functions.
+    @exception TypeError: If exponent is not a natural number.
+    """
+    if not isinstance(exponent, int) or exponent < 0:
+        raise TypeError("Exponent must be a natural number.")
+
+
+def estimate_log10(base, exponent):
+    """
+    @brief Estimates log10(|base^exponent|) without computing the power.
+
+    @param base: The base number (int or float).
+    @param exponent: The natural exponent.
+
+    @return The decimal logarithm of the magnitude, -inf for a zero result.
+    """
+    _check(exponent)
+
+    if exponent == 0:
+        return 0.0
+    if base == 0:
+        return float('-inf')
+
+    return exponent * math.log10(abs(base))
+
+
+def _sign(base, exponent):
+    """
+    @brief Returns the sign (1 or -1) of base^exponent.
+    """
+    return -1 if base < 0 and exponent % 2 == 1 else 1
+
+
+def square_multiply(base, exponent):
+    """
+    @brief Computes base^exponent by repeated squaring.
+
+    @param base: The base number.
+    @param exponent: The natural exponent.
+
+    @return base^exponent.
+    """
+    _check(exponent)
+
+    result = 1
+    while exponent:
+        if exponent & 1:
+            result *= base
+        exponent >>= 1
+        if exponent:
+            base *= base
+    return result
+
+
+def mod_pow(base, exponent, modulus):
+    """
+    @brief Computes base^exponent modulo modulus by repeated squaring.
+
+    @param base: The integer base.
+    @param exponent: The natural exponent.
+    @param modulus: The positive integer modulus.
+
+    @return base^exponent % modulus.
+
+    @exception ValueError: If modulus is not positive.
+    """
+    _check(exponent)
+
+    if modulus <= 0:
+        raise ValueError("Modulus must be positive.")
+
+    result = 1 % modulus
+    base %= modulus
+    while exponent:
+        if exponent & 1:
+            result = result * base % modulus
+        exponent >>= 1
+        if exponent:
+            base = base * base % modulus
+    return result
+
+
+def bounded_pow(base, exponent, bound):
+    """
+    @brief Computes base^exponent by repeated squaring, giving up once the magnitude reaches bound.
+
+    For |base| >= 1 the partial results never shrink, so the computation stops as soon as one
+    of them reaches the bound.
+
+    @param base: The base number.
+    @param exponent: The natural exponent.
+    @param bound: Positive limit for the magnitude of the result.
+
+    @return base^exponent.
+
+    @exception OverflowError: If |base^exponent| >= bound.
+    """
+    _check(exponent)
+
+    if abs(base) < 1:
+        return base ** exponent
+
+    result = 1
+    while exponent:
+        if exponent & 1:
+            result *= base
+            if abs(result) >= bound:
+                raise OverflowError("Result exceeds the bound.")
+        exponent >>= 1
+        if exponent:
+            base *= base
+            if abs(base) >= bound:
+                raise OverflowError("Result exceeds the bound.")
+    return result
+
+
+def power(base, exponent, overflow=None):
+    """
+    @brief Computes base^exponent, returning inf for magnitudes of overflow or more.
+
+    The logarithm estimate decides most cases without computing. Only results within
+    ESTIMATE_MARGIN of the overflow limit are computed with bounded_pow to decide exactly.
+
+    @param base: The base number (int or float).
+    @param exponent: The natural exponent.
+    @param overflow: Magnitude at which inf (signed like the result) is returned, None for no limit.
+
+    @return base^exponent, exact for int bases, or +-inf.
+    """
+    _check(exponent)
+
+    if overflow is None or base == 0 or exponent == 0:
+        return base ** exponent
+
+    magnitude = estimate_log10(base, exponent)
+    limit = math.log10(overflow)
+
+    if magnitude >= limit + ESTIMATE_MARGIN:
+        return _sign(base, exponent) * float('inf')
+
+    if magnitude < limit - ESTIMATE_MARGIN:
+        return base ** exponent
+
+    try:
+        return bounded_pow(base, exponent, overflow)
+    except OverflowError:
+        return _sign(base, exponent) * float('inf')
+
+
+def power_scientific(base, exponent, digits=5):
+    """
+    @brief Returns base^exponent in scientific notation without computing the power.
+
+    @param base: The non-zero base number (int or float).
+    @param exponent: The natural exponent.
+    @param digits: Number of digits after the decimal point.
+
+    @return Text such as "3.46684e+9541693".
+    """
+    _check(exponent)
+
+    context = Context(prec=len(str(exponent)) + digits + 20)
+    base = Decimal(base)
+    log10 = context.multiply(exponent, context.log10(abs(base)))
+    exponent10 = int(log10.to_integral_value(rounding=ROUND_FLOOR))
+    mantissa = context.power(10, context.subtract(log10, exponent10))
+    if _sign(base, exponent) < 0:
+        mantissa = -mantissa
+    return format_scientific(mantissa, exponent10, digits)
@@ -0,0 +1,209 @@
+"""
+@file roots.py
+@brief File containing the exact nth root engine used by the math library.
+
+Roots are computed on integers with math.isqrt and Newton's iteration, so perfect powers are
+detected exactly and returned as ints, and every other root is correctly rounded to a float or
+to a Decimal with the requested number of significant digits.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import math
+from decimal import Context, Decimal, ROUND_HALF_EVEN, localcontext
+from fractions import Fraction
+
+# Extra bits (or digits) computed beyond the target precision before the final rounding
+GUARD = 2
+FLOAT_BITS = 53
+# Up to this size the starting guess of Newton's iteration comes from floats
+FLOAT_GUESS_BITS = 1000
+# From this index on float roots are first estimated with logarithms, since the exact
+# method works on numbers with about 55 * index bits
+ESTIMATE_INDEX = 64
+# Digits of the logarithmic estimate and its guaranteed relative accuracy
+ESTIMATE_DIGITS = 40
+ESTIMATE_ERROR = Fraction(1, 10 ** 30)
+
+
+def _check(index):
+    """
+    @brief Validates the index of the root functions.
+    @exception TypeError: If index is not a positive integer.
+    """
+    if not isinstance(index, int) or index <= 0:
+        raise TypeError("Index must be a natural number.")
+
+
+def integer_root(num, index):
+    """
+    @brief Computes the integer part of the nth root of a non-negative integer.
+
+    @param num: The non-negative integer.
+    @param index: The root to be calculated (e.g., 2 for square root).
+
+    @return The largest integer r with r^index <= num.
+
+    @exception ValueError: If num is negative.
+    """
+    _check(index)
+
+    if num < 0:
+        raise ValueError("Cannot compute root of negative number.")
+
+    if num < 2 or index == 1:
+        return num
+
+    if index == 2:
+        return math.isqrt(num)
+
+    # 2^index already exceeds num
+    if index >= num.bit_length():
+        return 1
+
+    # Newton's iteration converges slowly from a poor guess when the index is large, so the
+    # guess comes from the logarithm of num, which math.log2 computes for ints of any size
+    exponent = math.log2(num) / index
+    if exponent < FLOAT_GUESS_BITS:
+        guess = int(2 ** exponent * (1 + 1e-12)) + 1
+    else:
+        shift = int(exponent) - FLOAT_BITS
+        guess = (int(2 ** (exponent - shift) * (1 + 1e-12)) + 1) << shift
+    if guess ** index < num:
+        guess = 1 << -(-num.bit_length() // index)
+
+    # Newton's iteration decreases monotonically towards the root from above
+    while True:
+        better = ((index - 1) * guess + num // guess ** (index - 1)) // index
+        if better >= guess:
+            return guess
+        guess = better
+
+
+def exact_root(num, index):
+    """
+    @brief Returns the nth root of a non-negative integer if it is a perfect power.
+
+    @param num: The non-negative integer.
+    @param index: The root to be calculated.
+
+    @return The integer root, or None if num is not a perfect nth power.
+    """
+    root = integer_root(num, index)
+    if root ** index == num:
+        return root
+    return None
+
+
+def _scaled_root(numerator, denominator, index, base, shift):
+    """
+    @brief Computes floor(root(numerator / denominator * base^(shift * index))) with a sticky flag.
+
+    @return Tuple of the integer root and True if the root was not exact.
+    """
+    scaled, remainder = divmod(numerator * base ** (shift * index), denominator)
+    root = integer_root(scaled, index)
+    return root, bool(remainder) or root ** index != scaled
+
+
+def _estimate_float_root(numerator, denominator, index):
+    """
+    @brief Estimates the float of root(numerator / denominator) from logarithms.
+
+    @return The correctly rounded float, or None if the estimate is too close to a point
+            halfway between two floats to decide the rounding.
+    """
+    with localcontext(Context(prec=ESTIMATE_DIGITS)):
+        value = Fraction(((Decimal(numerator).ln() - Decimal(denominator).ln()) / index).exp())
+
+    estimate = float(value)
+    for neighbour in (math.nextafter(estimate, 0), math.nextafter(estimate, math.inf)):
+        halfway = (Fraction(estimate) + Fraction(neighbour)) / 2
+        if abs(value - halfway) <= value * ESTIMATE_ERROR:
+            return None
+    return estimate
+
+
+def _float_root(numerator, denominator, index):
+    """
+    @brief Returns the correctly rounded float of root(numerator / denominator).
+    """
+    if index >= ESTIMATE_INDEX:
+        estimate = _estimate_float_root(numerator, denominator, index)
+        if estimate is not None:
+            return estimate
+
+    # Scale so the integer root has at least FLOAT_BITS + GUARD bits
+    magnitude = numerator.bit_length() - denominator.bit_length()
+    shift = max(FLOAT_BITS + GUARD - magnitude // index + 1, 0)
+    root, inexact = _scaled_root(numerator, denominator, index, 2, shift)
+
+    # The extra lowest bit records an inexact root, so the int to float rounding stays correct
+    return math.ldexp(float(2 * root + inexact), -(shift + 1))
+
+
+def _decimal_root(numerator, denominator, index, precision):
+    """
+    @brief Returns root(numerator / denominator) correctly rounded to precision significant digits.
+    """
+    # Scale so the integer root has at least precision + GUARD digits
+    magnitude = len(str(numerator)) - len(str(denominator))
+    shift = max(precision + GUARD - magnitude // index + 1, 0)
+    root, inexact = _scaled_root(numerator, denominator, index, 10, shift)
+
+    exact = Context(prec=len(str(root)) + 2)
+    result = Decimal(10 * root + inexact).scaleb(-(shift + 1), context=exact)
+    return Context(prec=precision, rounding=ROUND_HALF_EVEN).plus(result)
+
+
+def _as_ratio(num):
+    """
+    @brief Returns a non-negative number as an exact (numerator, denominator) pair.
+    """
+    if isinstance(num, Decimal):
+        return Fraction(num).as_integer_ratio()
+    return num.as_integer_ratio()
+
+
+def nth_root(base, index, precision=None):
+    """
+    @brief Computes the nth root of a non-negative number.
+
+    @param base: The non-negative base (int, float, Decimal or Fraction).
+    @param index: The root to be calculated (e.g., 2 for square root).
+    @param precision: Number of significant digits of a Decimal result, None for a float result.
+                      Decimal bases always give a Decimal result (28 digits by default).
+
+    @return An int if base is an integer and a perfect power, a Fraction for Fraction bases whose
+            numerator and denominator are perfect powers, otherwise the correctly rounded float
+            or Decimal.
+
+    @exception TypeError: If index is not a positive integer.
+    @exception ValueError: If base is negative.
+    """
+    _check(index)
+
+    if base < 0:
+        raise ValueError("Cannot compute root of negative number.")
+
+    numerator, denominator = _as_ratio(base)
+
+    if denominator == 1 and not isinstance(base, Decimal):
+        root = exact_root(numerator, index)
+        if root is not None:
+            return root
+
+    if isinstance(base, Fraction):
+        numerator_root = exact_root(numerator, index)
+        denominator_root = exact_root(denominator, index)
+        if numerator_root is not None and denominator_root is not None:
+            return Fraction(numerator_root, denominator_root)
+
+    if isinstance(base, Decimal) and precision is None:
+        precision = 28
+
+    if precision is not None:
+        return _decimal_root(numerator, denominator, index, precision)
+
+    return _float_root(numerator, denominator, index)
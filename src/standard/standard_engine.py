@@ -0,0 +1,637 @@
+"""
+@file standard_engine.py
+@brief File containing the state machine of the standard calculator without any Qt dependency.
+
+The engine holds the expressions of the standard calculator and applies key presses to them.
+After every key it returns a DisplayState snapshot with the texts the display should show,
+so the App widget only renders snapshots and the exact same state machine can be replayed
+in batch or tested without a QApplication.
+
+The total expression is kept as a stack of typed tokens that is updated as operands and
+operators are entered, so the operator count and the last operator are O(1) lookups and
+evaluation never scans or splits the total expression text again.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from collections import namedtuple
+
+from standard import mathlib
+from standard.factorial import factorial_text
+
+# Operation symbols shown on the display
+OPERATIONS = {
+    "/": "÷",
+    "*": "×",
+    "-": "-",
+    "+": "+"
+}
+
+# Longest current and total expressions the display shows
+MAX_CURRENT_LENGTH = 16
+MAX_ERROR_LENGTH = 80
+MAX_TOTAL_LENGTH = 30
+
+# Token kinds of the total expression, powers and roots are operands with a pending unary operation
+OPERAND = "operand"
+OPERATOR = "operator"
+POWER = "power"
+ROOT = "root"
+
+# Token of the total expression, parts holds the split text of a power or root operand
+Token = namedtuple("Token", ["kind", "text", "parts"])
+
+# Snapshot of the display: the current and total label texts and whether current is an error
+DisplayState = namedtuple("DisplayState", ["current", "total", "error"])
+
+
+def operand_token(text):
+    """
+    @brief Creates the token of an operand, splitting powers and roots once.
+    @param text: The operand as typed, e.g. "12", "2^10" or "3√27".
+    @return The operand token.
+    """
+    if '^' in text:
+        return Token(POWER, text, tuple(text.split('^')))
+    if '√' in text:
+        return Token(ROOT, text, tuple(text.split('√')))
+    return Token(OPERAND, text, None)
+
+
+class StandardEngine:
+    """
+    @class StandardEngine
+    @brief State machine of the standard calculator driven by key presses.
+    """
+
+    __slots__ = ("currentExpression", "tokens", "operator_count", "evaluated", "equals_pressed",
+                 "current_text", "total_text", "decimal_backend", "keys")
+
+    def __init__(self):
+        """
+        @brief Initializes the engine with a cleared display.
+        """
+        self.currentExpression = "0"
+        # Tokens of the total expression and the number of operators among them
+        self.tokens = []
+        self.operator_count = 0
+        self.evaluated = False
+        self.equals_pressed = False
+        # Texts of the current and total labels as last rendered
+        self.current_text = "0"
+        self.total_text = ""
+        self.decimal_backend = mathlib.DecimalBackend(precision=28)
+
+        # Key names and the handlers they call
+        self.keys = {
+            "+": lambda: self.show_operators('+'),
+            "-": lambda: self.show_operators('-'),
+            "*": lambda: self.show_operators('*'),
+            "/": lambda: self.show_operators('/'),
+            "%": self.handle_modulo,
+            "^": self.handle_exponentiation,
+            "√": self.handle_root,
+            "!": self.handle_factorial,
+            "|x|": self.handle_absolute_value,
+            ".": self.handle_decimal_point,
+            "C": self.handle_clear,
+            "⌫": self.handle_delete,
+            "=": lambda: self.evaluate(equals_button=True),
+        }
+        for digit in range(10):
+            self.keys[str(digit)] = lambda d=digit: self.show_numbers(d)
+
+    @property
+    def totalExpression(self):
+        """
+        @brief Text of the total expression.
+        """
+        return "".join(token.text for token in self.tokens)
+
+    @property
+    def last_operator(self):
+        """
+        @brief The operator ending the total expression, or an empty string.
+        """
+        if self.tokens and self.tokens[-1].kind == OPERATOR:
+            return self.tokens[-1].text
+        return ""
+
+    def push_total(self, operand, operator):
+        """
+        @brief Appends an operand and the operator following it to the total expression.
+        @param operand: Text of the operand.
+        @param operator: The operator, nothing is appended for an empty string.
+        """
+        self.tokens.append(operand_token(operand))
+        if operator:
+            self.tokens.append(Token(OPERATOR, operator, None))
+            self.operator_count += 1
+
+    def replace_operator(self, operator):
+        """
+        @brief Replaces the operator ending the total expression.
+        @param operator: The new operator.
+        """
+        self.tokens[-1] = Token(OPERATOR, operator, None)
+
+    def clear_total(self):
+        """
+        @brief Empties the total expression.
+        """
+        self.tokens.clear()
+        self.operator_count = 0
+
+    def state(self):
+        """
+        @brief Returns a snapshot of the display.
+        @return DisplayState with the current and total label texts.
+        """
+        return DisplayState(self.current_text, self.total_text, 'Error' in self.currentExpression)
+
+    def press(self, key):
+        """
+        @brief Applies a key press and returns the resulting display.
+        @param key: Digit "0" to "9", operator "+-*/%", "^", "√", "!", "|x|", ".", "C", "⌫" or "=".
+        @return DisplayState after the key.
+
+        @exception KeyError: If the key is unknown.
+        """
+        self.keys[key]()
+        return self.state()
+
+    def replay(self, keys):
+        """
+        @brief Applies a sequence of key presses and returns the final display.
+        Like the Qt event loop, a key whose handler raises leaves the state as the handler left it.
+        @param keys: Iterable of keys accepted by press.
+        @return DisplayState after the last key.
+        """
+        handlers = self.keys
+        for key in keys:
+            try:
+                handlers[key]()
+            except (ArithmeticError, ValueError, TypeError, IndexError):
+                pass
+        return self.state()
+
+    def error(self, message):
+        """
+        @brief Displays an error message on the calculator's display.
+        @param message The error message to display.
+        """
+        self.clear_total()
+        self.update_total()
+        self.currentExpression = "Error: " + message
+        self.update_current()
+
+    def show_numbers(self, digit):
+        """
+        @brief Updates the current expression when a digit is pressed.
+        @param digit: The digit to add to the current expression.
+        """
+        if (self.currentExpression.startswith("0") and not self.currentExpression.startswith("0.")
+                and '^' not in self.currentExpression and '√' not in self.currentExpression):
+            self.currentExpression = self.currentExpression[1:]
+        if 'Error' in self.currentExpression or 'inf' in self.currentExpression:
+            self.currentExpression = str(digit)
+        elif self.evaluated:
+            self.currentExpression = ''
+            self.currentExpression += str(digit)
+            self.evaluated = False
+        else:
+            self.currentExpression += str(digit)
+        self.update_current()
+
+    def show_operators(self, operator):
+        """
+        @brief Appends the provided operator to the current expression and updates the labels.
+        @param operator: The operator to append to the current expression.
+        """
+        self.update_current()
+
+        if '.' in self.currentExpression and not self.currentExpression[-1].isdigit():
+            self.currentExpression = self.currentExpression[:-1]
+
+        if '.' in self.currentExpression:
+            if all(char == '0' for char in self.currentExpression[self.currentExpression.index('.') + 1:]):
+                rounded_num = round(float(self.currentExpression))
+                self.currentExpression = str(rounded_num)
+
+        if 'Error' in self.currentExpression or 'inf' in self.currentExpression:
+            if operator == '-':
+                self.currentExpression = operator
+                self.update_current()
+                return
+            else:
+                return
+
+        if self.currentExpression.endswith('e+') or self.currentExpression.endswith('e-'):
+            self.currentExpression += '0'
+
+        if self.currentExpression == '0':
+            if operator == '-':
+                self.currentExpression = operator
+            elif not self.tokens:
+                self.push_total(self.currentExpression, operator)
+        self.update_current()
+
+        if '-' in self.currentExpression and not self.currentExpression[-1].isdigit():
+            return
+
+        if '√' in self.currentExpression and not self.currentExpression[-1].isdigit():
+            if operator == '-':
+                self.currentExpression += operator
+                self.update_current()
+                return
+            else:
+                self.currentExpression += '0'
+
+        if '^' in self.currentExpression and not self.currentExpression[-1].isdigit():
+            if operator == '-':
+                self.currentExpression += operator
+                self.update_current()
+                return
+            else:
+                self.currentExpression += '0'
+
+        if self.last_operator and self.currentExpression == '0':
+            if operator == '-':
+                self.currentExpression = operator
+            else:
+                self.replace_operator(operator)
+        else:
+            if self.current_text != '0':
+                self.push_total(self.currentExpression, operator)
+
+        self.evaluated = False
+        self.currentExpression = ''
+        self.update_total()
+        self.update_current()
+
+        if self.signal():
+            self.evaluate()
+
+    def update_current(self):
+        """
+        @brief Truncates the current expression if necessary and renders it as the current label text.
+        """
+        if 'Error' in self.currentExpression:
+            if len(self.currentExpression) > MAX_ERROR_LENGTH:
+                self.currentExpression = self.currentExpression[:MAX_ERROR_LENGTH]
+        elif len(self.currentExpression) > MAX_CURRENT_LENGTH:
+            self.currentExpression = self.currentExpression[:MAX_CURRENT_LENGTH]
+
+        if not self.currentExpression or self.currentExpression == "0":
+            self.currentExpression = '0'
+        self.current_text = self.currentExpression
+
+    def update_total(self):
+        """
+        @brief Renders the total expression with formatted operators as the total label text.
+        """
+        expression = self.totalExpression
+
+        for operator, symbol in OPERATIONS.items():
+            expression = expression.replace(operator, symbol)
+        self.total_text = expression[:MAX_TOTAL_LENGTH]
+
+    def parse_exponentiation(self):
+        """
+        @brief Parses the current expression for exponentiation operation (x^y).
+        @return: Result of the exponentiation operation if successful, None otherwise.
+        """
+        result = None
+        if '^' in self.currentExpression and not self.tokens:
+            expCurrLeft = self.currentExpression.split('^')[0]
+            expCurrRight = self.currentExpression.split('^')[1]
+            if '.' in expCurrRight or int(expCurrRight) < 0:
+                self.error("Exponent must be a non-negative integer")
+                return None
+            if expCurrLeft == '0' and expCurrRight == '0':
+                self.error("0^0 is undefined")
+                return None
+            if '.' not in expCurrLeft:
+                result = str(mathlib.pow(int(expCurrLeft), int(expCurrRight)))
+            else:
+                result = str(mathlib.pow(float(expCurrLeft), int(expCurrRight)))
+
+            if len(result) > 16:
+                result = "{:.5e}".format(float(result))
+        return result
+
+    def parse_root(self):
+        """
+        @brief Parses the current expression for root operation (√x).
+        @return: Result of the root operation if successful, None otherwise.
+        """
+        result = None
+        if '√' in self.currentExpression and not self.tokens:
+            rootCurrLeft = self.currentExpression.split('√')[0]
+            rootCurrRight = self.currentExpression.split('√')[1]
+            if '.' in rootCurrLeft or int(rootCurrLeft) < 0 or int(rootCurrLeft) == 0:
+                return None
+            if float(rootCurrRight) < 0:
+                return None
+            radicand = int(rootCurrRight) if rootCurrRight.isdigit() else float(rootCurrRight)
+            result = mathlib.root(radicand, int(rootCurrLeft))
+
+            if isinstance(result, int):
+                result = str(result)
+            else:
+                result = f"{result:.10f}".rstrip('0').rstrip('.')
+
+            if len(result) > 16:
+                result = f"{float(result):.5e}"
+
+        return result
+
+    def handle_clear(self):
+        """
+        @brief Clears the current expression and total expression, resetting the calculator.
+        """
+        self.currentExpression = "0"
+        self.clear_total()
+        self.update_total()
+        self.update_current()
+
+    def handle_delete(self):
+        """
+        @brief Deletes the last character in the current expression or resets it if empty.
+        """
+        if 'Error' not in self.currentExpression and 'inf' not in self.currentExpression:
+            if self.currentExpression:
+                self.currentExpression = self.currentExpression[:-1]
+                self.update_current()
+
+        if len(self.currentExpression) == 0:
+            self.currentExpression = "0"
+            self.update_current()
+
+    def handle_exponentiation(self):
+        """
+        @brief Appends the exponentiation operator (^) to the current expression if valid.
+        """
+        if ('^' not in self.currentExpression and '√' not in self.currentExpression
+                and self.currentExpression[-1] != '.' and self.currentExpression[-1] != '-'
+                and 'Error' not in self.currentExpression and 'inf' not in self.currentExpression):
+            self.currentExpression += '^'
+            self.update_current()
+
+    def handle_root(self):
+        """
+        @brief Appends the root operator (√) to the current expression if valid.
+        """
+        if ('√' not in self.currentExpression and '^' not in self.currentExpression
+                and self.currentExpression[-1] != '.' and self.currentExpression[-1] != '-'
+                and 'Error' not in self.currentExpression and 'inf' not in self.currentExpression):
+            self.currentExpression += '√'
+        self.update_current()
+
+    def handle_factorial(self):
+        """
+        @brief Calculates the factorial of the current expression if valid and updates it.
+        """
+        if self.tokens:
+            self.error("The total expression is not empty. Clear it first!")
+            return
+
+        functions_to_parse = [self.parse_exponentiation, self.parse_root]
+
+        for func in functions_to_parse:
+            result = func()
+            if result is not None:
+                if not result.isdigit():
+                    self.error("Factorial is only defined for non-negative integers")
+                    return
+                self.currentExpression = factorial_text(int(result))
+                self.update_current()
+                return
+
+        if not self.currentExpression.isdigit():
+            self.error("Factorial is only defined for non-negative integers")
+            return
+
+        self.currentExpression = factorial_text(int(self.currentExpression))
+        self.update_current()
+
+    def handle_absolute_value(self):
+        """
+        @brief Calculates the absolute value of the current expression if valid and updates it.
+        """
+        if self.tokens:
+            self.error("The total expression is not empty. Clear it first!")
+            return
+
+        functions_to_parse = [self.parse_exponentiation, self.parse_root]
+        for func in functions_to_parse:
+            result = func()
+            if result is not None:
+                if '.' in result:
+                    result = mathlib.abs(float(result))
+                else:
+                    result = mathlib.abs(int(result))
+                self.currentExpression = str(result)
+                self.update_current()
+                return
+
+        if '.' in self.currentExpression:
+            result = mathlib.abs(float(self.currentExpression))
+        else:
+            result = mathlib.abs(int(self.currentExpression))
+
+        self.currentExpression = str(result)
+        self.update_current()
+
+    def handle_modulo(self):
+        """
+        @brief Appends the modulo operator (%) to the current expression.
+        """
+        self.show_operators('%')
+
+    def handle_decimal_point(self):
+        """
+        @brief Appends a decimal point to the current expression if valid.
+        """
+        if 'Error' not in self.currentExpression and 'inf' not in self.currentExpression:
+            if not self.currentExpression or self.currentExpression[-1] != '-':
+                if not self.currentExpression:
+                    self.currentExpression += '0.'
+                elif '.' not in self.currentExpression:
+                    self.currentExpression += '.'
+        self.update_current()
+
+    def parsing(self):
+        """
+        @brief Splits the total expression at its last operator before the trailing one.
+        @return Tuple of the left operand token, the operator, the right operand token and the
+                trailing operator. Without an inner operator the operator is empty and the right
+                operand is None.
+        """
+        lastOperator = self.last_operator
+        tokens = self.tokens[:-1] if lastOperator else self.tokens
+
+        for i in range(len(tokens) - 1, 0, -1):
+            if tokens[i].kind == OPERATOR:
+                return tokens[i - 1], tokens[i].text, tokens[i + 1], lastOperator
+
+        left = tokens[0] if tokens else operand_token("")
+        return left, "", None, lastOperator
+
+    def evaluate(self, equals_button=False):
+        """
+        @brief Evaluates the expression by parsing and calculating the result.
+        @param equals_button bool True if called from equals button, False otherwise.
+        @return bool True if the evaluation was successful, False otherwise.
+        """
+        self.equals_pressed = equals_button
+
+        if '^' in self.currentExpression or '√' in self.currentExpression:
+            result = self.process_special_operations(operand_token(self.currentExpression))
+            if result is not None:
+                self.update_result(float(result), "")
+                return True
+
+        leftSide, operator, rightSide, lastOperator = self.parsing()
+
+        if not operator and rightSide is None:
+            rightSide = operand_token(self.currentExpression)
+            operator = lastOperator
+
+        leftSide = self.process_special_operations(leftSide)
+        rightSide = self.process_special_operations(rightSide)
+        if leftSide is None or rightSide is None:
+            return False
+
+        try:
+            leftValue = float(leftSide)
+            rightValue = float(rightSide)
+        except ValueError:
+            self.error("Invalid number format")
+            return False
+
+        result = self.perform_operation(leftValue, rightValue, operator)
+        if result is None:
+            return False
+
+        self.update_result(result, lastOperator)
+        return True
+
+    def process_special_operations(self, token):
+        """
+        @brief Processes exponentiation and root operands.
+        @param token Token The operand token to process.
+        @return str The processed value as a string, or None if an error occurred.
+        """
+        if token.kind == POWER:
+            base, exponent = token.parts
+            return self.calculate_power(float(base), int(exponent))
+        elif token.kind == ROOT:
+            if len(token.parts) == 2:
+                index, radicand = token.parts
+                if index:
+                    return self.calculate_root(float(radicand), int(index))
+                else:
+                    return self.calculate_root(float(radicand), 2)
+            else:
+                self.error("Invalid root format")
+                return None
+        return token.text
+
+    def calculate_power(self, base, exponent):
+        """
+        @brief Calculates the power of a number.
+        @param base float The base number.
+        @param exponent int The exponent.
+        @return str The result as a string, or None if an error occurred.
+        """
+        if exponent < 0 or '.' in str(exponent):
+            self.error("Exponent must be a non-negative integer")
+            return None
+        if base == 0 and exponent == 0:
+            self.error("0^0 is undefined")
+            return None
+        return str(mathlib.pow(base, exponent))
+
+    def calculate_root(self, radicand, index):
+        """
+        @brief Calculates the nth root of a number.
+        @param radicand float The number under the root, perfect powers give an exact integer result.
+        @param index int The root index.
+        @return str The result as a string, or None if an error occurred.
+        """
+        if index <= 0 or '.' in str(index):
+            self.error("Root index must be a positive integer")
+            return None
+        if radicand < 0:
+            self.error("Cannot take the root of a negative number")
+            return None
+        return str(mathlib.root(radicand, index))
+
+    def perform_operation(self, left, right, operator):
+        """
+        @brief Performs the specified arithmetic operation.
+        @param left float The left operand.
+        @param right float The right operand.
+        @param operator str The arithmetic operator.
+        @return float The result of the operation, or None if an error occurred.
+        """
+        backend = self.decimal_backend
+
+        if operator == '+':
+            return float(mathlib.add(left, right, backend=backend))
+        elif operator == '-':
+            return float(mathlib.sub(left, right, backend=backend))
+        elif operator == '*':
+            return float(mathlib.mul(left, right, backend=backend))
+        elif operator == '/':
+            if right == 0:
+                self.error("Cannot divide by zero")
+                return None
+            return float(mathlib.div(left, right, backend=backend))
+        elif operator == '%':
+            if right == 0:
+                self.error("Cannot perform modulo operation with zero")
+                return None
+            return float(backend.mod(backend.convert(left), backend.convert(right)))
+        else:
+            self.error("Invalid operator")
+            return None
+
+    def update_result(self, result, lastOperator):
+        """
+        @brief Updates the current and total expressions with the calculated result.
+        @param result float The calculated result.
+        @param lastOperator str The last operator used in the calculation.
+        """
+        if -1e16 < result < 1e16:
+            if abs(result - round(result)) < 1e-10:
+                resultStr = str(int(round(result)))
+            else:
+                resultStr = str(result)
+
+            if len(resultStr) > 16:
+                if '.' in resultStr:
+                    integer_part = len(str(int(float(resultStr))))
+                    result = round(result, 16 - integer_part)
+                else:
+                    result = round(result)
+                resultStr = str(result)
+        else:
+            resultStr = "{:.10e}".format(result)
+
+        self.currentExpression = resultStr
+        self.clear_total()
+        if not self.equals_pressed:
+            self.push_total(resultStr, lastOperator)
+        self.update_current()
+        self.update_total()
+        self.evaluated = True
+
+    def signal(self):
+        """
+        @brief Handles signal when the total expression has two operators.
+        @return: True if the total expression has exactly two operators, False otherwise.
+        """
+        return self.operator_count == 2
@@ -0,0 +1,24 @@
+"""
+@file conftest.py
+@brief File containing the shared pytest setup, the application modules are imported from src/.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """
+    @brief Returns the Qt application shared by the tests that need one
+    """
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
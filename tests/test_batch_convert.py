@@ -0,0 +1,101 @@
+"""
+@file test_batch_convert.py
+@brief File containing the tests of the command line ledger conversion.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from currency import batch_convert
+from currency.currency_api import RateCache, save_snapshot
+from currency.currency_providers import ProviderError, RateProvider, RateResponse
+
+
+class FailingProvider(RateProvider):
+    name = "failing"
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        raise ProviderError("offline")
+
+
+class StaticProvider(RateProvider):
+    name = "static"
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        return RateResponse(self.rates, None, None, None, False)
+
+
+def convert(tmp_path, monkeypatch, cache, content=b"10,EUR,USD\n"):
+    ledger = tmp_path / "ledger.csv"
+    ledger.write_bytes(content)
+    output = tmp_path / "converted.csv"
+    monkeypatch.setattr(batch_convert, "rate_cache", cache)
+    return batch_convert.main([str(ledger), str(output)]), output
+
+
+def test_downloaded_rates_win_over_a_snapshot(tmp_path, monkeypatch, capsys):
+    save_snapshot({"EUR": 1, "USD": 1.5}, "old", str(tmp_path))
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": 1.1}), snapshot_dir=None)
+    code, output = convert(tmp_path, monkeypatch, cache)
+    assert code == 0
+    assert output.read_text().strip() == "10,EUR,USD,11.00"
+    assert "stale" not in capsys.readouterr().err
+
+
+def test_snapshot_is_used_with_a_warning_when_the_download_fails(tmp_path, monkeypatch, capsys):
+    snapshots = tmp_path / "rates"
+    save_snapshot({"EUR": 1, "USD": 1.5}, "old", str(snapshots))
+    cache = RateCache(FailingProvider(), snapshot_dir=str(snapshots))
+    code, output = convert(tmp_path, monkeypatch, cache)
+    assert code == 0
+    assert output.read_text().strip() == "10,EUR,USD,15.00"
+    assert "stale rates saved at" in capsys.readouterr().err
+
+
+def test_no_rates_at_all(tmp_path, monkeypatch):
+    cache = RateCache(FailingProvider(), snapshot_dir=str(tmp_path / "empty"))
+    code, _ = convert(tmp_path, monkeypatch, cache)
+    assert code == 1
+
+
+def test_a_ledger_that_is_not_utf8_is_an_error(tmp_path, monkeypatch, capsys):
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": 1.1}), snapshot_dir=None)
+    code, _ = convert(tmp_path, monkeypatch, cache, "10,EUR,USD,Müller\n".encode("latin-1"))
+    assert code == 1
+    assert capsys.readouterr().err.startswith("Error:")
+
+
+def test_an_amount_out_of_range_fails_its_row(tmp_path, monkeypatch, capsys):
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": 1.1}), snapshot_dir=None)
+    code, output = convert(tmp_path, monkeypatch, cache, b"1e30,EUR,USD\n10,EUR,USD\n")
+    assert code == 0
+    assert output.read_text().splitlines()[1] == "10,EUR,USD,11.00"
+    assert "1 failed" in capsys.readouterr().err
+
+
+def test_an_invalid_rate_is_an_error(tmp_path, monkeypatch, capsys):
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": "x"}), snapshot_dir=None)
+    code, _ = convert(tmp_path, monkeypatch, cache)
+    assert code == 1
+    assert capsys.readouterr().err.startswith("Error:")
+
+
+def test_worker_reports_a_failed_conversion(qapp, tmp_path, monkeypatch):
+    from currency import currency_worker
+
+    ledger = tmp_path / "ledger.csv"
+    ledger.write_bytes(b"\xff10,EUR,USD\n")
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": 1.1}), snapshot_dir=None)
+    cache.fetch()
+    monkeypatch.setattr(currency_worker, "rate_cache", cache)
+
+    runner = currency_worker.BatchRunner()
+    results = []
+    runner.task_finished.connect(results.append)
+    runner.in_flight = True
+    currency_worker.BatchTask(runner, str(ledger), str(tmp_path / "converted.csv")).run()
+    assert len(results) == 1 and isinstance(results[0], str)
+    assert not runner.in_flight
@@ -0,0 +1,33 @@
+"""
+@file test_calculator.py
+@brief File containing the tests of the Standard mode widget.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QWidget
+
+from standard.calculator import App
+
+
+@pytest.fixture
+def app_widget(qapp):
+    widget = App()
+    yield widget
+    widget.close()
+
+
+def test_key_presses_render_the_engine_state(app_widget):
+    for key in "12+3=":
+        app_widget.press(key)
+    assert app_widget.currentLabel.text() == "15"
+
+
+def test_qwidget_render_is_not_overridden(app_widget):
+    assert App.render is QWidget.render
+    pixmap = QPixmap(app_widget.size())
+    app_widget.render(pixmap)
+    assert not pixmap.isNull()
@@ -0,0 +1,105 @@
+"""
+@file test_currency_converter.py
+@brief File containing the tests of the live conversion in the currency converter mode.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+
+from currency import currency_converter, currency_worker, flag_cache
+from currency.currency_api import RateCache
+from currency.currency_providers import RateProvider, RateResponse
+
+
+class StaticProvider(RateProvider):
+    name = "static"
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        return RateResponse({"EUR": 1, "USD": 1.1, "CZK": 25}, None, None, None, False)
+
+
+@pytest.fixture
+def converter(qapp, monkeypatch):
+    cache = RateCache(StaticProvider(), snapshot_dir=None)
+    cache.fetch()
+    monkeypatch.setattr(currency_converter, "rate_cache", cache)
+    monkeypatch.setattr(currency_worker, "rate_cache", cache)
+    # The flags missing in the atlas are not downloaded, the tests run offline
+    monkeypatch.setattr(flag_cache, "get_cached_flag_image", lambda *args, **kwargs: None)
+    widget = currency_converter.CurrencyConverter()
+    widget.currency1.setCurrentIndex(widget.currency1.findData("EUR"))
+    widget.currency2.setCurrentIndex(widget.currency2.findData("USD"))
+    yield widget
+    # Nothing may fire after the rate cache is restored
+    widget.rate_loader.pool.waitForDone()
+    qapp.processEvents()
+    widget.live_timer.stop()
+    widget.rate_scheduler.stop()
+    widget.close()
+
+
+def test_live_convert(converter):
+    converter.amount1.setText("10")
+    converter.live_convert()
+    assert converter.amount2.text() == "11.00"
+
+
+@pytest.mark.parametrize("text", ["1e", "-", "1.2.3"])
+def test_live_convert_clears_the_result_of_an_invalid_amount(converter, text):
+    converter.amount1.setText("10")
+    converter.live_convert()
+    converter.amount1.setText(text)
+    converter.live_convert()
+    assert converter.amount2.text() == ""
+    assert converter.amount2.toolTip() == ""
+
+
+def test_a_burst_of_edits_is_converted_once(converter, monkeypatch):
+    conversions = []
+    monkeypatch.setattr(converter, "show_conversion", lambda *args: conversions.append(args))
+    for digit in "123":
+        converter.append_digit(digit)
+    assert converter.live_timer.isActive()
+    assert conversions == []
+    converter.live_timer.stop()
+    converter.live_timer.timeout.emit()
+    assert len(conversions) == 1
+    assert str(conversions[0][0].amount) == "123.00"
+
+
+def test_rates_changed_converts_only_the_shown_currencies(converter):
+    converter.amount1.setText("10")
+    converter.live_timer.stop()
+    converter.on_rates_changed(frozenset({"CZK"}))
+    assert not converter.live_timer.isActive()
+    converter.on_rates_changed(frozenset({"USD"}))
+    assert converter.live_timer.isActive()
+
+
+def test_rates_changed_without_an_amount_does_nothing(converter):
+    converter.live_timer.stop()
+    converter.on_rates_changed(frozenset({"EUR", "USD"}))
+    assert not converter.live_timer.isActive()
+
+
+def test_convert_waits_for_expired_rates_on_the_worker(qapp, converter):
+    currency_converter.rate_cache.ttl = 0
+    converter.amount1.setText("10")
+    converter.convert_currency()
+    assert converter.pending_conversion is not None
+    assert converter.amount2.placeholderText() == "Loading rates..."
+
+    converter.rate_loader.pool.waitForDone()
+    qapp.processEvents()
+    assert converter.pending_conversion is None
+    assert converter.amount2.text() == "11.00"
+
+
+def test_changing_a_currency_drops_the_pending_conversion(converter):
+    currency_converter.rate_cache.ttl = 0
+    converter.amount1.setText("10")
+    converter.convert_currency()
+    converter.currency2.setCurrentIndex(converter.currency2.findData("CZK"))
+    assert converter.pending_conversion is None
@@ -0,0 +1,66 @@
+"""
+@file test_currency_model.py
+@brief File containing the tests of the shared and filterable currency model.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+from PySide6.QtCore import Qt
+
+from currency.currency_api import CURRENCY_NAMES
+from currency.currency_model import CurrencyFilterModel, CurrencyListModel, shared_currency_model
+
+
+@pytest.fixture
+def search(qapp):
+    return CurrencyFilterModel(CurrencyListModel())
+
+
+def codes(model):
+    return [model.data(model.index(row, 0), Qt.UserRole) for row in range(model.rowCount())]
+
+
+def test_list_model_data():
+    model = CurrencyListModel()
+    index = model.index(0, 0)
+    assert model.rowCount() == len(CURRENCY_NAMES)
+    assert model.data(index) == "EUR | Euro"
+    assert model.data(index, Qt.UserRole) == "EUR"
+    assert model.data(index, CurrencyListModel.NameRole) == "Euro"
+    assert model.data(model.index(-1, 0)) is None
+
+
+def test_shared_model_is_created_once(qapp):
+    assert shared_currency_model() is shared_currency_model()
+
+
+def test_code_matches_come_before_name_matches(search):
+    search.set_filter(" Us ")
+    matches = codes(search)
+    assert matches[0] == "USD"
+    assert "AUD" in matches
+    assert all(code.lower().startswith("us") or "us" in CURRENCY_NAMES[code].casefold() for code in matches)
+
+
+def test_narrowed_search_matches_a_fresh_search(qapp, search):
+    for text in ("d", "do", "dol", "dollar"):
+        search.set_filter(text)
+    fresh = CurrencyFilterModel(CurrencyListModel())
+    fresh.set_filter("dollar")
+    assert codes(search) == codes(fresh)
+    assert "CAD" in codes(search)
+
+
+def test_shorter_search_widens_the_matches(search):
+    search.set_filter("dollar")
+    search.set_filter("euro")
+    assert codes(search) == ["EUR"]
+    search.set_filter("")
+    assert codes(search) == list(CURRENCY_NAMES)
+
+
+def test_no_match(search):
+    search.set_filter("zzz")
+    assert search.rowCount() == 0
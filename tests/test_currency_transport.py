@@ -0,0 +1,69 @@
+"""
+@file test_currency_transport.py
+@brief File containing the tests of the pooled HTTP transport of the currency API.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import socket
+
+import pytest
+import requests
+
+from currency.currency_transport import RetryBudget, Transport
+from currency.fake_rate_server import FakeRateServer
+
+
+@pytest.fixture
+def server():
+    server = FakeRateServer(seed=1).start()
+    yield server
+    server.stop()
+
+
+def test_successful_request_records_its_latency(server):
+    transport = Transport(backoff=0)
+    response = transport.get(server.rates_url())
+    assert response.status_code == 200
+    stats = transport.latency_stats()[server.url.split("//")[1]]
+    assert stats["count"] == 1 and stats["max"] >= 0
+    transport.close()
+
+
+def test_server_errors_are_retried(server):
+    server.failure_rate = 1.0
+    transport = Transport(max_retries=3, backoff=0)
+    assert transport.get(server.rates_url()).status_code == 503
+    assert server.requests == 4
+    transport.close()
+
+
+def test_retries_are_limited_by_the_budget(server):
+    server.failure_rate = 1.0
+    transport = Transport(max_retries=3, backoff=0, budget=RetryBudget(capacity=2))
+    transport.get(server.rates_url())
+    transport.get(server.rates_url())
+    # Two retries for the first request, none left for the second
+    assert server.requests == 4
+    transport.close()
+
+
+def test_budget_refills_with_successes():
+    budget = RetryBudget(capacity=1, refill=0.5)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_connection_errors_are_raised_after_the_retries():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    transport = Transport(max_retries=1, backoff=0)
+    with pytest.raises(requests.ConnectionError):
+        transport.get(f"http://127.0.0.1:{port}/")
+    assert transport.budget.tokens == transport.budget.capacity - 1
+    transport.close()
@@ -0,0 +1,28 @@
+"""
+@file test_expression_compiler.py
+@brief File containing the tests of the Expression mode compiler.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+
+from expression.expression_compiler import MAX_DIGITS, evaluate
+from expression.expression_incremental import IncrementalEvaluator
+
+
+@pytest.mark.parametrize("expression", ["10^100001", "30000!", "25000!×25000!×25000!", "(10^60000)×(10^60000)"])
+def test_results_over_max_digits_are_refused(expression):
+    with pytest.raises(OverflowError):
+        evaluate(expression)
+
+
+def test_products_up_to_max_digits_are_exact():
+    half = MAX_DIGITS // 2
+    assert evaluate(f"(10^{half})×(10^{half - 1})") == 10 ** (MAX_DIGITS - 1)
+    assert evaluate("2.5×4") == 10
+
+
+def test_preview_refuses_large_products():
+    assert IncrementalEvaluator().preview("25000!×25000!×25000!") is None
@@ -0,0 +1,89 @@
+"""
+@file test_expression_parser.py
+@brief File containing the tests of the Expression mode parser.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import math
+import random
+
+import pytest
+
+from expression.expression_compiler import evaluate
+from expression.expression_incremental import IncrementalEvaluator
+from expression.expression_parser import parse
+from expression.expression_tokenizer import normalize, tokenize
+
+
+def tree(expression):
+    return parse(tokenize(normalize(expression)))
+
+
+@pytest.mark.parametrize("expression, value", [
+    ("2+3×4", 14), ("2^3^2", 512), ("-2^2", -4), ("3!!", 720), ("-3!", -6), ("3!^2", 36),
+    ("√16", 4), ("3√(27)", 3), ("|2-5|×2", 6), ("2(3+4)", 14), ("(1+2)(3+4)", 21), ("2π", 2 * math.pi),
+    ("10÷4", 2.5), ("7%3", 1), ("2×-3", -6), ("5-+2", 3),
+])
+def test_precedence_and_notation(expression, value):
+    assert evaluate(expression) == value
+
+
+def test_tree_shape():
+    assert tree("2+3×4") == ("binary", "+", ("number", 2), ("binary", "*", ("number", 3), ("number", 4)))
+    assert tree("3√(27)") == ("root", 3, ("number", 27))
+    assert tree("|2|!") == ("factorial", ("abs", ("number", 2)))
+
+
+@pytest.mark.parametrize("expression", ["2+", "((2)", "2)", "×3", "|", "√", "3!2.."])
+def test_invalid_input(expression):
+    with pytest.raises(SyntaxError, match="Invalid input"):
+        evaluate(expression)
+
+
+def random_expression(rng, depth):
+    if depth == 0 or rng.random() < 0.3:
+        return str(rng.randint(1, 50))
+    left = random_expression(rng, depth - 1)
+    right = random_expression(rng, depth - 1)
+    expression = f"{left}{rng.choice('+-*/')}{right}"
+    return f"({expression})" if rng.random() < 0.5 else expression
+
+
+def test_matches_python_arithmetic():
+    # The engine replaced eval, plain arithmetic must give the same values
+    rng = random.Random(7)
+    for _ in range(500):
+        expression = random_expression(rng, 5)
+        try:
+            expected = eval(expression)
+        except ZeroDivisionError:
+            with pytest.raises(ZeroDivisionError):
+                evaluate(expression)
+            continue
+        assert evaluate(expression) == pytest.approx(expected, rel=1e-12), expression
+
+
+def test_deep_nesting_does_not_recurse():
+    depth = 20000
+    assert evaluate("(" * depth + "1" + ")" * depth) == 1
+    assert evaluate("√" * 2000 + "1") == 1
+    assert evaluate("-" * 3001 + "1") == -1
+
+
+def test_long_expressions():
+    assert evaluate("+".join(["1"] * 50000)) == 50000
+    assert evaluate("2" + "!" * 3) == math.factorial(math.factorial(2))
+
+
+def test_incremental_preview_matches_evaluate():
+    evaluator = IncrementalEvaluator()
+    expression = "12×(3+4)-5!÷2+|-7|"
+    for end in range(1, len(expression) + 1):
+        prefix = expression[:end]
+        try:
+            expected = evaluate(prefix)
+        except (SyntaxError, ArithmeticError, ValueError):
+            continue
+        assert evaluator.preview(prefix) == expected, prefix
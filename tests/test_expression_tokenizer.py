@@ -0,0 +1,38 @@
+"""
+@file test_expression_tokenizer.py
+@brief File containing the tests of the Expression mode tokenizer.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+
+from expression.expression_compiler import evaluate
+from expression.expression_incremental import IncrementalEvaluator
+from expression.expression_tokenizer import NUMBER, parse_number, tokenize
+
+
+def test_ascii_numbers():
+    tokens = tokenize("12.5+3")
+    assert [(token.kind, token.value) for token in tokens if token.kind == NUMBER] == [(NUMBER, 12.5), (NUMBER, 3)]
+
+
+@pytest.mark.parametrize("expression", ["2²", "3!²", "²", "2³+1", "½", "٣+1"])
+def test_unicode_digits_are_invalid_input(expression):
+    with pytest.raises(SyntaxError, match="Invalid input"):
+        evaluate(expression)
+
+
+def test_unicode_digits_do_not_reach_parse_number():
+    with pytest.raises(SyntaxError, match="Invalid input"):
+        tokenize("2²")
+
+
+def test_parse_number_rejects_non_ascii_digits():
+    with pytest.raises(SyntaxError, match="Invalid input"):
+        parse_number("²")
+
+
+def test_preview_of_unicode_digits():
+    assert IncrementalEvaluator().preview("2²") is None
@@ -0,0 +1,32 @@
+"""
+@file test_factorial.py
+@brief File containing the tests of the factorial engine and its scientific notation.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from standard.factorial import factorial, scientific_text
+
+
+def decimal_text(value, digits=5):
+    mantissa, exponent = f"{Decimal(value):.{digits}e}".split("e")
+    return f"{mantissa}e{int(exponent):+03d}"
+
+
+@pytest.mark.parametrize("value", [
+    7, -5, 10 ** 30, 123455 * 10 ** 40, 123465 * 10 ** 40, 123465 * 10 ** 40 + 1, -999995 * 10 ** 50,
+    9999949 * 10 ** 35, factorial(1000),
+])
+def test_scientific_text_rounds_like_decimal(value):
+    assert scientific_text(value) == decimal_text(value)
+
+
+def test_scientific_text_of_long_integers():
+    value = factorial(25000)
+    assert scientific_text(value) == decimal_text(value)
+    assert scientific_text(value ** 3) == "1.61693e+297281"
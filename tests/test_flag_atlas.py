@@ -0,0 +1,36 @@
+"""
+@file test_flag_atlas.py
+@brief File containing the tests of the bundled flag sprite atlas.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import os
+
+from currency.currency_api import CURRENCY_NAMES
+from currency.flag_cache import ATLAS_CELL, ATLAS_IMAGE_PATH, ATLAS_INDEX_PATH, FlagAtlas, flag_country
+from utils.img_path import resource_path
+
+
+def test_atlas_is_shipped():
+    assert os.path.isfile(ATLAS_IMAGE_PATH)
+    assert os.path.isfile(ATLAS_INDEX_PATH)
+
+
+def test_atlas_holds_every_currency(qapp):
+    atlas = FlagAtlas()
+    missing = [code for code in CURRENCY_NAMES if code != "EUR" and flag_country(code) not in atlas]
+    assert missing == []
+    # The euro uses its own bundled flag
+    assert os.path.isfile(resource_path(os.path.join("Pictures", "european-union.png")))
+
+
+def test_atlas_flags_fit_the_cell(qapp):
+    atlas = FlagAtlas()
+    for code in CURRENCY_NAMES:
+        if code == "EUR":
+            continue
+        image = atlas.flag(flag_country(code))
+        assert not image.isNull(), code
+        assert 0 < image.width() <= ATLAS_CELL[0] and 0 < image.height() <= ATLAS_CELL[1], code
@@ -0,0 +1,102 @@
+"""
+@file test_flag_cache.py
+@brief File containing the tests of the flag image cache.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import os
+
+import pytest
+
+from currency import currency_api, flag_cache
+from currency.currency_api import flag_cache_path, get_cached_flag_image
+from currency.fake_rate_server import solid_png
+from currency.flag_cache import FlagCache
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    requested = []
+
+    def get_cached_flag_image(country_code, *args, **kwargs):
+        requested.append(country_code)
+        return None
+
+    monkeypatch.setattr(flag_cache, "get_cached_flag_image", get_cached_flag_image)
+    return requested
+
+
+def load(qapp, cache, country_code):
+    pixmap = cache.pixmap(country_code)
+    cache.pool.waitForDone()
+    qapp.processEvents()
+    return pixmap
+
+
+def test_atlas_flags_need_no_download(qapp, downloads):
+    cache = FlagCache(35, 22)
+    assert cache.pixmap("CZ") is not None
+    assert downloads == []
+
+
+def test_failed_flag_is_not_downloaded_again(qapp, downloads, monkeypatch):
+    cache = FlagCache(35, 22)
+    assert load(qapp, cache, "QQ") is None
+    assert load(qapp, cache, "QQ") is None
+    # One look into the disk cache, one download, then the failure is remembered
+    assert downloads == ["QQ", "QQ", "QQ"]
+
+    monkeypatch.setattr(flag_cache, "FLAG_RETRY_INTERVAL", 0)
+    load(qapp, cache, "QQ")
+    assert downloads.count("QQ") == 5
+
+
+def test_prefetch_has_its_own_thread(qapp, downloads):
+    cache = FlagCache(35, 22)
+    assert cache.pool.maxThreadCount() == 1
+    assert cache.prefetch_pool.maxThreadCount() == 1
+    cache.prefetch(["QQ", "CZ", "QQ"])
+    cache.prefetch_pool.waitForDone()
+    assert downloads == ["QQ"]
+
+
+def test_downloaded_flag_is_announced(qapp, monkeypatch):
+    monkeypatch.setattr(flag_cache, "get_cached_flag_image",
+                        lambda country_code, download=True: solid_png(64, 42, (255, 0, 0)) if download else None)
+    cache = FlagCache(35, 22)
+    ready = []
+    cache.flag_ready.connect(ready.append)
+    assert load(qapp, cache, "QQ") is None
+    assert ready == ["QQ"]
+    pixmap = cache.pixmap("QQ")
+    assert pixmap.width() <= 35 and pixmap.height() <= 22
+
+
+def test_memory_tier_is_a_bounded_lru(qapp, downloads):
+    cache = FlagCache(35, 22, capacity=2)
+    cache.pixmap("CZ")
+    cache.pixmap("US")
+    cache.pixmap("CZ")
+    cache.pixmap("JP")
+    assert list(cache.pixmaps) == ["CZ", "JP"]
+
+
+def test_disk_tier(tmp_path, monkeypatch):
+    monkeypatch.setattr(currency_api, "get_flag_image", lambda *args: b"png")
+    directory = str(tmp_path)
+    assert get_cached_flag_image("QQ", download=False, directory=directory) is None
+    assert get_cached_flag_image("QQ", directory=directory) == b"png"
+
+    monkeypatch.setattr(currency_api, "get_flag_image", lambda *args: None)
+    assert get_cached_flag_image("QQ", download=False, directory=directory) == b"png"
+    assert os.path.isfile(flag_cache_path("QQ", directory=directory))
+
+
+def test_stopped_prefetch_downloads_nothing(qapp, downloads):
+    cache = FlagCache(35, 22)
+    cache.stop()
+    cache.prefetch(["QQ", "QR"])
+    cache.prefetch_pool.waitForDone()
+    assert downloads == []
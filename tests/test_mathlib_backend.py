@@ -0,0 +1,72 @@
+"""
+@file test_mathlib_backend.py
+@brief File containing the tests of the numeric backends of the math library.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import decimal
+import threading
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from standard import mathlib
+from standard.mathlib_backend import DecimalBackend, FloatBackend, get_backend, resolve_backend, use_backend
+
+
+def test_float_backend_is_the_default():
+    assert isinstance(get_backend(), FloatBackend)
+    assert mathlib.add(0.1, 0.2) == 0.3
+    assert mathlib.div(1, 3) == round(1 / 3, 14)
+
+
+def test_decimal_backend_precision():
+    assert mathlib.div(1, 3, backend=DecimalBackend(50)) == Decimal("0." + "3" * 50)
+    assert mathlib.add(0.1, 0.2, backend="decimal") == Decimal("0.3")
+    assert mathlib.root(2, 2, backend=DecimalBackend(40)) == Decimal("1.414213562373095048801688724209698078570")
+
+
+def test_decimal_backend_leaves_the_thread_context_alone():
+    before = decimal.getcontext().prec
+    mathlib.div(1, 7, backend=DecimalBackend(80))
+    assert decimal.getcontext().prec == before
+
+
+def test_fraction_backend_is_exact():
+    assert mathlib.div(1, 3, backend="fraction") == Fraction(1, 3)
+    assert mathlib.mul(0.1, 3, backend="fraction") == Fraction(3, 10)
+    assert mathlib.pow(Fraction(2, 3), 3, backend="fraction") == Fraction(8, 27)
+    assert mathlib.fac(5, backend="fraction") == Fraction(120)
+
+
+def test_use_backend_is_scoped():
+    with use_backend("fraction"):
+        assert mathlib.div(1, 4) == Fraction(1, 4)
+    assert isinstance(get_backend(), FloatBackend)
+
+
+def test_backend_is_per_thread():
+    seen = []
+    with use_backend("decimal"):
+        thread = threading.Thread(target=lambda: seen.append(get_backend()))
+        thread.start()
+        thread.join()
+    assert isinstance(seen[0], FloatBackend)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        resolve_backend("double")
+
+
+@pytest.mark.parametrize("backend", ["float", "decimal", "fraction"])
+def test_errors_do_not_depend_on_the_backend(backend):
+    with pytest.raises(ZeroDivisionError):
+        mathlib.div(1, 0, backend=backend)
+    with pytest.raises(ValueError):
+        mathlib.pow(0, 0, backend=backend)
+    with pytest.raises(ValueError):
+        mathlib.root(-4, 2, backend=backend)
@@ -0,0 +1,138 @@
+"""
+@file test_mathlib_batch.py
+@brief File containing the scalar and batch parity tests of the math library.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from standard import mathlib
+from standard import mathlib_batch as batch
+
+
+def test_fac_matches_scalar_up_to_the_float_limit():
+    numbers = np.arange(batch.FACTORIAL_LIMIT + 1)
+    result = batch.fac(numbers)
+    assert not result.mask.any()
+    assert result.values.tolist() == [float(mathlib.fac(int(n))) for n in numbers]
+
+
+@pytest.mark.parametrize("num", [batch.FACTORIAL_LIMIT + 1, batch.FACTORIAL_LIMIT + 2, 1000])
+def test_fac_beyond_the_float_limit(num):
+    # The scalar fac stays exact, the batch fac rounds it to float64 and overflows to inf
+    exact = mathlib.fac(num)
+    assert exact > sys.float_info.max
+    result = batch.fac([num])
+    assert not result.mask[0]
+    assert result.errors[0] == batch.OK
+    assert result.values[0] == np.inf
+
+
+def test_fac_boundary():
+    result = batch.fac([batch.FACTORIAL_LIMIT, batch.FACTORIAL_LIMIT + 1])
+    assert result.values[0] == float(mathlib.fac(batch.FACTORIAL_LIMIT))
+    assert result.values[1] == np.inf
+
+
+@pytest.mark.parametrize("num", [-1, -170])
+def test_fac_negative_matches_scalar_error(num):
+    result = batch.fac([num])
+    assert result.mask[0]
+    with pytest.raises(batch.ERROR_TYPES[int(result.errors[0])]):
+        mathlib.fac(num)
+
+
+CODES = {error: code for code, error in batch.ERROR_TYPES.items()}
+
+
+def scalar_results(function, *operands):
+    """
+    @brief Applies a scalar mathlib function element by element
+    @return Tuple of the float results (NaN where it raised) and the error codes
+    """
+    values, errors = [], []
+    for arguments in zip(*operands):
+        try:
+            values.append(float(function(*arguments)))
+            errors.append(batch.OK)
+        except tuple(CODES) as e:
+            values.append(np.nan)
+            errors.append(CODES[type(e)])
+    return values, errors
+
+
+def assert_parity(name, *operands):
+    result = getattr(batch, name)(*(np.asarray(operand) for operand in operands))
+    values, errors = scalar_results(getattr(mathlib, name), *operands)
+    assert result.errors.tolist() == errors
+    np.testing.assert_array_equal(result.values, values)
+
+
+def random_floats(rng, size):
+    # Integers, short decimals and floats of every magnitude, with some zeros
+    floats = np.concatenate([
+        rng.integers(-1000, 1000, size).astype(np.float64),
+        np.round(rng.uniform(-100, 100, size), 3),
+        rng.standard_normal(size) * 10.0 ** rng.integers(-12, 12, size),
+        np.zeros(4),
+    ])
+    return rng.permutation(floats).tolist()
+
+
+@pytest.mark.parametrize("name", ["add", "sub", "mul", "div", "mod"])
+def test_binary_parity(name):
+    rng = np.random.default_rng(1)
+    left = random_floats(rng, 500)
+    right = random_floats(rng, 500)
+    assert_parity(name, left, right)
+
+
+def test_pow_parity():
+    rng = np.random.default_rng(2)
+    bases = random_floats(rng, 300)
+    exponents = rng.integers(-2, 40, len(bases)).tolist()
+    exponents[:3] = [0, 0, 0]
+    bases[:3] = [0.0, 2.0, -1.5]
+    assert_parity("pow", bases, exponents)
+
+
+def test_pow_overflows_to_inf():
+    result = batch.pow([10.0, -10.0], [100, 101])
+    assert result.values.tolist() == [np.inf, -np.inf]
+    assert mathlib.pow(10.0, 100) == np.inf
+
+
+def test_root_parity():
+    rng = np.random.default_rng(3)
+    bases = random_floats(rng, 300) + [8.0, 27.0, 1024.0, -32.0, 2.0 ** 60]
+    indexes = rng.integers(-1, 12, len(bases)).tolist()
+    indexes[-5:] = [3, 3, 10, 5, 60]
+    assert_parity("root", bases, indexes)
+
+
+def test_root_beyond_the_vectorized_indexes():
+    index = batch.ROOT_INDEX_LIMIT + 7
+    assert_parity("root", [2.0, 1e300, 0.5], [index, index, index])
+
+
+def test_abs_and_broadcasting():
+    result = batch.add([1.0, 2.0, 3.0], 0.1)
+    assert result.values.tolist() == [mathlib.add(x, 0.1) for x in (1.0, 2.0, 3.0)]
+    assert batch.abs([-2.5, 0.0, 3.0]).values.tolist() == [2.5, 0.0, 3.0]
+
+
+def test_raise_first():
+    result = batch.div([1.0, 2.0, 3.0], [1.0, 0.0, 0.0])
+    assert result.mask.tolist() == [False, True, True]
+    with pytest.raises(ZeroDivisionError):
+        result.raise_first()
+    batch.add([1.0], [2.0]).raise_first()
+
+
+def test_batch_is_exposed_lazily_on_mathlib():
+    assert mathlib.batch is batch
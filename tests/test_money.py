@@ -0,0 +1,120 @@
+"""
+@file test_money.py
+@brief File containing the tests of the fixed-point money arithmetic.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from currency.money import (Money, convert_minor, convert_minor_array, exponent, format_minor, parse_minor_array,
+                            round_fraction)
+
+
+def test_exponents_follow_iso_4217():
+    assert [exponent(code) for code in ("jpy", "EUR", "KWD", "CLF", "XYZ")] == [0, 2, 3, 4, 2]
+
+
+@pytest.mark.parametrize("minor, places, text", [
+    (0, 2, "0.00"), (5, 2, "0.05"), (-5, 3, "-0.005"), (123456, 2, "1234.56"), (12, 0, "12"), (12, -1, "120"),
+])
+def test_format_minor(minor, places, text):
+    assert format_minor(minor, places) == text
+
+
+@pytest.mark.parametrize("text, currency, minor", [
+    ("1.005", "EUR", 100), ("1.015", "EUR", 102), ("-2.5", "JPY", -2), ("0.1235", "KWD", 124), (" 7 ", "usd", 700),
+])
+def test_parse_rounds_half_even_to_the_minor_unit(text, currency, minor):
+    assert Money.parse(text, currency) == Money(minor, currency)
+
+
+def test_parse_half_up():
+    assert Money.parse("2.5", "JPY", ROUND_HALF_UP).minor == 3
+    assert Money.parse("-2.5", "JPY", ROUND_HALF_UP).minor == -3
+
+
+@pytest.mark.parametrize("text", ["", "abc", "nan", "inf", "1e30", "1,5"])
+def test_parse_rejects_invalid_amounts(text):
+    with pytest.raises(ValueError):
+        Money.parse(text, "EUR")
+
+
+def test_arithmetic_and_formatting():
+    total = Money.parse("0.10", "EUR") + Money.parse("0.20", "EUR")
+    assert total == Money.parse("0.30", "EUR")
+    assert str(-total) == "-0.30"
+    assert str(Money(5, "JPY")) == "5"
+    with pytest.raises(ValueError):
+        Money(1, "EUR") + Money(1, "USD")
+
+
+def test_convert_is_exact():
+    # 0.1 * 3 is 0.30000000000000004 in floats
+    assert convert_minor(10, 1, 3, 0) == 30
+    assert Money.parse("10", "EUR").convert("JPY", 1, "161.5") == Money(1615, "JPY")
+
+
+def test_convert_between_exponents():
+    assert str(Money.parse("1000", "JPY").convert("EUR", "161.5", 1)) == "6.19"
+    assert str(Money.parse("1", "EUR").convert("KWD", 1, "0.3312")) == "0.331"
+    assert str(Money.parse("0.5", "EUR").convert("JPY", 1, 1)) == "0"
+    assert str(Money.parse("0.5", "EUR").convert("JPY", 1, 1, ROUND_HALF_UP)) == "1"
+
+
+def test_round_fraction():
+    assert [round_fraction(Fraction(n, 2)) for n in (1, 3, -1, -3)] == [0, 2, 0, -2]
+    assert [round_fraction(Fraction(n, 2), ROUND_HALF_UP) for n in (1, 3, -1, -3)] == [1, 2, -1, -2]
+    with pytest.raises(ValueError):
+        round_fraction(Fraction(1, 2), "ROUND_DOWN")
+
+
+def test_convert_rejects_invalid_rates():
+    with pytest.raises(ValueError):
+        convert_minor(100, "nan", 1, 0)
+    with pytest.raises(ZeroDivisionError):
+        convert_minor(100, 0, 1, 0)
+
+
+@pytest.mark.parametrize("rounding", [ROUND_HALF_EVEN, ROUND_HALF_UP])
+def test_parse_minor_array_matches_parse(rounding):
+    texts = ["1.005", "1.015", "-2.5", "0.125", "123456789012.345", "1e-30", "99999999999999999.5"]
+    currencies = ["EUR", "EUR", "JPY", "USD", "EUR", "EUR", "JPY"]
+    exponents = [Money.parse("0", c).exponent for c in currencies]
+    minor, valid = parse_minor_array(texts, exponents, rounding)
+    assert valid.all()
+    assert minor.tolist() == [Money.parse(t, c, rounding).minor for t, c in zip(texts, currencies)]
+
+
+def test_parse_minor_array_marks_invalid_rows():
+    minor, valid = parse_minor_array(["1e30", "x", "nan", "1.5", "1e400", "9.3e18"], [2] * 6)
+    assert valid.tolist() == [False, False, False, True, False, False]
+    assert minor[3] == 150
+
+
+def test_convert_minor_array_matches_convert_minor():
+    minor = np.array([1000, 1, 5, -5, 10 ** 15])
+    base = np.array([1.0, 1.0, 2.0, 2.0, 1.1])
+    target = np.array([1.1, 0.5, 1.0, 1.0, 1.3])
+    shifts = np.array([0, 0, 0, 0, 1])
+    result, valid = convert_minor_array(minor, base, target, shifts)
+    assert valid.all()
+    assert result.tolist() == [convert_minor(*args) for args in zip(minor.tolist(), base, target, shifts.tolist())]
+
+
+@pytest.mark.parametrize("rounding", [ROUND_HALF_EVEN, ROUND_HALF_UP])
+def test_convert_minor_array_resolves_ties_and_large_amounts_exactly(rounding):
+    # Ties, and amounts whose float product is no longer exact
+    minor = np.array([5, 15, -25, 2 ** 53 + 1, 3 * 10 ** 16])
+    base = np.array([2.0, 10.0, 10.0, 1.0, 3.0])
+    target = np.array([1.0, 1.0, 1.0, 1.1, 1.1])
+    shifts = np.array([0, 0, 0, 0, 0])
+    result, valid = convert_minor_array(minor, base, target, shifts, rounding)
+    assert valid.all()
+    expected = [convert_minor(*args, rounding) for args in zip(minor.tolist(), base, target, shifts.tolist())]
+    assert result.tolist() == expected
@@ -0,0 +1,67 @@
+"""
+@file test_photomath_preview.py
+@brief File containing the tests of the live result preview of Expression mode.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+
+from expression.expression_incremental import estimate_digits
+from expression.photomath_mode import PREVIEW_DIGITS, PhotomathMode
+
+
+@pytest.fixture
+def mode(qapp):
+    widget = PhotomathMode()
+    widget.currentExpression = ""
+    yield widget
+    widget.close()
+
+
+def type_text(mode, text):
+    for char in text:
+        if char.isdigit():
+            mode.show_numbers(char)
+        else:
+            mode.show_operators(char)
+
+
+@pytest.mark.parametrize("text, digits", [("12345", 5), ("2^10", 4), ("0.5", 0), ("170!", 307), ("5×", 1)])
+def test_estimate_digits(text, digits):
+    assert estimate_digits(text) == digits
+
+
+@pytest.mark.parametrize("text", ["25000!", "10^400", "(2^1000)×3", "25000!×25000!×"])
+def test_estimate_digits_beyond_floats(text):
+    assert estimate_digits(text) > PREVIEW_DIGITS
+
+
+def test_cheap_preview_is_computed_right_away(mode):
+    type_text(mode, "2+3")
+    assert mode.previewFuture is None
+    assert mode.previewLabel.text() == "= 5"
+
+
+def test_first_expensive_preview_goes_to_the_worker(qapp, mode):
+    type_text(mode, "25000")
+    mode.handle_factorial()
+    assert mode.previewFuture is not None
+    assert mode.previewLabel.text() == "= 25000"
+
+    mode.previewFuture.result()
+    qapp.processEvents()
+    assert mode.previewLabel.text() == "= 5.44792e+99093"
+
+
+def test_decimal_point_and_exponentiation_update_the_preview(mode):
+    mode.currentExpression = "2+3"
+    mode.handle_decimal_point()
+    assert mode.currentExpression == "2+3."
+    assert mode.previewLabel.text() == "= 5"
+    mode.handle_clear()
+    type_text(mode, "2+3")
+    mode.handle_exponentiation()
+    assert mode.currentExpression == "2+3^"
+    assert mode.previewLabel.text() == ""
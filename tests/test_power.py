@@ -0,0 +1,74 @@
+"""
+@file test_power.py
+@brief File containing the tests of the power engine.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import math
+
+import pytest
+
+from standard import mathlib
+from standard.power import bounded_pow, estimate_log10, mod_pow, power, power_scientific, square_multiply
+
+
+@pytest.mark.parametrize("base, exponent", [(3, 0), (3, 1), (-2, 7), (7, 100), (1.5, 9), (0, 5)])
+def test_square_multiply_matches_the_operator(base, exponent):
+    assert square_multiply(base, exponent) == base ** exponent
+
+
+def test_mod_pow_matches_pow():
+    assert mod_pow(3, 10 ** 6, 1000003) == pow(3, 10 ** 6, 1000003)
+    assert mod_pow(5, 0, 1) == 0
+    with pytest.raises(ValueError):
+        mod_pow(2, 3, 0)
+
+
+def test_bounded_pow_stops_at_the_bound():
+    assert bounded_pow(10, 5, 10 ** 6) == 10 ** 5
+    with pytest.raises(OverflowError):
+        bounded_pow(10, 10 ** 9, 10 ** 100)
+    assert bounded_pow(0.5, 3, 1) == 0.125
+
+
+def test_estimate_log10():
+    assert estimate_log10(10, 300) == pytest.approx(300)
+    assert estimate_log10(0, 3) == -math.inf
+    assert estimate_log10(0, 0) == 0
+
+
+def test_power_overflows_early():
+    # Would take ages if the power were computed
+    assert power(10, 10 ** 12, 1e100) == math.inf
+    assert power(-10, 10 ** 12 + 1, 1e100) == -math.inf
+
+
+@pytest.mark.parametrize("base, exponent", [(10, 99), (10, 100), (-10, 101), (1e50, 2), (9.999999999, 100)])
+def test_power_decides_near_the_limit_exactly(base, exponent):
+    exact = base ** exponent
+    if abs(exact) >= 1e100:
+        assert power(base, exponent, 1e100) == math.copysign(math.inf, exact)
+    else:
+        # Square-and-multiply rounds float bases differently in the last bits
+        assert power(base, exponent, 1e100) == pytest.approx(exact, rel=1e-12)
+
+
+def test_power_without_a_limit_is_exact():
+    assert power(3, 200) == 3 ** 200
+
+
+def test_power_scientific():
+    assert power_scientific(2, 10) == "1.02400e+03"
+    assert power_scientific(-3, 3) == "-2.70000e+01"
+    assert power_scientific(7, 10 ** 7).endswith("e+8450980")
+
+
+def test_mathlib_pow():
+    assert mathlib.pow(2, 10) == 1024
+    assert mathlib.pow(10.0, 100) == math.inf
+    with pytest.raises(TypeError):
+        mathlib.pow(2, -1)
+    with pytest.raises(TypeError):
+        mathlib.pow(2, 1.5)
@@ -0,0 +1,90 @@
+"""
+@file test_rate_cache.py
+@brief File containing the tests of the in-memory exchange rate cache.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+from currency import currency_api
+from currency.currency_api import RateCache
+from currency.currency_providers import ProviderError, RateProvider, RateResponse
+
+RATES = {"EUR": 1, "USD": 1.1}
+
+
+class RevalidatingProvider(RateProvider):
+    name = "revalidating"
+
+    def __init__(self, rates=RATES):
+        self.rates = rates
+        self.requests = []
+        self.offline = False
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        self.requests.append((etag, last_modified))
+        if self.offline:
+            raise ProviderError("offline")
+        if etag == "v1":
+            return RateResponse(None, None, etag, last_modified, True)
+        return RateResponse(dict(self.rates), "2026-10-16", "v1", "Fri, 16 Oct 2026 00:00:00 GMT", False)
+
+
+def test_rates_are_served_from_memory_within_the_ttl():
+    source = RevalidatingProvider()
+    cache = RateCache(source, snapshot_dir=None)
+    rates = cache.get_rates()
+    assert cache.get_rates() is rates
+    assert len(source.requests) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    assert cache.is_fresh()
+
+
+def test_expired_rates_are_revalidated_with_the_validators(monkeypatch):
+    source = RevalidatingProvider()
+    cache = RateCache(source, snapshot_dir=None)
+    rates = cache.get_rates()
+
+    now = currency_api.time.monotonic()
+    monkeypatch.setattr(currency_api.time, "monotonic", lambda: now + cache.ttl + 1)
+    assert not cache.is_fresh()
+    # Not modified, the same document is kept and fresh again
+    assert cache.get_rates() is rates
+    assert source.requests[-1] == ("v1", "Fri, 16 Oct 2026 00:00:00 GMT")
+    assert cache.is_fresh()
+
+
+def test_failed_fetch_keeps_the_rates():
+    source = RevalidatingProvider()
+    cache = RateCache(source, ttl=0, snapshot_dir=None)
+    rates = cache.get_rates()
+    source.offline = True
+    assert not cache.fetch()
+    assert cache.get_rates() is rates
+
+
+def test_no_rates_without_a_provider():
+    source = RevalidatingProvider()
+    source.offline = True
+    cache = RateCache(source, snapshot_dir=None)
+    assert cache.get_rates() is None
+    assert cache.table() is None
+
+
+def test_set_source_forgets_the_rates():
+    cache = RateCache(RevalidatingProvider(), snapshot_dir=None)
+    cache.get_rates()
+    other = RevalidatingProvider({"EUR": 1, "CZK": 25})
+    cache.set_source(other)
+    assert cache.cached_rates() is None
+    assert cache.stats() == {"hits": 0, "misses": 0}
+    assert cache.get_rates() == {"EUR": 1, "CZK": 25}
+    # Validators of the old provider are not sent to the new one
+    assert other.requests == [(None, None)]
+
+
+def test_table_is_reused_while_the_rates_do_not_change():
+    cache = RateCache(RevalidatingProvider(), snapshot_dir=None)
+    table = cache.table()
+    assert cache.table() is table
+    assert cache.table({"EUR": 1}) is not table
@@ -0,0 +1,42 @@
+"""
+@file test_rate_fixture.py
+@brief File containing the sanity tests of the fixture rates document.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+
+from currency.currency_providers import FileRateProvider
+from currency.fake_rate_server import FIXTURE_PATH
+from currency.rate_table import RateTable
+
+
+@pytest.fixture(scope="module")
+def response():
+    return FileRateProvider(FIXTURE_PATH).fetch_rates()
+
+
+def test_fixture_is_dated(response):
+    assert response.date == "2026-09-14"
+    assert response.rates["EUR"] == 1
+
+
+@pytest.mark.parametrize("base, target, low, high", [
+    ("EUR", "USD", 0.8, 1.6),
+    ("USD", "JPY", 80, 250),
+    ("EUR", "CZK", 20, 30),
+    ("GBP", "EUR", 1.0, 1.4),
+    ("USD", "BHD", 0.37, 0.38),
+    ("EUR", "XOF", 655, 656),
+])
+def test_cross_rates_are_plausible(response, base, target, low, high):
+    assert low < RateTable(response.rates).rate(base, target) < high
+
+
+def test_pegs_hold(response):
+    table = RateTable(response.rates)
+    assert table.rate("USD", "AED") == pytest.approx(3.6725, rel=1e-5)
+    assert table.rate("GBP", "GIP") == 1
+    assert table.rate("EUR", "BGN") == 1.95583
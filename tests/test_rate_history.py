@@ -0,0 +1,99 @@
+"""
+@file test_rate_history.py
+@brief File containing the tests of the historical exchange rate store.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import datetime
+
+import pytest
+
+from currency.currency_providers import HistoryRateProvider, ProviderError
+from currency.rate_history import MAX_GAP_DAYS, SERIES_CAPACITY, RateHistory, RateSeries, day_ordinal
+
+MONDAY = datetime.date(2026, 10, 12).toordinal()
+
+
+def test_day_ordinal():
+    assert day_ordinal("2026-10-12") == MONDAY
+    assert day_ordinal(" 2026-10-12T16:00:00 ") == MONDAY
+    assert day_ordinal(datetime.date(2026, 10, 12)) == MONDAY
+    with pytest.raises(ValueError):
+        day_ordinal("12.10.2026")
+
+
+def test_series_append_grows_and_replaces():
+    series = RateSeries()
+    for i in range(SERIES_CAPACITY * 3):
+        series.append(MONDAY + i, float(i))
+    series.append(MONDAY, 99.0)
+    series.append(MONDAY + 1, 98.0)
+    assert len(series) == SERIES_CAPACITY * 3
+    assert series.rates[:2].tolist() == [99.0, 98.0]
+    assert series.days.tolist() == sorted(series.days.tolist())
+
+
+def test_series_extend_merges_in_any_order():
+    series = RateSeries([MONDAY, MONDAY + 2], [1.0, 1.2])
+    series.extend([MONDAY + 3, MONDAY + 1, MONDAY + 2], [1.3, 1.1, 1.25])
+    assert series.days.tolist() == [MONDAY, MONDAY + 1, MONDAY + 2, MONDAY + 3]
+    assert series.rates.tolist() == [1.0, 1.1, 1.25, 1.3]
+
+
+def test_rate_on_covers_weekends_up_to_the_gap():
+    series = RateSeries([MONDAY, MONDAY + 4], [1.0, 1.4])
+    assert series.rate_on(MONDAY - 1) is None
+    assert series.rate_on(MONDAY + 2) == 1.0
+    assert series.rate_on(MONDAY + 6) == 1.4
+    assert series.rate_on(MONDAY + 4 + MAX_GAP_DAYS) == 1.4
+    assert series.rate_on(MONDAY + 5 + MAX_GAP_DAYS) is None
+
+
+def test_history_lookups():
+    history = RateHistory(path=None)
+    assert history.date_range() is None
+    history.add_snapshot(MONDAY, {"usd": 1.1, "CZK": 25})
+    history.add_snapshot(MONDAY + 1, {"USD": 1.2})
+    assert history.rate_on("USD", MONDAY) == 1.1
+    assert history.rate_on("usd", MONDAY + 3) == 1.2
+    assert history.rate_on("GBP", MONDAY) is None
+    assert history.rates_on(MONDAY + 1) == {"USD": 1.2, "CZK": 25}
+    assert history.date_range() == (MONDAY, MONDAY + 1)
+
+
+def test_version_changes_with_the_history():
+    history = RateHistory(path=None)
+    version = history.version
+    history.add_snapshot(MONDAY, {"USD": 1.1})
+    assert history.version > version
+
+
+def test_history_file_round_trip(tmp_path):
+    path = str(tmp_path / "history.npz")
+    history = RateHistory(path)
+    history.add_snapshot(MONDAY, {"USD": 1.1, "JPY": 161.5})
+    reloaded = RateHistory(path)
+    assert reloaded.rates_on(MONDAY) == {"USD": 1.1, "JPY": 161.5}
+
+
+def test_broken_history_file_is_empty(tmp_path, capsys):
+    path = tmp_path / "history.npz"
+    path.write_bytes(b"not a zip file")
+    assert RateHistory(str(path)).date_range() is None
+    assert "Error loading rate history" in capsys.readouterr().out
+
+
+def test_history_provider_revalidates_by_version():
+    history = RateHistory(path=None)
+    provider = HistoryRateProvider(history)
+    with pytest.raises(ProviderError):
+        provider.fetch_rates()
+    history.add_snapshot(MONDAY, {"USD": 1.1})
+    response = provider.fetch_rates()
+    assert response.rates == {"USD": 1.1}
+    assert response.date == "2026-10-12"
+    assert provider.fetch_rates(etag=response.etag).not_modified
+    history.add_snapshot(MONDAY, {"USD": 1.2})
+    assert provider.fetch_rates(etag=response.etag).rates == {"USD": 1.2}
@@ -0,0 +1,116 @@
+"""
+@file test_rate_import.py
+@brief File containing the tests of the streaming import of central bank rate files.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import codecs
+import io
+
+import pytest
+
+from currency import currency_api, rate_history
+from currency.currency_api import RateCache
+from currency.currency_providers import HistoryRateProvider
+from currency.rate_history import RateHistory, day_ordinal, iter_csv_rates, iter_xml_rates
+
+MONDAY = day_ordinal("2026-10-12")
+
+ECB_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary">
+  <gesmes:subject>Reference rates</gesmes:subject>
+  <Cube>
+    <Cube time="2026-10-13">
+      <Cube currency="USD" rate="1.2"/>
+      <Cube currency="JPY" rate="161.5"/>
+    </Cube>
+    <Cube time="2026-10-12">
+      <Cube currency="USD" rate="1.1"/>
+      <Cube currency="CZK">25.0</Cube>
+      <Cube currency="GBP" rate="N/A"/>
+    </Cube>
+  </Cube>
+</gesmes:Envelope>
+"""
+
+WIDE_CSV = "Date,USD,JPY,\n2026-10-13,1.2,161.5,\n2026-10-12,1.1,N/A,\nnot a date,1.0,1.0,\n"
+
+
+def test_csv_wide_layout():
+    assert list(iter_csv_rates(io.StringIO(WIDE_CSV))) == [
+        (MONDAY + 1, "USD", 1.2), (MONDAY + 1, "JPY", 161.5), (MONDAY, "USD", 1.1),
+    ]
+
+
+def test_csv_long_layout():
+    text = "date,currency,rate\n2026-10-12,usd,1.1\n2026-10-12,CZK,x\n2026-10-12,GBP\n"
+    assert list(iter_csv_rates(io.StringIO(text))) == [(MONDAY, "usd", 1.1)]
+
+
+def test_csv_without_header():
+    with pytest.raises(ValueError):
+        list(iter_csv_rates(io.StringIO("")))
+
+
+def test_xml_ecb_layout():
+    assert list(iter_xml_rates(io.BytesIO(ECB_XML))) == [
+        (MONDAY + 1, "USD", 1.2), (MONDAY + 1, "JPY", 161.5), (MONDAY, "USD", 1.1), (MONDAY, "CZK", 25.0),
+    ]
+
+
+def test_invalid_xml():
+    with pytest.raises(ValueError):
+        list(iter_xml_rates(io.BytesIO(b"<Cube time='2026-10-12'><Cube currency='USD'")))
+
+
+def test_import_records_in_chunks_matches_one_chunk(monkeypatch):
+    records = list(iter_xml_rates(io.BytesIO(ECB_XML)))
+    whole = RateHistory(path=None)
+    assert whole.import_records(records) == 4
+    monkeypatch.setattr(rate_history, "IMPORT_CHUNK", 1)
+    chunked = RateHistory(path=None)
+    assert chunked.import_records(reversed(records)) == 4
+    for day in (MONDAY, MONDAY + 1):
+        assert chunked.rates_on(day) == whole.rates_on(day)
+    assert whole.rates_on(MONDAY + 1) == {"EUR": 1.0, "USD": 1.2, "JPY": 161.5, "CZK": 25.0}
+
+
+@pytest.mark.parametrize("name, data", [
+    ("rates.xml", ECB_XML),
+    ("rates.dat", ECB_XML),
+    ("rates.csv", codecs.BOM_UTF8 + WIDE_CSV.encode()),
+])
+def test_import_file_detects_the_format_and_saves(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    history = RateHistory(str(tmp_path / "history.npz"))
+    assert history.import_file(str(path), base="USD") > 0
+    assert RateHistory(str(tmp_path / "history.npz")).rate_on("USD", MONDAY + 1) == 1.0
+    assert history.rate_on("JPY", MONDAY + 1) == 161.5
+
+
+def test_import_rates_serves_the_latest_day_offline(tmp_path, monkeypatch):
+    path = tmp_path / "rates.xml"
+    path.write_bytes(ECB_XML)
+    monkeypatch.setattr(rate_history, "rate_history", RateHistory(str(tmp_path / "history.npz")))
+    monkeypatch.setattr(currency_api, "provider", currency_api.provider)
+    monkeypatch.setattr(currency_api, "rate_cache", RateCache(currency_api.provider, snapshot_dir=None))
+
+    assert currency_api.import_rates(str(path)) == 4
+    assert isinstance(currency_api.provider, HistoryRateProvider)
+    assert currency_api.get_exchange_rate("eur", "jpy") == (1.0, 161.5)
+
+
+def test_import_rates_without_serving_keeps_the_provider(tmp_path, monkeypatch):
+    path = tmp_path / "rates.csv"
+    path.write_text(WIDE_CSV)
+    history = RateHistory(str(tmp_path / "history.npz"))
+    monkeypatch.setattr(rate_history, "rate_history", history)
+    monkeypatch.setattr(currency_api, "provider", currency_api.provider)
+    previous = currency_api.provider
+
+    assert currency_api.import_rates(str(path), base="EUR", serve=False) == 3
+    assert currency_api.provider is previous
+    assert history.rate_on("USD", MONDAY) == 1.1
@@ -0,0 +1,64 @@
+"""
+@file test_rate_loader.py
+@brief File containing the tests of the exchange rate loading on a worker thread.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import threading
+
+import pytest
+
+from currency import currency_worker
+from currency.currency_api import RateCache
+from currency.currency_providers import ProviderError, RateProvider, RateResponse
+
+
+class BlockingProvider(RateProvider):
+    name = "blocking"
+
+    def __init__(self, rates):
+        self.rates = rates
+        self.release = threading.Event()
+        self.calls = 0
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        self.calls += 1
+        self.release.wait(5)
+        if self.rates is None:
+            raise ProviderError("offline")
+        return RateResponse(self.rates, None, None, None, False)
+
+
+def load(qapp, monkeypatch, rates):
+    """
+    @brief Requests the rates twice while the download blocks, then lets it finish
+    @return Tuple of the provider and the list of the published results
+    """
+    source = BlockingProvider(rates)
+    monkeypatch.setattr(currency_worker, "rate_cache", RateCache(source, snapshot_dir=None))
+    loader = currency_worker.RateLoader()
+    results = []
+    loader.rates_ready.connect(results.append)
+
+    loader.load()
+    loader.load()
+    # load returned while the download is still running
+    assert loader.in_flight and results == []
+    source.release.set()
+    loader.pool.waitForDone()
+    qapp.processEvents()
+    assert not loader.in_flight
+    return source, results
+
+
+def test_requests_during_a_download_share_it(qapp, monkeypatch):
+    source, results = load(qapp, monkeypatch, {"EUR": 1, "USD": 1.1})
+    assert source.calls == 1
+    assert results == [{"EUR": 1, "USD": 1.1}]
+
+
+def test_failed_download_publishes_none(qapp, monkeypatch):
+    _, results = load(qapp, monkeypatch, None)
+    assert results == [None]
@@ -0,0 +1,107 @@
+"""
+@file test_rate_scheduler.py
+@brief File containing the tests of the background refresh of the exchange rates.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import pytest
+
+from currency import currency_worker
+from currency.currency_api import RateCache
+from currency.currency_providers import RateProvider, RateResponse
+
+
+class SequenceProvider(RateProvider):
+    name = "sequence"
+
+    def __init__(self, *rates):
+        self.rates = list(rates)
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        return RateResponse(self.rates.pop(0), None, None, None, False)
+
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = currency_worker.RateScheduler()
+    yield scheduler
+    scheduler.stop()
+
+
+def refresh(scheduler, monkeypatch, previous, rates):
+    """
+    @brief Runs one refresh from the previous to the new rates on the test thread
+    @return Tuple of the cache, its table of the previous rates and the result the task delivered
+    """
+    cache = RateCache(SequenceProvider(previous, rates), snapshot_dir=None, ttl=0)
+    monkeypatch.setattr(currency_worker, "rate_cache", cache)
+    previous = cache.get_rates()
+    table = cache.table(previous)
+    results = []
+    scheduler.task_finished.connect(results.append)
+    currency_worker.RefreshTask(scheduler, previous).run()
+    return cache, table, results[0]
+
+
+def test_refresh_reports_the_changed_codes(scheduler, monkeypatch):
+    _, _, changed = refresh(scheduler, monkeypatch, {"EUR": 1, "USD": 1.1, "GBP": 0.8},
+                            {"EUR": 1, "USD": 1.2, "CZK": 25})
+    assert changed == {"USD", "GBP", "CZK"}
+
+
+def test_refresh_leaves_the_cached_table_alone(scheduler, monkeypatch):
+    cache, table, changed = refresh(scheduler, monkeypatch, {"EUR": 1, "USD": 1.1}, {"EUR": 1, "USD": 1.2})
+    assert changed == {"USD"}
+    assert cache._table[1] is table
+
+
+def test_start_schedules_within_the_jitter(scheduler):
+    scheduler.interval = 100
+    scheduler.jitter = 0.1
+    scheduler.start()
+    assert scheduler.timer.isActive()
+    assert 90000 <= scheduler.timer.interval() <= 110000
+    scheduler.stop()
+    assert not scheduler.timer.isActive()
+
+
+def test_failures_back_off_up_to_the_interval(qapp):
+    scheduler = currency_worker.RateScheduler(interval=30, jitter=0, backoff=5)
+    scheduler.start()
+    delays = []
+    for _ in range(4):
+        scheduler.on_task_finished(None)
+        delays.append(scheduler.timer.interval())
+    assert delays == [5000, 10000, 20000, 30000]
+    scheduler.on_task_finished(frozenset())
+    assert scheduler.failures == 0
+    assert scheduler.timer.interval() == 30000
+    scheduler.stop()
+
+
+def test_rates_changed_is_emitted_only_for_changes(scheduler):
+    emitted = []
+    scheduler.rates_changed.connect(emitted.append)
+    scheduler.on_task_finished(frozenset())
+    scheduler.on_task_finished(None)
+    scheduler.on_task_finished(frozenset({"USD"}))
+    assert emitted == [{"USD"}]
+    # A stopped scheduler does not schedule another refresh
+    assert not scheduler.timer.isActive()
+
+
+def test_refresh_waits_for_the_first_rates(scheduler, monkeypatch):
+    monkeypatch.setattr(currency_worker, "rate_cache", RateCache(SequenceProvider(), snapshot_dir=None))
+    scheduler.refresh()
+    assert not scheduler.in_flight
+    assert scheduler.timer.isActive()
+
+
+def test_refresh_skips_while_one_is_running(scheduler, monkeypatch):
+    monkeypatch.setattr(currency_worker, "rate_cache", None)
+    scheduler.in_flight = True
+    # The cache is not even read
+    scheduler.refresh()
+    assert scheduler.in_flight
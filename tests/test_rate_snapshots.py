@@ -0,0 +1,105 @@
+"""
+@file test_rate_snapshots.py
+@brief File containing the tests of the on-disk rate snapshots and the offline warm start.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import os
+import time
+
+import pytest
+
+from currency import currency_api
+from currency.currency_api import RateCache, load_snapshot, rotate_snapshots, save_snapshot, snapshot_files
+from currency.currency_providers import ProviderError, RateProvider, RateResponse
+
+
+class StaticProvider(RateProvider):
+    name = "static"
+
+    def __init__(self, rates=None):
+        self.rates = rates
+
+    def fetch_rates(self, etag=None, last_modified=None):
+        if self.rates is None:
+            raise ProviderError("offline")
+        return RateResponse(self.rates, "2026-10-16", None, None, False)
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    history = []
+    monkeypatch.setattr(currency_api, "record_history", lambda rates, date=None: history.append((rates, date)))
+    return history
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = save_snapshot({"EUR": 1, "USD": 1.1}, "static", str(tmp_path))
+    assert os.path.basename(path).startswith("rates-")
+    data = load_snapshot(str(tmp_path))
+    assert data["rates"] == {"EUR": 1, "USD": 1.1}
+    assert data["provider"] == "static"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_newest_readable_snapshot_wins(tmp_path):
+    save_snapshot({"EUR": 1, "USD": 1.0}, "old", str(tmp_path))
+    time.sleep(0.002)
+    save_snapshot({"EUR": 1, "USD": 1.2}, "new", str(tmp_path))
+    assert load_snapshot(str(tmp_path))["provider"] == "new"
+
+    with open(snapshot_files(str(tmp_path))[0], "w") as file:
+        file.write("{truncated")
+    assert load_snapshot(str(tmp_path))["provider"] == "old"
+
+
+def test_no_snapshot(tmp_path):
+    assert load_snapshot(str(tmp_path / "missing")) is None
+
+
+def test_rotation_keeps_the_newest(tmp_path):
+    for provider in ("a", "b", "c"):
+        save_snapshot({"EUR": 1}, provider, str(tmp_path))
+        time.sleep(0.002)
+    old = time.time() - 30 * 24 * 3600
+    for path in snapshot_files(str(tmp_path)):
+        os.utime(path, (old, old))
+    rotate_snapshots(str(tmp_path))
+    assert len(snapshot_files(str(tmp_path))) == 1
+    assert load_snapshot(str(tmp_path))["provider"] == "c"
+
+
+def test_fetch_saves_a_snapshot_and_the_history(tmp_path, recorded):
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": 1.1}), snapshot_dir=str(tmp_path))
+    assert cache.fetch()
+    assert load_snapshot(str(tmp_path))["rates"] == {"EUR": 1, "USD": 1.1}
+    assert recorded == [({"EUR": 1, "USD": 1.1}, "2026-10-16")]
+
+
+def test_warm_start_serves_stale_rates_and_refreshes(tmp_path, recorded):
+    save_snapshot({"EUR": 1, "USD": 1.5}, "old", str(tmp_path))
+    cache = RateCache(StaticProvider({"EUR": 1, "USD": 1.1}), snapshot_dir=str(tmp_path))
+    assert cache.warm_start()
+    assert cache.cached_rates() is not None
+
+    deadline = time.monotonic() + 5
+    while cache.stale and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache.stale
+    assert cache.cached_rates() == {"EUR": 1, "USD": 1.1}
+
+
+def test_warm_start_offline(tmp_path):
+    save_snapshot({"EUR": 1, "USD": 1.5}, "old", str(tmp_path))
+    cache = RateCache(StaticProvider(), snapshot_dir=str(tmp_path))
+    assert cache.warm_start()
+    assert cache.stale and cache.provider == "old"
+    # The stale rates are served for one TTL without blocking on the network
+    assert cache.get_rates() == {"EUR": 1, "USD": 1.5}
+
+
+def test_warm_start_without_snapshots(tmp_path):
+    assert not RateCache(StaticProvider(), snapshot_dir=str(tmp_path)).warm_start()
+    assert not RateCache(StaticProvider(), snapshot_dir=None).warm_start()
@@ -0,0 +1,74 @@
+"""
+@file test_rate_table.py
+@brief File containing the tests of the vectorized exchange rate table.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import numpy as np
+import pytest
+
+from currency.money import Money
+from currency.rate_table import RateTable
+
+RATES = {"EUR": 1, "USD": 1.1, "JPY": 161.5, "CZK": 25.0, "XXX": 0}
+
+
+@pytest.fixture
+def table():
+    return RateTable(RATES)
+
+
+def test_lookup(table):
+    assert len(table) == 5
+    assert "usd" in table and "GBP" not in table
+    assert table.position("jpy") == 2
+    with pytest.raises(KeyError):
+        table.position("GBP")
+
+
+def test_cross_rates(table):
+    assert table.rate("EUR", "USD") == 1.1
+    assert table.rate("USD", "CZK") == pytest.approx(25 / 1.1)
+    assert table.convert(10, "EUR", "CZK") == 250
+    assert table.convert([1, 2], "CZK", "EUR").tolist() == [0.04, 0.08]
+    with pytest.raises(ZeroDivisionError):
+        table.rate("XXX", "EUR")
+
+
+def test_matrix_matches_the_pair_rates(table):
+    codes = ["EUR", "USD", "JPY", "CZK"]
+    for i, base in enumerate(codes):
+        for j, target in enumerate(codes):
+            assert table.matrix[i, j] == pytest.approx(table.rate(base, target), rel=1e-15)
+    converted = table.convert_to_all(100, "USD")
+    assert converted["EUR"] == pytest.approx(100 / 1.1)
+    assert converted["USD"] == pytest.approx(100)
+
+
+def test_convert_money_is_exact(table):
+    assert table.convert_money(Money.parse("10", "EUR"), "jpy") == Money(1615, "JPY")
+    assert table.convert_money(Money.parse("0.10", "EUR"), "USD") == Money(11, "USD")
+
+
+def test_positions_and_pairs(table):
+    positions = table.positions(["usd", " EUR", "GBP", "usd"])
+    assert positions.tolist() == [1, 0, -1, 1]
+    bases = table.positions(["EUR", "USD", "GBP", "XXX"])
+    targets = table.positions(["CZK", "EUR", "EUR", "EUR"])
+    converted = table.convert_pairs([10, 11, 1, 1], bases, targets)
+    assert converted[:2].tolist() == [250, 10]
+    assert np.isnan(converted[2:]).all()
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        RateTable({"EUR": 1, "USD": "x"})
+
+
+def test_changed_codes(table):
+    assert table.changed_codes(RateTable(RATES)) == frozenset()
+    changed = RateTable({"EUR": 1, "USD": 1.2, "JPY": 161.5, "GBP": 0.8}).changed_codes(table)
+    assert changed == {"USD", "GBP", "CZK", "XXX"}
+    assert table.changed_codes(RateTable({})) == set(RATES)
@@ -0,0 +1,66 @@
+"""
+@file test_roots.py
+@brief File containing the tests of the exact integer nth-root engine.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from standard import mathlib
+from standard.roots import exact_root, integer_root, nth_root
+
+
+def test_integer_root_is_the_floor():
+    rng = random.Random(5)
+    for _ in range(500):
+        num = rng.getrandbits(rng.randrange(1, 3000))
+        index = rng.randrange(1, 80)
+        root = integer_root(num, index)
+        assert root ** index <= num < (root + 1) ** index
+
+
+@pytest.mark.parametrize("root, index", [(3, 2), (12345, 7), (2, 2000), (10 ** 40 + 7, 3), (987654321, 40)])
+def test_perfect_powers_are_exact(root, index):
+    assert exact_root(root ** index, index) == root
+    assert exact_root(root ** index + 1, index) is None
+    assert nth_root(root ** index, index) == root
+
+
+def test_large_indices_are_fast():
+    assert integer_root(2 ** 4000, 10 ** 6) == 1
+    assert integer_root(3 ** 100000, 50000) == 9
+
+
+def test_float_roots_are_correctly_rounded():
+    assert nth_root(2, 2) == 2 ** 0.5
+    assert nth_root(2.25, 2) == 1.5
+    assert nth_root(10 ** 400 + 1, 4) == 1e100
+
+
+def test_fraction_and_decimal_roots():
+    assert nth_root(Fraction(8, 27), 3) == Fraction(2, 3)
+    assert nth_root(Decimal(2), 2) == Decimal("1.414213562373095048801688724")
+    assert nth_root(2, 3, precision=30) == Decimal("1.25992104989487316476721060728")
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        nth_root(-8, 3)
+    with pytest.raises(TypeError):
+        nth_root(8, 0)
+    with pytest.raises(TypeError):
+        nth_root(8, 1.5)
+
+
+def test_mathlib_root():
+    assert mathlib.root(-27, 3) == -3
+    assert mathlib.root(0, 5) == 0
+    assert mathlib.root(2, 2) == round(2 ** 0.5, 14)
+    with pytest.raises(ValueError):
+        mathlib.root(-4, 2)
@@ -0,0 +1,70 @@
+"""
+@file test_standard_engine.py
+@brief File containing the tests of the Qt-free state machine of the standard calculator.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from standard.standard_engine import DisplayState, StandardEngine
+
+
+@pytest.mark.parametrize("keys, current", [
+    ("12+3=", "15"), ("2^10=", "1024"), ("3√27=", "3"), ("5!", "120"), ("7%3=", "1"),
+    ("1.5+1=", "2.5"), ("0.1+0.2=", "0.3"), ("12⌫", "1"), ("25!", "1.55112e+25"), ("100000!", "2.82423e+456573"),
+])
+def test_key_sequences(keys, current):
+    assert StandardEngine().replay(keys) == DisplayState(current, "", False)
+
+
+def test_absolute_value():
+    assert StandardEngine().replay(["-", "5", "|x|"]).current == "5"
+
+
+def test_chained_operators_show_the_total():
+    assert StandardEngine().replay("1+2+") == DisplayState("3", "3+", False)
+    # A second operator replaces the first one
+    assert StandardEngine().replay("1+*") == DisplayState("0", "1×", False)
+
+
+def test_division_by_zero_is_an_error_state():
+    engine = StandardEngine()
+    state = engine.replay("1/0=")
+    assert state.error and state.current == "Error: Cannot divide by zero"
+    assert engine.press("7") == DisplayState("7", "", False)
+
+
+def test_clear():
+    engine = StandardEngine()
+    engine.replay("12+3")
+    assert engine.press("C") == DisplayState("0", "", False)
+
+
+def test_unknown_key():
+    with pytest.raises(KeyError):
+        StandardEngine().press("x")
+
+
+def test_engine_does_not_import_qt():
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    code = ("import sys; import standard.standard_engine; "
+            "sys.exit(any(name.startswith('PySide6') for name in sys.modules))")
+    assert subprocess.run([sys.executable, "-c", code], cwd=src).returncode == 0
+
+
+def test_widget_shows_the_engine_state(qapp):
+    from standard.calculator import App
+
+    widget = App()
+    engine = StandardEngine()
+    for key in "12+3*4=":
+        widget.press(key)
+        state = engine.press(key)
+        assert (widget.currentLabel.text(), widget.totalLabel.text()) == (state.current, state.total)
+    widget.close()
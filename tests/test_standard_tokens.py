@@ -0,0 +1,60 @@
+"""
+@file test_standard_tokens.py
+@brief File containing the tests of the token stack of the standard calculator total expression.
+
+@author Martin Valapka (xvalapm00)
+@date 16.10. 2026
+"""
+
+import random
+
+import pytest
+
+from standard.standard_engine import OPERAND, OPERATOR, POWER, ROOT, StandardEngine, Token, operand_token
+
+KEYS = list("0123456789+-*/%^√!.⌫") + ["|x|", "=", "C"]
+
+
+@pytest.mark.parametrize("text, token", [
+    ("12", Token(OPERAND, "12", None)),
+    ("2^10", Token(POWER, "2^10", ("2", "10"))),
+    ("3√27", Token(ROOT, "3√27", ("3", "27"))),
+    ("√9", Token(ROOT, "√9", ("", "9"))),
+])
+def test_operand_token(text, token):
+    assert operand_token(text) == token
+
+
+@pytest.mark.parametrize("keys, texts", [
+    ("2^3+", ["2^3", "+"]), ("3√27-", ["3√27", "-"]), ("9-4-", ["5", "-"]), ("2^3+3√8*", ["10", "*"]),
+])
+def test_total_is_kept_as_tokens(keys, texts):
+    engine = StandardEngine()
+    engine.replay(keys)
+    assert [token.text for token in engine.tokens] == texts
+    assert engine.last_operator == texts[-1]
+    assert engine.operator_count == 1
+
+
+def test_parsing_splits_at_the_last_inner_operator():
+    engine = StandardEngine()
+    engine.push_total("2^3", "+")
+    engine.push_total("7", "*")
+    left, operator, right, last = engine.parsing()
+    assert (left.kind, operator, right.text, last) == (POWER, "+", "7", "*")
+
+
+def test_stack_invariants_over_random_key_presses():
+    rng = random.Random(11)
+    for _ in range(300):
+        engine = StandardEngine()
+        for key in rng.choices(KEYS, k=30):
+            engine.replay([key])
+            operators = [token for token in engine.tokens if token.kind == OPERATOR]
+            assert engine.operator_count == len(operators)
+            assert engine.totalExpression == "".join(token.text for token in engine.tokens)
+            last = engine.tokens[-1].text if engine.tokens and engine.tokens[-1].kind == OPERATOR else ""
+            assert engine.last_operator == last
+            for token in engine.tokens:
+                if token.kind != OPERATOR:
+                    assert token == operand_token(token.text)